@@ -1,15 +1,86 @@
-﻿import json
+﻿import argparse
+import cProfile
+import csv
+import hashlib
+import json
 import math
+import os
 import random
+import sqlite3
+import struct
+import sys
+import threading
+import time
 from array import array
+from collections import OrderedDict, deque
+from contextlib import contextmanager
 from dataclasses import dataclass
 from pathlib import Path
 
 import pygame
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    from pygame._sdl2 import video as sdl2_video
+except ImportError:
+    sdl2_video = None
+
 
 CONFIG_PATH = Path(__file__).with_name("sensitivity_profiles.json")
 SCORES_PATH = Path(__file__).with_name("scores.json")
+SOUND_CACHE_DIR = Path(__file__).with_name("sound_cache")
+REPLAY_DIR = Path(__file__).with_name("replays")
+RUNS_PATH = Path(__file__).with_name("runs.sqlite3")
+
+
+DEFAULT_PROFILES = {
+    "cs2": {
+        "name": "Counter-Strike 2",
+        "yaw": 0.022,
+        "hipfire_sens": 1.5,
+        "ads_sens": 1.0,
+        "dpi": 800,
+        "fov_h_deg": 106.26,
+    },
+    "valorant": {
+        "name": "Valorant",
+        "yaw": 0.07,
+        "hipfire_sens": 0.35,
+        "ads_sens": 1.0,
+        "dpi": 800,
+        "fov_h_deg": 103.0,
+    },
+    "marvel_rivals": {
+        "name": "Marvel Rivals",
+        "yaw": 0.0066,
+        "hipfire_sens": 2.0,
+        "ads_sens": 1.0,
+        "dpi": 800,
+        "fov_h_deg": 103.0,
+    },
+    "r6": {
+        "name": "Rainbow Six Siege",
+        "yaw": 0.0057296,
+        "hipfire_sens": 50.0,
+        "ads_sens": 50.0,
+        "dpi": 800,
+        "fov_h_deg": 90.0,
+        "x_factor": 0.02,
+        "scope_modifier": 0.6,
+    },
+    "ow2": {
+        "name": "Overwatch 2",
+        "yaw": 0.0066,
+        "hipfire_sens": 4.0,
+        "ads_sens": 1.0,
+        "dpi": 800,
+        "fov_h_deg": 103.0,
+    },
+}
 
 
 @dataclass
@@ -27,34 +98,2531 @@ class SessionStats:
     shots: int = 0
     hits: int = 0
     reaction_samples: list[float] | None = None
+    # Half-width of each sample's timing uncertainty, from frame-quantized input.
+    reaction_spread: list[float] | None = None
 
     def __post_init__(self):
         if self.reaction_samples is None:
             self.reaction_samples = []
+        if self.reaction_spread is None:
+            self.reaction_spread = []
+
+
+SYNTH_VERSION = 1
+SOUND_SPECS = {
+    "gun": {
+        "duration": 0.18,
+        "seed": 1337,
+        "env_decay": 14.0,
+        "crack_gain": 0.55,
+        "crack_decay": 52.0,
+        "mid_gain": 0.50,
+        "mid_hz": 280.0,
+        "mid_sweep": 140.0,
+        "mid_decay": 20.0,
+        "bass_gain": 0.30,
+        "bass_hz": 95.0,
+        "bass_decay": 10.0,
+    },
+    "hit": {
+        "duration": 0.09,
+        "tone_hz": 940.0,
+        "tone_decay": 30.0,
+        "gain": 0.45,
+    },
+}
+
+
+# Each wave takes the math backend (numpy or math) so one formula serves both paths.
+def _gun_wave(m, t, noise, p):
+    env = m.exp(-t * p["env_decay"])
+    crack = noise * m.exp(-t * p["crack_decay"])
+    mid = m.sin(2.0 * m.pi * (p["mid_hz"] - p["mid_sweep"] * t) * t) * m.exp(-t * p["mid_decay"])
+    bass = m.sin(2.0 * m.pi * p["bass_hz"] * t) * m.exp(-t * p["bass_decay"])
+    return (p["crack_gain"] * crack + p["mid_gain"] * mid + p["bass_gain"] * bass) * env
+
+
+def _hit_wave(m, t, noise, p):
+    return m.sin(2.0 * m.pi * p["tone_hz"] * t) * m.exp(-t * p["tone_decay"]) * p["gain"]
+
+
+SOUND_WAVES = {"gun": _gun_wave, "hit": _hit_wave}
+
+
+def synthesize_pcm(name, sample_rate=44100, channels=1):
+    spec = SOUND_SPECS[name]
+    wave = SOUND_WAVES[name]
+    samples = int(spec["duration"] * sample_rate)
+    seed = spec.get("seed", 0)
+
+    if np is not None:
+        t = np.arange(samples, dtype=np.float64) / sample_rate
+        noise = np.random.default_rng(seed).uniform(-1.0, 1.0, samples)
+        pcm = (np.clip(wave(np, t, noise, spec), -1.0, 1.0) * 32767).astype(np.int16)
+        if channels > 1:
+            pcm = np.repeat(pcm, channels)
+        return pcm.tobytes()
+
+    rng = random.Random(seed)
+    values = [
+        wave(math, i / sample_rate, rng.random() * 2.0 - 1.0, spec)
+        for i in range(samples)
+    ]
+    pcm = array("h", [int(max(-1.0, min(1.0, v)) * 32767) for v in values])
+    if channels > 1:
+        interleaved = array("h", bytes(len(pcm) * channels * pcm.itemsize))
+        for c in range(channels):
+            interleaved[c::channels] = pcm
+        pcm = interleaved
+    return pcm.tobytes()
+
+
+def cached_pcm(name, sample_rate, fmt, channels):
+    # Keyed by synth parameters and mixer format so a changed spec or mixer regenerates.
+    key_src = json.dumps(
+        {
+            "version": SYNTH_VERSION,
+            "name": name,
+            "spec": SOUND_SPECS[name],
+            "rate": sample_rate,
+            "format": fmt,
+            "channels": channels,
+        },
+        sort_keys=True,
+    )
+    digest = hashlib.sha1(key_src.encode("utf-8")).hexdigest()[:16]
+    path = SOUND_CACHE_DIR / f"{name}_{digest}.pcm"
+    expected = int(SOUND_SPECS[name]["duration"] * sample_rate) * 2 * channels
+
+    try:
+        data = path.read_bytes()
+        if len(data) == expected:
+            return data
+    except OSError:
+        pass
+
+    data = synthesize_pcm(name, sample_rate, channels)
+    try:
+        SOUND_CACHE_DIR.mkdir(exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_bytes(data)
+        tmp.replace(path)
+    except OSError:
+        pass
+    return data
+
+
+class ManualClock:
+    # Deterministic time source for headless runs; advanced explicitly by the driver in seconds.
+    # Reads return integer nanoseconds, like time.perf_counter_ns.
+    def __init__(self, start=0.0):
+        self.now = float(start)
+
+    def advance(self, dt):
+        self.now += dt
+
+    def __call__(self):
+        return int(round(self.now * 1e9))
 
 
-class AimLiteApp:
+@dataclass
+class InputFrame:
+    dt: float
+    rel_x: float = 0.0
+    rel_y: float = 0.0
+    clicks: int = 0
+    ads: bool | None = None
+
+
+def active_sens(profile, game_key, ads_held):
+    hip = max(1e-6, float(profile["hipfire_sens"]))
+
+    if game_key == "r6" and ads_held:
+        ads = float(profile.get("ads_sens", 50.0))
+        x_factor = float(profile.get("x_factor", 0.02))
+        scope_mod = float(profile.get("scope_modifier", 0.6))
+        ads_modifier = max(0.0, min(1.0, (ads * x_factor) * scope_mod))
+        return hip * ads_modifier
+
+    if ads_held:
+        return hip * max(0.01, float(profile.get("ads_sens", 1.0)))
+
+    return hip
+
+
+class SpatialHash:
+    # Uniform grid over circles; each entry is listed in every cell its bounding box touches.
+    def __init__(self, cell_size):
+        self.cell_size = float(cell_size)
+        self.cells: dict[tuple[int, int], list[int]] = {}
+        self.entries: dict[int, tuple[float, float, float]] = {}
+
+    def _span(self, x, y, reach):
+        c = self.cell_size
+        return int((x - reach) // c), int((x + reach) // c), int((y - reach) // c), int((y + reach) // c)
+
+    def insert(self, key, x, y, r):
+        self.entries[key] = (x, y, r)
+        x0, x1, y0, y1 = self._span(x, y, r)
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                self.cells.setdefault((cx, cy), []).append(key)
+
+    def remove(self, key):
+        x, y, r = self.entries.pop(key)
+        x0, x1, y0, y1 = self._span(x, y, r)
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                bucket = self.cells[(cx, cy)]
+                bucket.remove(key)
+                if not bucket:
+                    del self.cells[(cx, cy)]
+
+    def clear(self):
+        self.cells.clear()
+        self.entries.clear()
+
+    def at_point(self, x, y):
+        c = self.cell_size
+        return self.cells.get((int(x // c), int(y // c)), ())
+
+    def collides(self, x, y, r, gap=0.0):
+        # Any stored circle closer than r + other_r + gap has a bbox inside this reach.
+        x0, x1, y0, y1 = self._span(x, y, r + gap)
+        entries = self.entries
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                for key in self.cells.get((cx, cy), ()):
+                    ox, oy, orad = entries[key]
+                    dx, dy = x - ox, y - oy
+                    min_dist = r + orad + gap
+                    if dx * dx + dy * dy < min_dist * min_dist:
+                        return True
+        return False
+
+
+# 5x5 cell neighbourhood minus the corners, which are always at least min_dist away.
+NEIGHBOUR_CELLS = tuple((x, y) for x in range(-2, 3) for y in range(-2, 3) if abs(x) + abs(y) < 4)
+
+
+def poisson_disk_points(rng, rect, min_dist, center=None, radius=None, k=30):
+    # Bridson sampling inside rect, clipped to a disk around center when radius is set.
+    cx, cy = center if center else rect.center
+    left, right = rect.left, rect.right
+    top, bottom = rect.top, rect.bottom
+    if radius is not None:
+        left, right = max(left, cx - radius), min(right, cx + radius)
+        top, bottom = max(top, cy - radius), min(bottom, cy + radius)
+    if left > right or top > bottom:
+        return []
+    r2 = None if radius is None else radius * radius
+    d2 = min_dist * min_dist
+    # Cells small enough to hold one point each, so a 5x5 neighbourhood covers min_dist.
+    cell = min_dist / math.sqrt(2)
+    cells: dict[tuple[int, int], tuple[float, float]] = {}
+    points: list[tuple[float, float]] = []
+    active: list[tuple[float, float]] = []
+
+    def try_add(x, y):
+        if not (left <= x <= right and top <= y <= bottom):
+            return False
+        if r2 is not None and (x - cx) ** 2 + (y - cy) ** 2 > r2:
+            return False
+        gx, gy = int(x // cell), int(y // cell)
+        for ox, oy in NEIGHBOUR_CELLS:
+            p = cells.get((gx + ox, gy + oy))
+            if p and (p[0] - x) ** 2 + (p[1] - y) ** 2 < d2:
+                return False
+        cells[(gx, gy)] = (x, y)
+        points.append((x, y))
+        active.append((x, y))
+        return True
+
+    for _ in range(k):
+        if try_add(rng.uniform(left, right), rng.uniform(top, bottom)):
+            break
+
+    while active:
+        j = rng.randrange(len(active))
+        ax, ay = active[j]
+        for _ in range(k):
+            angle = rng.random() * math.tau
+            dist = min_dist * (1.0 + rng.random())
+            if try_add(ax + math.cos(angle) * dist, ay + math.sin(angle) * dist):
+                break
+        else:
+            active[j] = active[-1]
+            active.pop()
+    return points
+
+
+SPAWN_POINT_SETS: dict[tuple, list[tuple[float, float]]] = {}
+_spawn_points_lock = threading.Lock()
+
+
+def spawn_point_set(size, radius, cluster_scale, min_gap=12.0, min_points=256):
+    # Built once per process and layout from a seed derived from the key, so every run and every
+    # replay draws from the same points; runs differ only in the order their seeded RNG shuffles.
+    key = (tuple(size), cluster_scale, radius, min_gap)
+    with _spawn_points_lock:
+        points = SPAWN_POINT_SETS.get(key)
+        if points is None:
+            rng = random.Random(repr(key))
+            arena = pygame.Rect((0, 0), size)
+            # Layers are spaced internally; small cluster areas stack several so positions still vary.
+            area = arena.inflate(-72, -72)
+            disk = None if cluster_scale is None else min(arena.w, arena.h) * cluster_scale
+            points = []
+            for _ in range(32):
+                points += poisson_disk_points(rng, area, radius * 2 + min_gap, arena.center, disk)
+                if len(points) >= min_points:
+                    break
+            SPAWN_POINT_SETS[key] = points
+    return points
+
+
+class SpawnPool:
+    # Blue-noise spawn points walked in shuffled order; wrapping around reshuffles instead of resampling.
+    def __init__(self, points, rng):
+        self.points = points
+        self.rng = rng
+        self.next = 0
+        rng.shuffle(points)
+
+    def take(self, fits):
+        n = len(self.points)
+        for _ in range(n):
+            if self.next >= n:
+                self.rng.shuffle(self.points)
+                self.next = 0
+            x, y = self.points[self.next]
+            self.next += 1
+            if fits(x, y):
+                return x, y
+        return None
+
+
+class TargetPool:
+    # Circle targets as parallel arrays; a respawn overwrites its slot instead of allocating.
+    __slots__ = ("xs", "ys", "rs", "count")
+
+    def __init__(self, capacity=0):
+        self.xs = array("d")
+        self.ys = array("d")
+        self.rs = array("d")
+        self.count = 0
+        self.resize(capacity)
+
+    def __len__(self):
+        return self.count
+
+    def resize(self, capacity):
+        # Keeps the existing buffers when the map uses the same number of slots.
+        self.count = 0
+        if len(self.xs) != capacity:
+            zeros = bytes(8 * capacity)
+            self.xs = array("d", zeros)
+            self.ys = array("d", zeros)
+            self.rs = array("d", zeros)
+
+    def clear(self):
+        self.count = 0
+
+    def set(self, i, x, y, r):
+        self.xs[i] = x
+        self.ys[i] = y
+        self.rs[i] = r
+        if i >= self.count:
+            self.count = i + 1
+
+    def contains(self, i, x, y):
+        dx = x - self.xs[i]
+        dy = y - self.ys[i]
+        r = self.rs[i]
+        return dx * dx + dy * dy <= r * r
+
+
+class TrackingBot:
+    __slots__ = (
+        "x",
+        "y",
+        "prev_x",
+        "prev_y",
+        "ground_y",
+        "w",
+        "h",
+        "base_w",
+        "base_h",
+        "vx",
+        "jump_v",
+        "jumping",
+        "strafe_timer",
+        "crouch_timer",
+        "crouch_cooldown",
+        "jump_cooldown",
+    )
+
+    def __init__(self, x, y, w, h, vx, strafe_timer, crouch_cooldown, jump_cooldown):
+        self.x = self.prev_x = x
+        self.y = self.prev_y = self.ground_y = y
+        self.w = self.base_w = w
+        self.h = self.base_h = h
+        self.vx = vx
+        self.jump_v = 0.0
+        self.jumping = False
+        self.strafe_timer = strafe_timer
+        self.crouch_timer = 0.0
+        self.crouch_cooldown = crouch_cooldown
+        self.jump_cooldown = jump_cooldown
+
+
+class RingBuffer:
+    # Fixed-capacity float samples with a running sum, so the window mean costs O(1).
+    __slots__ = ("data", "capacity", "head", "size", "total")
+
+    def __init__(self, capacity):
+        self.data = array("d", bytes(8 * capacity))
+        self.capacity = capacity
+        self.head = 0
+        self.size = 0
+        self.total = 0.0
+
+    def __len__(self):
+        return self.size
+
+    def append(self, value):
+        if self.size == self.capacity:
+            self.total -= self.data[self.head]
+        else:
+            self.size += 1
+        self.data[self.head] = value
+        self.total += value
+        self.head = (self.head + 1) % self.capacity
+
+    def mean(self):
+        return self.total / self.size if self.size else 0.0
+
+
+class TrackingMetrics:
+    # Cursor error against the tracking bot, sampled at a fixed rate. Memory stays constant:
+    # a short ring of recent samples for the HUD and an error histogram for run percentiles.
+    BIN_PX = 2.0
+    BINS = 256
+
+    def __init__(self, sample_dt, window_s=2.0):
+        self.sample_dt = sample_dt
+        window = max(1, int(round(window_s / sample_dt)))
+        self.recent_error = RingBuffer(window)
+        self.recent_on = RingBuffer(window)
+        self.histogram = array("I", bytes(4 * self.BINS))
+        self.samples = 0
+        self.on_samples = 0
+        self.error_sum = 0.0
+        self.last_dir = 0
+        self.last_cursor_x = None
+        # Time since the bot last changed direction, until the cursor is back on it and following.
+        self.change_age = None
+        self.reacquire_count = 0
+        self.reacquire_sum = 0.0
+        # Peak distance the cursor has run past the bot's leading edge in the current excursion.
+        self.overshoot_peak = 0.0
+        self.overshoot_count = 0
+        self.overshoot_sum = 0.0
+
+    def sample(self, cursor_x, cursor_y, bot, on_target):
+        error = math.hypot(cursor_x - bot.x, cursor_y - bot.y)
+        self.samples += 1
+        self.error_sum += error
+        self.histogram[min(self.BINS - 1, int(error / self.BIN_PX))] += 1
+        self.recent_error.append(error)
+        self.recent_on.append(1.0 if on_target else 0.0)
+        if on_target:
+            self.on_samples += 1
+
+        direction = 1 if bot.vx > 0 else -1
+        cursor_dx = 0.0 if self.last_cursor_x is None else cursor_x - self.last_cursor_x
+        self.last_cursor_x = cursor_x
+        if self.last_dir and direction != self.last_dir:
+            self.change_age = 0.0
+        elif self.change_age is not None:
+            self.change_age += self.sample_dt
+        self.last_dir = direction
+        if self.change_age is not None and on_target and cursor_dx * direction > 0:
+            self.reacquire_count += 1
+            self.reacquire_sum += self.change_age
+            self.change_age = None
+
+        lead = (cursor_x - bot.x) * direction - bot.w / 2
+        if lead > 0:
+            self.overshoot_peak = max(self.overshoot_peak, lead)
+        elif self.overshoot_peak > 0:
+            self.overshoot_count += 1
+            self.overshoot_sum += self.overshoot_peak
+            self.overshoot_peak = 0.0
+
+    def error_percentile(self, q):
+        if not self.samples:
+            return 0.0
+        rank = (q / 100.0) * (self.samples - 1)
+        seen = 0
+        for i, n in enumerate(self.histogram):
+            seen += n
+            if seen > rank:
+                return (i + 0.5) * self.BIN_PX
+        return self.BINS * self.BIN_PX
+
+    def summary(self):
+        n = max(1, self.samples)
+        return {
+            "on_target_s": self.on_samples * self.sample_dt,
+            "on_target_pct": self.on_samples / n * 100.0,
+            "error_mean_px": self.error_sum / n,
+            "error_p50_px": self.error_percentile(50),
+            "error_p90_px": self.error_percentile(90),
+            "reacquire_ms": self.reacquire_sum / self.reacquire_count * 1000.0 if self.reacquire_count else None,
+            "reacquire_count": self.reacquire_count,
+            "overshoot_px": self.overshoot_sum / self.overshoot_count if self.overshoot_count else None,
+            "overshoot_count": self.overshoot_count,
+        }
+
+
+class ShotLog:
+    # Per-shot flick telemetry in preallocated typed arrays; the summary figures are
+    # running sums and a fixed histogram, so nothing is allocated per shot.
+    COLUMNS = ("t", "since_kill", "spawn_dist", "path", "offset_x", "offset_y", "overshoot", "hit")
+    TYPECODES = {"t": "d", "hit": "B"}
+    TTK_BIN_S = 0.005
+    TTK_BINS = 600
+    PATH_POINTS = 1024
+
+    def __init__(self, capacity, slots, cursor_x, cursor_y):
+        self.count = 0
+        self.columns = {}
+        for name in self.COLUMNS:
+            code = self.TYPECODES.get(name, "f")
+            self.columns[name] = array(code, bytes(array(code).itemsize * capacity))
+        # Cursor distance to each target slot when it spawned.
+        self.slot_spawn_dist = array("f", bytes(4 * slots))
+        # Cursor positions since the last shot, ring-buffered for the overshoot check.
+        self.path_x = array("d", bytes(8 * self.PATH_POINTS))
+        self.path_y = array("d", bytes(8 * self.PATH_POINTS))
+        self.path_head = 0
+        self.path_n = 0
+        self.path_len = 0.0
+        self.start_x = self.last_x = cursor_x
+        self.start_y = self.last_y = cursor_y
+        self.kill_t = 0.0
+        self.kill_x = cursor_x
+        self.kill_y = cursor_y
+        self.ttk_hist = array("I", bytes(4 * self.TTK_BINS))
+        self.kills = 0
+        self.fitts_sum = 0.0
+        self.fitts_n = 0
+        self.overshoot_sum = 0.0
+        self.miss_offset_sum = 0.0
+        self.misses = 0
+
+    def spawned(self, slot, dist):
+        self.slot_spawn_dist[slot] = dist
+
+    def moved(self, x, y):
+        dx, dy = x - self.last_x, y - self.last_y
+        self.path_len += math.sqrt(dx * dx + dy * dy)
+        self.last_x, self.last_y = x, y
+        self.path_x[self.path_head] = x
+        self.path_y[self.path_head] = y
+        self.path_head = (self.path_head + 1) % self.PATH_POINTS
+        self.path_n = min(self.path_n + 1, self.PATH_POINTS)
+
+    def _overshoot(self, tx, ty):
+        # Furthest the cursor travelled past the target along the line from where this shot's movement began.
+        sx, sy = self.start_x, self.start_y
+        ux, uy = tx - sx, ty - sy
+        dist = math.sqrt(ux * ux + uy * uy)
+        if dist < 1.0:
+            return 0.0
+        px, py = self.path_x, self.path_y
+        furthest = 0.0
+        for i in range(self.path_n):
+            along = (px[i] - sx) * ux + (py[i] - sy) * uy
+            if along > furthest:
+                furthest = along
+        return max(0.0, furthest / dist - dist)
+
+    def record(self, now, cursor_x, cursor_y, slot, tx, ty, radius, hit):
+        i = self.count
+        cols = self.columns
+        if i == len(cols["t"]):
+            # Longer than planned for; double once rather than dropping shots.
+            for col in cols.values():
+                col.frombytes(bytes(col.itemsize * len(col)))
+        overshoot = self._overshoot(tx, ty)
+        since_kill = now - self.kill_t
+        cols["t"][i] = now
+        cols["since_kill"][i] = since_kill
+        cols["spawn_dist"][i] = self.slot_spawn_dist[slot]
+        cols["path"][i] = self.path_len
+        cols["offset_x"][i] = cursor_x - tx
+        cols["offset_y"][i] = cursor_y - ty
+        cols["overshoot"][i] = overshoot
+        cols["hit"][i] = 1 if hit else 0
+        self.count = i + 1
+        self.overshoot_sum += overshoot
+
+        if hit:
+            self.kills += 1
+            self.ttk_hist[min(self.TTK_BINS - 1, int(since_kill / self.TTK_BIN_S))] += 1
+            if since_kill > 0.0:
+                # Fitts index of difficulty over movement time, from where the cursor was at the last kill.
+                d = math.hypot(tx - self.kill_x, ty - self.kill_y)
+                self.fitts_sum += math.log2(d / (2.0 * radius) + 1.0) / since_kill
+                self.fitts_n += 1
+            self.kill_t = now
+            self.kill_x, self.kill_y = cursor_x, cursor_y
+        else:
+            self.misses += 1
+            self.miss_offset_sum += math.hypot(cursor_x - tx, cursor_y - ty)
+
+        self.start_x, self.start_y = cursor_x, cursor_y
+        self.path_len = 0.0
+        self.path_head = 0
+        self.path_n = 0
+
+    def ttk_percentile(self, q):
+        if not self.kills:
+            return None
+        rank = (q / 100.0) * (self.kills - 1)
+        seen = 0
+        for i, n in enumerate(self.ttk_hist):
+            seen += n
+            if seen > rank:
+                return (i + 0.5) * self.TTK_BIN_S
+        return self.TTK_BINS * self.TTK_BIN_S
+
+    def summary(self):
+        p50, p90 = self.ttk_percentile(50), self.ttk_percentile(90)
+        return {
+            "ttk_p50_ms": None if p50 is None else p50 * 1000.0,
+            "ttk_p90_ms": None if p90 is None else p90 * 1000.0,
+            "fitts_tp": self.fitts_sum / self.fitts_n if self.fitts_n else None,
+            "overshoot_px": self.overshoot_sum / self.count if self.count else None,
+            "miss_offset_px": self.miss_offset_sum / self.misses if self.misses else None,
+        }
+
+    def write_csv(self, path: Path):
+        if not self.count:
+            return
+        cols = [self.columns[name] for name in self.COLUMNS]
+        with path.open("w", encoding="utf-8", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(self.COLUMNS)
+            for i in range(self.count):
+                writer.writerow([f"{c[i]:.3f}" for c in cols[:-1]] + [cols[-1][i]])
+
+
+class BotSwarm:
+    # Tracking bots as parallel arrays, stepped together (NumPy when available).
+    # Random events are drawn per bot in index order, strafes then crouches then jumps,
+    # so both code paths consume the seeded RNG identically.
+    # Below this many bots NumPy's per-call overhead costs more than a plain loop.
+    NUMPY_MIN_BOTS = 40
+    FIELDS = ("x", "y", "prev_x", "prev_y", "ground_y", "h", "vx", "jump_v", "strafe_timer", "crouch_timer", "crouch_cooldown", "jump_cooldown")
+
     def __init__(self):
-        pygame.init()
-        pygame.display.set_caption("AimLite")
+        self.count = 0
+        self.w = 42.0
+        self.base_h = 126.0
+        self.speed = 210.0
+        self.use_numpy = np is not None
+        for name in self.FIELDS:
+            setattr(self, name, self._zeros(0))
+        self.jumping = self._zeros(0, flag=True)
+
+    def _zeros(self, n, flag=False):
+        if self.use_numpy:
+            return np.zeros(n, dtype=bool if flag else np.float64)
+        return [False] * n if flag else array("d", bytes(8 * n))
+
+    def reset(self, count, rng, arena_rect, speed):
+        self.count = count
+        self.use_numpy = np is not None and count >= self.NUMPY_MIN_BOTS
+        # Shrink bots as the field fills up so the cursor can't sit on several at once.
+        scale = max(0.5, min(1.0, math.sqrt(8.0 / max(1, count))))
+        self.w = 42.0 * scale
+        self.base_h = 126.0 * scale
+        self.speed = speed
+        half_w = self.w / 2
+        columns = {name: [] for name in self.FIELDS}
+        for _ in range(count):
+            x = rng.uniform(arena_rect.left + half_w, arena_rect.right - half_w)
+            # Leave room overhead for a full jump.
+            y = rng.uniform(arena_rect.top + self.base_h + 100.0, arena_rect.bottom - self.base_h * 0.75)
+            row = {
+                "x": x,
+                "y": y,
+                "prev_x": x,
+                "prev_y": y,
+                "ground_y": y,
+                "h": self.base_h,
+                "vx": rng.choice([-1.0, 1.0]) * speed * 0.7,
+                "jump_v": 0.0,
+                "strafe_timer": rng.uniform(0.22, 0.55),
+                "crouch_timer": 0.0,
+                "crouch_cooldown": rng.uniform(1.6, 3.2),
+                "jump_cooldown": rng.uniform(2.0, 4.0),
+            }
+            for name in self.FIELDS:
+                columns[name].append(row[name])
+        for name in self.FIELDS:
+            values = columns[name]
+            setattr(self, name, np.array(values, dtype=np.float64) if self.use_numpy else array("d", values))
+        self.jumping = self._zeros(count, flag=True)
+
+    def _strafe(self, i, rng):
+        mag = rng.uniform(0.45, 1.0) * self.speed
+        self.vx[i] = rng.choice([-1.0, 1.0]) * mag
+        self.strafe_timer[i] = rng.uniform(0.16, 0.48)
+
+    def _maybe_crouch(self, i, rng):
+        if rng.random() < 0.38:
+            self.crouch_timer[i] = rng.uniform(0.30, 0.85)
+        self.crouch_cooldown[i] = rng.uniform(1.5, 3.8)
+
+    def _maybe_jump(self, i, rng):
+        if rng.random() < 0.24:
+            self.jumping[i] = True
+            self.jump_v[i] = -430.0
+        self.jump_cooldown[i] = rng.uniform(2.2, 4.6)
+
+    def step(self, dt, rng, left, right):
+        if self.use_numpy:
+            self._step_numpy(dt, rng, left, right)
+        else:
+            self._step_python(dt, rng, left, right)
+
+    def _step_numpy(self, dt, rng, left, right):
+        np.copyto(self.prev_x, self.x)
+        np.copyto(self.prev_y, self.y)
+        self.strafe_timer -= dt
+        self.crouch_cooldown -= dt
+        self.jump_cooldown -= dt
+
+        for i in np.flatnonzero(self.strafe_timer <= 0.0).tolist():
+            self._strafe(i, rng)
+        self.x += self.vx * dt
+
+        grounded = ~self.jumping
+        due = grounded & (self.crouch_timer <= 0.0) & (self.crouch_cooldown <= 0.0)
+        for i in np.flatnonzero(due).tolist():
+            self._maybe_crouch(i, rng)
+        crouching = self.crouch_timer > 0.0
+        np.subtract(self.crouch_timer, dt, out=self.crouch_timer, where=crouching)
+        self.h.fill(self.base_h)
+        np.copyto(self.h, self.base_h * 0.5, where=crouching)
+
+        for i in np.flatnonzero(grounded & (self.jump_cooldown <= 0.0)).tolist():
+            self._maybe_jump(i, rng)
+
+        air = self.jumping.copy()
+        if air.any():
+            np.add(self.jump_v, 1000.0 * dt, out=self.jump_v, where=air)
+            np.add(self.y, self.jump_v * dt, out=self.y, where=air)
+            landed = air & (self.y >= self.ground_y)
+            np.copyto(self.y, self.ground_y, where=landed)
+            self.jump_v[landed] = 0.0
+            self.jumping[landed] = False
+        # Keep bottom anchored while crouching.
+        grounded = ~air
+        np.copyto(self.y, self.ground_y, where=grounded & ~crouching)
+        np.add(self.ground_y, self.base_h * 0.25, out=self.y, where=grounded & crouching)
+
+        half_w = self.w / 2
+        low = self.x - half_w < left
+        if low.any():
+            np.copyto(self.x, left + half_w, where=low)
+            np.copyto(self.vx, np.abs(self.vx), where=low)
+        high = self.x + half_w > right
+        if high.any():
+            np.copyto(self.x, right - half_w, where=high)
+            np.copyto(self.vx, -np.abs(self.vx), where=high)
+
+    def _step_python(self, dt, rng, left, right):
+        n = self.count
+        x, y, vx, h = self.x, self.y, self.vx, self.h
+        jumping, jump_v, ground_y = self.jumping, self.jump_v, self.ground_y
+        self.prev_x[:] = x
+        self.prev_y[:] = y
+        for i in range(n):
+            self.strafe_timer[i] -= dt
+            self.crouch_cooldown[i] -= dt
+            self.jump_cooldown[i] -= dt
+
+        for i in range(n):
+            if self.strafe_timer[i] <= 0.0:
+                self._strafe(i, rng)
+        for i in range(n):
+            x[i] += vx[i] * dt
+
+        grounded = [not j for j in jumping]
+        for i in range(n):
+            if grounded[i] and self.crouch_timer[i] <= 0.0 and self.crouch_cooldown[i] <= 0.0:
+                self._maybe_crouch(i, rng)
+        for i in range(n):
+            if self.crouch_timer[i] > 0.0:
+                self.crouch_timer[i] -= dt
+                h[i] = self.base_h * 0.5
+            else:
+                h[i] = self.base_h
+
+        for i in range(n):
+            if grounded[i] and self.jump_cooldown[i] <= 0.0:
+                self._maybe_jump(i, rng)
+
+        half_w = self.w / 2
+        for i in range(n):
+            if jumping[i]:
+                jump_v[i] += 1000.0 * dt
+                y[i] += jump_v[i] * dt
+                if y[i] >= ground_y[i]:
+                    y[i] = ground_y[i]
+                    jump_v[i] = 0.0
+                    jumping[i] = False
+            elif h[i] < self.base_h:
+                y[i] = ground_y[i] + self.base_h * 0.25
+            else:
+                y[i] = ground_y[i]
+
+            if x[i] - half_w < left:
+                x[i] = left + half_w
+                vx[i] = abs(vx[i])
+            elif x[i] + half_w > right:
+                x[i] = right - half_w
+                vx[i] = -abs(vx[i])
+
+    def any_at(self, px, py):
+        # Same edge test as TrainingSim._is_in_rect, for every bot at once.
+        w = self.w
+        if self.use_numpy:
+            left = self.x - w / 2
+            top = self.y - self.h / 2
+            return bool(np.any((left <= px) & (px <= left + w) & (top <= py) & (py <= top + self.h)))
+        for i in range(self.count):
+            left = self.x[i] - w / 2
+            top = self.y[i] - self.h[i] / 2
+            if left <= px <= left + w and top <= py <= top + self.h[i]:
+                return True
+        return False
+
+
+class TrainingSim:
+    # Per-tick game logic with no display, audio or event-queue dependency.
+    # Game state advances in fixed steps of 1 / tick_rate regardless of how often update() is called.
+    def __init__(
+        self,
+        width,
+        height,
+        profile,
+        game_key,
+        game_index=0,
+        map_key="regular_flick",
+        clock=None,
+        tick_rate=1000,
+        gridshot_count=60,
+        bot_count=16,
+    ):
+        self.arena_rect = pygame.Rect(0, 0, width, height)
+        self.clock = clock if clock is not None else ManualClock()
+        self.tick_rate = tick_rate
+        self.step_dt = 1.0 / tick_rate
+        self.max_frame_dt = 0.25
+        self.accumulator = 0.0
+        self.alpha = 0.0
+        self.elapsed_steps = 0
+        self.rng = random.Random()
+        self.seed = 0
+        self.recorder: SessionRecorder | None = None
+        # A private copy: edits reach it only through set_profile_value, which records them.
+        self.profile = dict(profile)
+        self.game_key = game_key
+        self.game_index = game_index
+        self.map_key = map_key
 
-        info = pygame.display.Info()
-        self.width, self.height = info.current_w, info.current_h
-        self.screen = pygame.display.set_mode((self.width, self.height), pygame.FULLSCREEN)
-        self.clock = pygame.time.Clock()
+        self.stats = SessionStats()
+        self.ads_held = False
+        self.cursor_x = float(self.arena_rect.centerx)
+        self.cursor_y = float(self.arena_rect.centery)
 
-        self.font = pygame.font.SysFont("consolas", 24)
-        self.small_font = pygame.font.SysFont("consolas", 19)
-        self.title_font = pygame.font.SysFont("consolas", 44)
+        self.targets = TargetPool()
+        self.grid = SpatialHash(64)
+        # Shuffled views of the shared spawn point sets per (arena size, cluster_scale, radius).
+        self.spawn_pools: dict[tuple, SpawnPool] = {}
+        self.gridshot_count = gridshot_count
+        self.moving_target: TrackingBot | None = None
+        self.tracking_metrics: TrackingMetrics | None = None
+        self.shot_log: ShotLog | None = None
+        # Tracking error is sampled at a fixed 100 Hz whatever the tick rate.
+        self.metrics_every = max(1, int(round(tick_rate / 100)))
+        self.bot_count = bot_count
+        self.bots = BotSwarm()
+        # Spawn scheduling runs on simulation time; reaction_shown_at is a clock() stamp in ns.
+        # With stamp_on_present set, it stays None until the renderer reports the frame was flipped.
+        self.stamp_on_present = False
+        self.reaction_spawn_at = 0.0
+        self.reaction_shown_at: int | None = None
+        self.reaction_waiting = False
 
+        self.duration = 0
+        self.steps_left = 0
+        self.time_left = 0.0
+        self.recoil_kick = 0.0
+        self.muzzle_flash_t = 0.0
+        # Targets and spawn pools are set up by start().
+
+    def set_profile(self, game_key, profile, game_index):
+        self.game_key = game_key
+        self.profile = dict(profile)
+        self.game_index = game_index
+        if self.recorder:
+            self.recorder.add(REC_PROFILE, game_index)
+            # The recording only snapshots profiles at the start, so carry over any edits made since.
+            for key in PROFILE_FIELDS:
+                if key in profile:
+                    self.set_profile_value(key, profile[key])
+
+    def set_profile_value(self, key, value):
+        if self.recorder:
+            _, value = self.recorder.add(REC_SETTING, PROFILE_FIELDS.index(key), value)
+        self.profile[key] = value
+
+    def set_ads(self, held):
+        if held != self.ads_held and self.recorder:
+            self.recorder.add(REC_ADS, 1.0 if held else 0.0)
+        self.ads_held = held
+
+    @property
+    def sim_time(self):
+        return self.elapsed_steps * self.step_dt
+
+    def start(self, duration, seed=None):
+        self.stats = SessionStats()
+        self.seed = seed if seed is not None else random.getrandbits(63)
+        self.rng.seed(self.seed)
+        self.duration = duration
+        self.steps_left = int(round(duration * self.tick_rate))
+        self.elapsed_steps = 0
+        self.time_left = float(duration)
+        self.accumulator = 0.0
+        self.alpha = 0.0
+        self.init_map()
+
+    def _place_target(self, i, x, y, r):
+        if self.recorder:
+            self.recorder.add(REC_SPAWN, x, y)
+        self.targets.set(i, x, y, r)
+        self.grid.insert(i, x, y, r)
+        if self.shot_log:
+            self.shot_log.spawned(i, math.hypot(x - self.cursor_x, y - self.cursor_y))
+
+    def _spawn_cluster_point(self, cluster_scale=0.28):
+        if cluster_scale is None:
+            # Dense modes spread over the whole arena instead of a central cluster.
+            x = self.rng.uniform(self.arena_rect.left + 36, self.arena_rect.right - 36)
+            y = self.rng.uniform(self.arena_rect.top + 36, self.arena_rect.bottom - 36)
+            return x, y
+        center_x, center_y = self.arena_rect.center
+        radius = min(self.arena_rect.w, self.arena_rect.h) * cluster_scale
+        angle = self.rng.random() * math.tau
+        dist = (self.rng.random() ** 0.5) * radius
+        x = center_x + math.cos(angle) * dist
+        y = center_y + math.sin(angle) * dist
+        x = max(self.arena_rect.left + 36, min(self.arena_rect.right - 36, x))
+        y = max(self.arena_rect.top + 36, min(self.arena_rect.bottom - 36, y))
+        return x, y
+
+    def _fill_spawn_pool(self, radius, cluster_scale=0.28, min_gap=12.0):
+        points = list(spawn_point_set(self.arena_rect.size, radius, cluster_scale, min_gap))
+        pool = SpawnPool(points, self.rng)
+        self.spawn_pools[(self.arena_rect.size, cluster_scale, radius)] = pool
+        return pool
+
+    def _spawn_point(self, radius, cluster_scale=0.28, min_gap=12.0):
+        # Checked against self.grid, which must not contain the slot being respawned.
+        pool = self.spawn_pools.get((self.arena_rect.size, cluster_scale, radius))
+        if pool is None:
+            pool = self._fill_spawn_pool(radius, cluster_scale, min_gap)
+        point = pool.take(lambda x, y: not self.grid.collides(x, y, radius, min_gap))
+        if point is None:
+            # Every pool point is blocked by a live target; overlap rather than stall.
+            return self._spawn_cluster_point(cluster_scale)
+        return point
+
+    def _flick_layout(self, map_key=None):
+        # (target count, radius, initial spawn scale, respawn scale); a None scale uses the whole arena.
+        map_key = map_key or self.map_key
+        if map_key == "regular_flick":
+            return 3, 30, 0.10, 0.10
+        if map_key == "small_flick":
+            return 3, 16, 0.24, 0.10
+        if map_key == "gridshot":
+            return self.gridshot_count, 14, None, None
+        return None
+
+    def spawn_layouts(self):
+        # Every (radius, cluster_scale) the flick and reaction maps draw spawn points from.
+        layouts = {(26, 0.24)}
+        for map_key in ("regular_flick", "small_flick", "gridshot"):
+            _, radius, spawn_scale, respawn_scale = self._flick_layout(map_key)
+            layouts.update(((radius, spawn_scale), (radius, respawn_scale)))
+        return sorted(layouts, key=repr)
+
+    def _target_at(self, x, y):
+        # Lowest index wins, matching a front-to-back linear scan when fallback spawns overlap.
+        found = None
+        pool = self.targets
+        xs, ys, rs = pool.xs, pool.ys, pool.rs
+        for i in self.grid.at_point(x, y):
+            if found is not None and i > found:
+                continue
+            dx = x - xs[i]
+            dy = y - ys[i]
+            if dx * dx + dy * dy <= rs[i] * rs[i]:
+                found = i
+        return found
+
+    def _nearest_target(self, x, y):
+        pool = self.targets
+        best, best_d = 0, math.inf
+        for i in range(pool.count):
+            d = (x - pool.xs[i]) ** 2 + (y - pool.ys[i]) ** 2
+            if d < best_d:
+                best, best_d = i, d
+        return best
+
+    def init_map(self):
+        self.targets.clear()
+        self.grid.clear()
+        self.spawn_pools.clear()
+        self.moving_target = None
+        self.tracking_metrics = None
+        self.shot_log = None
+        self.bots.count = 0
+        self.recoil_kick = 0.0
+        self.muzzle_flash_t = 0.0
+
+        layout = self._flick_layout()
+        if layout:
+            count, radius, spawn_scale, respawn_scale = layout
+            self.grid = SpatialHash(radius * 4)
+            self.targets.resize(count)
+            # Sized for 20 shots/s over the run.
+            self.shot_log = ShotLog(max(256, int(self.duration * 20)), count, self.cursor_x, self.cursor_y)
+            for i in range(count):
+                self._place_target(i, *self._spawn_point(radius, spawn_scale), radius)
+            if respawn_scale != spawn_scale:
+                self._fill_spawn_pool(radius, respawn_scale)
+        elif self.map_key == "reaction":
+            self.targets.resize(1)
+            self._fill_spawn_pool(26, 0.24)
+            self.reaction_waiting = True
+            self.reaction_spawn_at = self.sim_time + self.rng.uniform(0.5, 1.5)
+        elif self.map_key == "tracking":
+            speed = 210 * (1.0 + (self.game_index * 0.05))
+            base_h = 126
+            base_w = 42
+            self.moving_target = TrackingBot(
+                float(self.arena_rect.centerx),
+                float(self.arena_rect.centery),
+                base_w,
+                base_h,
+                vx=self.rng.choice([-1.0, 1.0]) * speed * 0.7,
+                strafe_timer=self.rng.uniform(0.22, 0.55),
+                crouch_cooldown=self.rng.uniform(1.6, 3.2),
+                jump_cooldown=self.rng.uniform(2.0, 4.0),
+            )
+            self.tracking_metrics = TrackingMetrics(self.metrics_every * self.step_dt)
+        elif self.map_key == "multi_tracking":
+            speed = 210 * (1.0 + (self.game_index * 0.05))
+            self.bots.reset(self.bot_count, self.rng, self.arena_rect, speed)
+
+    def px_per_degree(self):
+        h_fov = max(1e-3, float(self.profile.get("fov_h_deg", 103.0)))
+        return self.arena_rect.w / h_fov
+
+    def _fire_shot_point(self):
+        # Stronger one-tap kick closer to a Deagle feel.
+        self.recoil_kick = min(1.8, self.recoil_kick + 0.55)
+        self.muzzle_flash_t = 0.06
+        return self.cursor_x, self.cursor_y
+
+    def update_weapon(self, dt):
+        # Slightly slower recovery so recoil reads clearly.
+        self.recoil_kick = max(0.0, self.recoil_kick - (2.9 * dt))
+        self.muzzle_flash_t = max(0.0, self.muzzle_flash_t - dt)
+
+    def _register_hit(self, value=10.0):
+        self.stats.hits += 1
+        self.stats.score += value
+
+    def _is_in_rect(self, x, y, t):
+        left = t.x - t.w / 2
+        top = t.y - t.h / 2
+        return left <= x <= left + t.w and top <= y <= top + t.h
+
+    def presented(self, t_ns):
+        # Called right after a flip; the first one showing a reaction target starts its timer.
+        if self.reaction_shown_at is None and self.targets:
+            self.reaction_shown_at = t_ns
+
+    def click(self, at_ns=None, spread_ns=0):
+        # at_ns is when the click happened if the caller knows better than clock(), and
+        # spread_ns the half-width of the window it is known to lie in.
+        if self.recorder:
+            self.recorder.add(REC_CLICK)
+        self.stats.shots += 1
+        shot_x, shot_y = self._fire_shot_point()
+        hit = False
+
+        layout = self._flick_layout()
+        if layout:
+            _, radius, _, respawn_scale = layout
+            i = self._target_at(shot_x, shot_y)
+            if self.shot_log:
+                aimed = i if i is not None else self._nearest_target(shot_x, shot_y)
+                pool = self.targets
+                self.shot_log.record(
+                    self.sim_time, shot_x, shot_y, aimed, pool.xs[aimed], pool.ys[aimed], pool.rs[aimed], i is not None
+                )
+            if i is not None:
+                self.grid.remove(i)
+                self._place_target(i, *self._spawn_point(radius, respawn_scale), radius)
+                self._register_hit(10.0)
+                hit = True
+
+        elif self.map_key == "reaction" and self.targets:
+            if self.targets.contains(0, shot_x, shot_y):
+                # A click before the target ever reached the screen can't be a reaction.
+                shown = self.reaction_shown_at
+                if shown is not None:
+                    if at_ns is None:
+                        first = last = self.clock()
+                    else:
+                        first, last = at_ns - spread_ns, at_ns + spread_ns
+                    # The input window can open before the present; only the part after it counts,
+                    # and a window that closed before the target was shown is no sample at all.
+                    first = max(first, shown)
+                    if last >= first:
+                        self.stats.reaction_samples.append(((first + last) // 2 - shown) / 1e6)
+                        self.stats.reaction_spread.append((last - first) / 2e6)
+                self.grid.remove(0)
+                self.targets.clear()
+                self.reaction_waiting = True
+                self.reaction_spawn_at = self.sim_time + self.rng.uniform(0.5, 1.5)
+                self._register_hit(15.0)
+                hit = True
+
+        elif self.map_key == "tracking" and self.moving_target:
+            if self._is_in_rect(shot_x, shot_y, self.moving_target):
+                self._register_hit(5.0)
+                hit = True
+
+        elif self.map_key == "multi_tracking":
+            if self.bots.any_at(shot_x, shot_y):
+                self._register_hit(5.0)
+                hit = True
+
+        if not hit:
+            self.stats.score = max(0.0, self.stats.score - 2.0)
+        elif self.recorder:
+            self.recorder.add(REC_HIT, self.stats.score, self.stats.hits)
+        return hit
+
+    def move(self, rel_x, rel_y):
+        if self.recorder:
+            rel_x, rel_y = self.recorder.add(REC_MOVE, rel_x, rel_y)
+        yaw = max(1e-6, float(self.profile["yaw"]))
+        sens = active_sens(self.profile, self.game_key, self.ads_held)
+        px_per_count = yaw * sens * self.px_per_degree()
+
+        self.cursor_x += rel_x * px_per_count
+        self.cursor_y += rel_y * px_per_count
+
+        self.cursor_x = max(self.arena_rect.left, min(self.arena_rect.right, self.cursor_x))
+        self.cursor_y = max(self.arena_rect.top, min(self.arena_rect.bottom, self.cursor_y))
+        if self.shot_log:
+            self.shot_log.moved(self.cursor_x, self.cursor_y)
+
+    def update_tracking(self, dt):
+        t = self.moving_target
+        if not t:
+            return
+
+        t.prev_x = t.x
+        t.prev_y = t.y
+        speed = 210 * (1.0 + (self.game_index * 0.05))
+        t.strafe_timer -= dt
+        t.crouch_cooldown -= dt
+        t.jump_cooldown -= dt
+
+        # Unpredictable horizontal strafing with frequent velocity changes.
+        if t.strafe_timer <= 0.0:
+            mag = self.rng.uniform(0.45, 1.0) * speed
+            t.vx = self.rng.choice([-1.0, 1.0]) * mag
+            t.strafe_timer = self.rng.uniform(0.16, 0.48)
+
+        t.x += t.vx * dt
+
+        # Occasional crouch (half height), only when grounded.
+        if not t.jumping and t.crouch_timer <= 0.0 and t.crouch_cooldown <= 0.0:
+            if self.rng.random() < 0.38:
+                t.crouch_timer = self.rng.uniform(0.30, 0.85)
+            t.crouch_cooldown = self.rng.uniform(1.5, 3.8)
+
+        if t.crouch_timer > 0.0:
+            t.crouch_timer -= dt
+            t.h = t.base_h * 0.5
+        else:
+            t.h = t.base_h
+
+        # Occasional jump event, little to no normal vertical drift.
+        if not t.jumping and t.jump_cooldown <= 0.0:
+            if self.rng.random() < 0.24:
+                t.jumping = True
+                t.jump_v = -430.0
+            t.jump_cooldown = self.rng.uniform(2.2, 4.6)
+
+        if t.jumping:
+            t.jump_v += 1000.0 * dt
+            t.y += t.jump_v * dt
+            if t.y >= t.ground_y:
+                t.y = t.ground_y
+                t.jump_v = 0.0
+                t.jumping = False
+        else:
+            # Keep bottom anchored while crouching.
+            if t.h < t.base_h:
+                t.y = t.ground_y + (t.base_h * 0.25)
+            else:
+                t.y = t.ground_y
+
+        half_w = t.w / 2
+
+        if t.x - half_w < self.arena_rect.left:
+            t.x = self.arena_rect.left + half_w
+            t.vx = abs(t.vx)
+        elif t.x + half_w > self.arena_rect.right:
+            t.x = self.arena_rect.right - half_w
+            t.vx = -abs(t.vx)
+            t.x = max(self.arena_rect.left + half_w, min(self.arena_rect.right - half_w, t.x))
+
+        if self._is_in_rect(self.cursor_x, self.cursor_y, t):
+            self.stats.score += 6.0 * dt
+
+    def update(self, dt):
+        if self.recorder:
+            dt, _ = self.recorder.add(REC_FRAME, dt)
+        # Clamp long stalls so a hitch doesn't queue up seconds of catch-up steps.
+        self.accumulator += min(dt, self.max_frame_dt)
+        while self.accumulator >= self.step_dt and self.steps_left > 0:
+            self.accumulator -= self.step_dt
+            self.step()
+        self.alpha = min(1.0, self.accumulator / self.step_dt)
+        return self.steps_left <= 0
+
+    def step(self):
+        dt = self.step_dt
+        self.update_weapon(dt)
+        # Count whole steps so the clock never drifts from the selected duration.
+        self.steps_left = max(0, self.steps_left - 1)
+        self.elapsed_steps += 1
+        self.time_left = self.steps_left * dt
+
+        if self.map_key == "reaction" and self.reaction_waiting:
+            if self.sim_time >= self.reaction_spawn_at:
+                self._place_target(0, *self._spawn_point(26, cluster_scale=0.24), 26)
+                self.reaction_waiting = False
+                self.reaction_shown_at = None if self.stamp_on_present else self.clock()
+
+        if self.map_key == "tracking":
+            self.update_tracking(dt)
+            if self.tracking_metrics and self.elapsed_steps % self.metrics_every == 0:
+                t = self.moving_target
+                on = self._is_in_rect(self.cursor_x, self.cursor_y, t)
+                self.tracking_metrics.sample(self.cursor_x, self.cursor_y, t, on)
+        elif self.map_key == "multi_tracking":
+            self.bots.step(dt, self.rng, self.arena_rect.left, self.arena_rect.right)
+            if self.bots.any_at(self.cursor_x, self.cursor_y):
+                self.stats.score += 6.0 * dt
+
+    def render_pos(self, t):
+        # Blend the last two simulated positions by how far render time is into the next step.
+        a = self.alpha
+        return t.prev_x + (t.x - t.prev_x) * a, t.prev_y + (t.y - t.prev_y) * a
+
+    def result(self):
+        acc = 0.0 if self.stats.shots == 0 else (self.stats.hits / self.stats.shots) * 100.0
+        samples = self.stats.reaction_samples
+        avg_reaction = sum(samples) / len(samples) if samples else None
+        spread = self.stats.reaction_spread
+        reaction_err = sum(spread) / len(spread) if spread else None
+        return {
+            "map": self.map_key,
+            "game": self.profile["name"],
+            "duration": self.duration,
+            "score": round(float(self.stats.score), 3),
+            "shots": int(self.stats.shots),
+            "hits": int(self.stats.hits),
+            "acc": float(acc),
+            "reaction_ms": avg_reaction,
+            "reaction_err_ms": reaction_err,
+            "tracking": self.tracking_metrics.summary() if self.tracking_metrics else None,
+            "flick": self.shot_log.summary() if self.shot_log else None,
+        }
+
+
+def run_simulation(sim: TrainingSim, frames):
+    # Mirrors one iteration of AimLiteApp.run(): clock tick, events in order, update.
+    # A frame's clicks land after its motion, at the cursor position the motion produced.
+    for frame in frames:
+        if isinstance(sim.clock, ManualClock):
+            sim.clock.advance(frame.dt)
+        if frame.ads is not None:
+            sim.set_ads(frame.ads)
+        sim.move(frame.rel_x, frame.rel_y)
+        for _ in range(frame.clicks):
+            sim.click()
+        if sim.update(frame.dt):
+            break
+    return sim.result()
+
+
+REC_FRAME = 1
+REC_MOVE = 2
+REC_CLICK = 3
+REC_ADS = 4
+REC_SPAWN = 5
+REC_HIT = 6
+REC_PROFILE = 7
+REC_END = 8
+REC_SETTING = 9
+# Profile values a run can change mid-way; REC_SETTING carries the index into this and the new value.
+PROFILE_FIELDS = ("yaw", "hipfire_sens", "ads_sens", "dpi", "fov_h_deg", "x_factor", "scope_modifier")
+
+REPLAY_MAGIC = b"ALRC"
+REPLAY_VERSION = 3
+REPLAY_KEEP = 200
+
+
+class SessionRecorder:
+    # Column-oriented record buffers flushed to disk in fixed-size chunks.
+    # Record: kind (u8), time since run start in microseconds (u32), two float32 payloads.
+    # File I/O goes through submit (PersistenceWorker.submit in the app) so full chunks are
+    # packed on the caller's thread and written on the worker's; without one it writes inline.
+    def __init__(self, path: Path, meta: dict, clock, chunk_size=4096, submit=None):
+        self.path = path
+        self.clock = clock
+        self.t0 = clock()
+        self.chunk_size = chunk_size
+        self.kinds = array("B")
+        self.times = array("I")
+        self.a = array("f")
+        self.b = array("f")
+        self.records = 0
+        self.file = None
+        self.closed = False
+        self._submit = submit or (lambda fn, *args: fn(*args))
+
+        meta_bytes = json.dumps(meta, sort_keys=True).encode("utf-8")
+        self._submit(self._open, REPLAY_MAGIC + struct.pack("<HI", REPLAY_VERSION, len(meta_bytes)) + meta_bytes)
+
+    def _open(self, header: bytes):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.file = self.path.open("wb")
+        self.file.write(header)
+
+    def _write(self, data: bytes):
+        # A file that failed to open drops its chunks; the open error is already reported.
+        if self.file is not None:
+            self.file.write(data)
+
+    def _close_file(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    def add(self, kind, a=0.0, b=0.0):
+        self.kinds.append(kind)
+        self.times.append(min(0xFFFFFFFF, max(0, (self.clock() - self.t0) // 1000)))
+        self.a.append(a)
+        self.b.append(b)
+        # Hand back the float32 values actually stored so the live run uses what replay will see.
+        stored = (self.a[-1], self.b[-1])
+        if len(self.kinds) >= self.chunk_size:
+            self.flush()
+        return stored
+
+    def flush(self):
+        n = len(self.kinds)
+        if n == 0 or self.closed:
+            return
+        parts = [struct.pack("<I", n)]
+        for col in (self.kinds, self.times, self.a, self.b):
+            if sys.byteorder == "big":
+                col.byteswap()
+            parts.append(col.tobytes())
+            del col[:]
+        self.records += n
+        self._submit(self._write, b"".join(parts))
+
+    def end(self, stats: SessionStats):
+        self.add(REC_END, stats.score, stats.hits)
+
+    def close(self, stats: SessionStats | None = None):
+        if self.closed:
+            return
+        if stats is not None:
+            self.end(stats)
+        self.flush()
+        self.closed = True
+        self._submit(self._close_file)
+
+
+def read_recording(path: Path):
+    # A file cut off mid-chunk (e.g. by a crash) yields its complete chunks, with
+    # meta["truncated"] set; one cut off inside the header can't be read at all.
+    with path.open("rb") as f:
+        if f.read(4) != REPLAY_MAGIC:
+            raise ValueError(f"{path} is not an AimLite recording")
+        head = f.read(6)
+        if len(head) < 6:
+            raise ValueError(f"{path} is truncated")
+        version, meta_len = struct.unpack("<HI", head)
+        if version != REPLAY_VERSION:
+            raise ValueError(f"unsupported recording version {version}")
+        meta_bytes = f.read(meta_len)
+        if len(meta_bytes) < meta_len:
+            raise ValueError(f"{path} is truncated")
+        meta = json.loads(meta_bytes.decode("utf-8"))
+        meta["truncated"] = False
+
+        records = []
+        while True:
+            head = f.read(4)
+            if len(head) < 4:
+                meta["truncated"] = len(head) > 0
+                break
+            (n,) = struct.unpack("<I", head)
+            cols = []
+            try:
+                for code in ("B", "I", "f", "f"):
+                    col = array(code)
+                    col.fromfile(f, n)
+                    if sys.byteorder == "big":
+                        col.byteswap()
+                    cols.append(col)
+            except EOFError:
+                meta["truncated"] = True
+                break
+            records.extend(zip(*cols))
+    return meta, records
+
+
+def prune_recordings(folder: Path, keep=REPLAY_KEEP):
+    try:
+        files = sorted(folder.glob("*.alrec"), key=lambda p: p.stat().st_mtime)
+    except OSError:
+        return
+    for old in files[:-keep] if keep > 0 else files:
+        try:
+            old.unlink()
+        except OSError:
+            pass
+
+
+def replay_recording(path: Path):
+    meta, records = read_recording(path)
+    clock = ManualClock()
+    profiles = meta["profiles"]
+    game_keys = meta["game_keys"]
+    game_key = meta["game_key"]
+    sim = TrainingSim(
+        meta["width"],
+        meta["height"],
+        profiles[game_key],
+        game_key,
+        meta["game_index"],
+        meta["map"],
+        clock=clock,
+        tick_rate=meta["tick_rate"],
+        gridshot_count=meta.get("gridshot_count", 60),
+        bot_count=meta.get("bot_count", 16),
+    )
+    sim.cursor_x = meta["cursor_x"]
+    sim.cursor_y = meta["cursor_y"]
+    sim.start(meta["duration"], seed=meta["seed"])
+
+    recorded_end = None
+    for kind, t_us, a, b in records:
+        clock.now = t_us / 1e6
+        if kind == REC_FRAME:
+            sim.update(a)
+        elif kind == REC_MOVE:
+            sim.move(a, b)
+        elif kind == REC_CLICK:
+            sim.click()
+        elif kind == REC_ADS:
+            sim.set_ads(a > 0.5)
+        elif kind == REC_PROFILE:
+            idx = int(a)
+            sim.set_profile(game_keys[idx], profiles[game_keys[idx]], idx)
+        elif kind == REC_SETTING:
+            sim.set_profile_value(PROFILE_FIELDS[int(a)], b)
+        elif kind == REC_END:
+            recorded_end = (a, int(b))
+    return meta, sim.result(), recorded_end
+
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    idx = min(len(sorted_values) - 1, max(0, int(round((q / 100.0) * (len(sorted_values) - 1)))))
+    return sorted_values[idx]
+
+
+class FrameTelemetry:
+    # Mouse motion is integrated per event, so its cost is part of events_ms.
+    COLUMNS = ("frame_ms", "events_ms", "update_ms", "draw_ms", "flip_ms", "input_age_ms")
+
+    def __init__(self, target_fps=240, window=720):
+        self.target_fps = target_fps
+        self.budget_ms = 1000.0 / target_fps if target_fps > 0 else math.inf
+        self.columns = {name: array("f") for name in self.COLUMNS}
+        self.recording = False
+        self.recent = deque(maxlen=window)
+        self.frames = 0
+        self.dropped = 0
+        self.overlay_visible = False
+        self.overlay_lines: list[str] = []
+        self._overlay_refresh_at = 0.0
+
+    def begin_run(self):
+        for col in self.columns.values():
+            del col[:]
+        self.recording = True
+        self.frames = 0
+        self.dropped = 0
+
+    def add_frame(self, frame_ms, events_ms, update_ms, draw_ms, flip_ms, input_age_ms):
+        self.frames += 1
+        # A frame that took more than 1.5x its budget pushed at least one present back a refresh.
+        if frame_ms > self.budget_ms * 1.5:
+            self.dropped += 1
+        self.recent.append(frame_ms)
+        if self.recording:
+            row = (frame_ms, events_ms, update_ms, draw_ms, flip_ms, input_age_ms)
+            for name, value in zip(self.COLUMNS, row):
+                self.columns[name].append(value)
+
+    def overlay_text(self, now):
+        if now >= self._overlay_refresh_at:
+            ordered = sorted(self.recent)
+            self.overlay_lines = [
+                f"p50 {percentile(ordered, 50):.2f} ms",
+                f"p99 {percentile(ordered, 99):.2f} ms",
+                f"max {(ordered[-1] if ordered else 0.0):.2f} ms",
+                f"dropped {self.dropped}/{self.frames}",
+            ]
+            self._overlay_refresh_at = now + 0.5
+        return self.overlay_lines
+
+    def end_run(self):
+        # Hands this run's columns over for writing; the next run records into fresh ones.
+        self.recording = False
+        columns = self.columns
+        self.columns = {name: array("f") for name in self.COLUMNS}
+        return columns
+
+    @classmethod
+    def write_csv(cls, path: Path, columns):
+        rows = len(columns["frame_ms"])
+        if rows == 0:
+            return
+        cols = [columns[name] for name in cls.COLUMNS]
+        with path.open("w", encoding="utf-8", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(cls.COLUMNS)
+            for i in range(rows):
+                writer.writerow([f"{c[i]:.3f}" for c in cols])
+
+
+RAPL_ENERGY = Path("/sys/class/powercap/intel-rapl:0/energy_uj")
+
+
+def read_energy_uj():
+    # CPU package energy counter on Linux/Intel when readable; None everywhere else.
+    try:
+        return int(RAPL_ENERGY.read_text())
+    except (OSError, ValueError):
+        return None
+
+
+class FramePacer:
+    # Full rate while a run is on screen; static screens block on the event queue instead of
+    # ticking, waking for input or after 1 / idle_fps so time-driven overlays still refresh.
+    ACTIVE_STATES = ("playing", "run_countdown")
+    COLUMNS = ("mode", "wall_s", "cpu_s", "cpu_pct", "loops", "flips", "full_rate_cpu_pct", "cpu_saved_s", "package_j")
+
+    def __init__(self, target_fps=240, idle_fps=10):
+        self.target_fps = target_fps
+        self.idle_fps = idle_fps
+        self.timeout_ms = max(1, int(1000 / idle_fps)) if idle_fps > 0 else 0
+        # Per mode: wall seconds, CPU seconds, loop iterations, presented frames, package joules.
+        self.stats = {"active": [0.0, 0.0, 0, 0, 0.0], "idle": [0.0, 0.0, 0, 0, 0.0]}
+        self._mode = "active"
+        self._wall = time.perf_counter()
+        self._cpu = time.thread_time()
+        self._energy = read_energy_uj()
+        # CPU per idle loop after its wait; the median stands in for one static frame at full rate.
+        self.idle_loop_cpu: deque[float] = deque(maxlen=256)
+        self._loop_cpu = self._cpu
+
+    def is_idle(self, state):
+        return self.idle_fps > 0 and state not in self.ACTIVE_STATES
+
+    def _charge(self):
+        # Adds the time, CPU and energy since the last charge to the current mode.
+        wall, cpu = time.perf_counter(), time.thread_time()
+        energy = read_energy_uj() if self._energy is not None else None
+        s = self.stats[self._mode]
+        s[0] += wall - self._wall
+        s[1] += cpu - self._cpu
+        if energy is not None and energy >= self._energy:
+            s[4] += (energy - self._energy) / 1e6
+        self._wall, self._cpu, self._energy = wall, cpu, energy
+
+    def begin(self, idle):
+        mode = "idle" if idle else "active"
+        if self._mode == "idle" or idle:
+            cpu = time.thread_time()
+            if self._mode == "idle":
+                self.idle_loop_cpu.append(cpu - self._loop_cpu)
+            self._loop_cpu = cpu
+        if mode != self._mode:
+            self._charge()
+            self._mode = mode
+        self.stats[mode][2] += 1
+
+    def presented(self):
+        self.stats[self._mode][3] += 1
+
+    def wait(self):
+        event = pygame.event.wait(self.timeout_ms)
+        # The loop's own work is measured from here, so SDL's wait doesn't count towards it.
+        self._loop_cpu = time.thread_time()
+        return None if event.type == pygame.NOEVENT else event
+
+    def summary(self, mode):
+        self._charge()
+        wall, cpu, loops, flips, energy = self.stats[mode]
+        cpu_pct = 100.0 * cpu / wall if wall > 0 else 0.0
+        full_pct = cpu_pct
+        if mode == "idle" and self.idle_loop_cpu and wall > 0:
+            # What the same screens would have cost ticking at target_fps.
+            per_loop = percentile(sorted(self.idle_loop_cpu), 50)
+            full_pct = 100.0 if self.target_fps <= 0 else min(100.0, 100.0 * per_loop * self.target_fps)
+            full_pct = max(full_pct, cpu_pct)
+        return {
+            "mode": mode,
+            "wall_s": wall,
+            "cpu_s": cpu,
+            "cpu_pct": cpu_pct,
+            "loops": loops,
+            "flips": flips,
+            "full_rate_cpu_pct": full_pct,
+            "cpu_saved_s": (full_pct - cpu_pct) / 100.0 * wall,
+            "package_j": energy,
+        }
+
+    def overlay_lines(self):
+        idle = self.summary("idle")
+        if not idle["loops"]:
+            return []
+        return [f"idle cpu {idle['cpu_pct']:.1f}% (~{idle['full_rate_cpu_pct']:.0f}% unpaced)"]
+
+    def write_csv(self, path: Path):
+        with path.open("w", encoding="utf-8", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(self.COLUMNS)
+            for mode in self.stats:
+                row = self.summary(mode)
+                writer.writerow([row[c] if isinstance(row[c], (str, int)) else f"{row[c]:.3f}" for c in self.COLUMNS])
+
+
+class TextCache:
+    def __init__(self, max_entries=512):
+        self.max_entries = max_entries
+        self.entries: OrderedDict[tuple, pygame.Surface] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def _lookup(self, key):
+        surf = self.entries.get(key)
+        if surf is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+        else:
+            self.misses += 1
+        return surf
+
+    def _store(self, key, surf):
+        if pygame.display.get_surface() is not None:
+            surf = surf.convert_alpha()
+        self.entries[key] = surf
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+        return surf
+
+    def render(self, font: pygame.font.Font, text: str, color, antialias=True):
+        key = (font, text, color, antialias)
+        surf = self._lookup(key)
+        if surf is None:
+            surf = self._store(key, font.render(text, antialias, color))
+        return surf
+
+    def shadowed(self, font: pygame.font.Font, text: str, color, shadow_color, offset=1, antialias=True):
+        # Shadow and text composed once into one surface, drawn at the text's own origin.
+        key = (font, text, color, antialias, shadow_color, offset)
+        surf = self._lookup(key)
+        if surf is None:
+            front = font.render(text, antialias, color)
+            back = font.render(text, antialias, shadow_color)
+            surf = pygame.Surface((front.get_width() + offset, front.get_height() + offset), pygame.SRCALPHA)
+            surf.blit(back, (offset, offset))
+            surf.blit(front, (0, 0))
+            surf = self._store(key, surf)
+        return surf
+
+    def clear(self):
+        self.entries.clear()
+
+
+class ViewmodelCache:
+    # Weapon and muzzle-flash sprites pre-rendered per quantized aim angle.
+    def __init__(self, angle_step_deg=1.0, flash_levels=8, max_entries=128):
+        self.angle_step = math.radians(angle_step_deg)
+        self.flash_levels = flash_levels
+        self.max_entries = max_entries
+        self.size: tuple[int, int] | None = None
+        self.weapons: OrderedDict[int, tuple] = OrderedDict()
+        self.flashes: OrderedDict[tuple[int, int], tuple] = OrderedDict()
+
+    def ensure_size(self, size):
+        if size != self.size:
+            self.size = size
+            self.weapons.clear()
+            self.flashes.clear()
+
+    def quantize(self, forward: pygame.Vector2):
+        bucket = round(math.atan2(forward.y, forward.x) / self.angle_step)
+        angle = bucket * self.angle_step
+        return bucket, pygame.Vector2(math.cos(angle), math.sin(angle))
+
+    def _cached(self, table, key, build):
+        entry = table.get(key)
+        if entry is None:
+            entry = build()
+            table[key] = entry
+            if len(table) > self.max_entries:
+                table.popitem(last=False)
+        else:
+            table.move_to_end(key)
+        return entry
+
+    def weapon(self, bucket, forward):
+        return self._cached(self.weapons, bucket, lambda: self._build_weapon(forward))
+
+    def flash(self, bucket, forward, level):
+        return self._cached(self.flashes, (bucket, level), lambda: self._build_flash(forward, level / self.flash_levels))
+
+    @staticmethod
+    def _sprite(polys, circles, pad=3):
+        xs = [p.x for _, pts, _ in polys for p in pts] + [c.x + s * r for _, c, r, _ in circles for s in (-1, 1)]
+        ys = [p.y for _, pts, _ in polys for p in pts] + [c.y + s * r for _, c, r, _ in circles for s in (-1, 1)]
+        origin = pygame.Vector2(math.floor(min(xs)) - pad, math.floor(min(ys)) - pad)
+        w = int(math.ceil(max(xs) - origin.x)) + pad
+        h = int(math.ceil(max(ys) - origin.y)) + pad
+        surf = pygame.Surface((w, h), pygame.SRCALPHA)
+        for color, pts, width in polys:
+            pygame.draw.polygon(surf, color, [(int(p.x - origin.x), int(p.y - origin.y)) for p in pts], width)
+        for color, c, r, width in circles:
+            pygame.draw.circle(surf, color, (int(c.x - origin.x), int(c.y - origin.y)), r, width)
+        if pygame.display.get_surface() is not None:
+            surf = surf.convert_alpha()
+        return surf, origin
+
+    def _build_weapon(self, forward: pygame.Vector2):
+        # Geometry is relative to the recoil pivot, so recoil is applied as a blit offset.
+        right = pygame.Vector2(-forward.y, forward.x)
+        down = pygame.Vector2(0.0, 1.0)
+
+        def pt(base: pygame.Vector2, f=0.0, r=0.0, d=0.0):
+            return base + (forward * f) + (right * r) + (down * d)
+
+        rear = forward * 8.0
+        front = rear + forward * 330.0
+
+        # Foreshortened slide/body toward muzzle (front-to-back feel).
+        rear_w = 108.0
+        front_w = 44.0
+        rear_t = 34.0
+        front_t = 18.0
+
+        top_face = [
+            pt(rear, r=rear_w * 0.5),
+            pt(rear, r=-rear_w * 0.5),
+            pt(front, r=-front_w * 0.5),
+            pt(front, r=front_w * 0.5),
+        ]
+        right_face = [
+            pt(rear, r=-rear_w * 0.5),
+            pt(front, r=-front_w * 0.5),
+            pt(front, r=-front_w * 0.5, d=front_t),
+            pt(rear, r=-rear_w * 0.5, d=rear_t),
+        ]
+        left_face = [
+            pt(rear, r=rear_w * 0.5),
+            pt(front, r=front_w * 0.5),
+            pt(front, r=front_w * 0.5, d=front_t),
+            pt(rear, r=rear_w * 0.5, d=rear_t),
+        ]
+
+        # Lower frame chunk.
+        frame_rear = rear - forward * 18.0
+        frame_front = front - forward * 38.0
+        frame_top = [
+            pt(frame_rear, r=rear_w * 0.38, d=rear_t * 0.7),
+            pt(frame_rear, r=-rear_w * 0.38, d=rear_t * 0.7),
+            pt(frame_front, r=-front_w * 0.62, d=front_t * 1.2),
+            pt(frame_front, r=front_w * 0.62, d=front_t * 1.2),
+        ]
+
+        # Grip attached near hand (screen-down).
+        grip = [
+            pt(rear, f=-36, r=26, d=12),
+            pt(rear, f=-34, r=-16, d=12),
+            pt(rear, f=-20, r=-14, d=186),
+            pt(rear, f=-8, r=18, d=206),
+            pt(rear, f=-16, r=38, d=140),
+        ]
+
+        # Muzzle opening.
+        muzzle = pt(front, d=front_t * 0.55)
+
+        surf, origin = self._sprite(
+            [
+                ((82, 91, 106), right_face, 0),
+                ((97, 108, 124), left_face, 0),
+                ((114, 126, 144), top_face, 0),
+                ((66, 74, 89), frame_top, 0),
+                ((70, 78, 94), grip, 0),
+                ((138, 154, 176), top_face, 2),
+                ((112, 125, 145), grip, 2),
+            ],
+            [
+                ((26, 30, 38), muzzle, 10, 0),
+                ((104, 115, 130), muzzle, 10, 2),
+            ],
+        )
+        return surf, origin, muzzle
+
+    def _build_flash(self, fwd: pygame.Vector2, intensity):
+        right = pygame.Vector2(-fwd.y, fwd.x)
+        length = 88.0 * intensity
+        width = 34.0 * intensity
+        flash_poly = [
+            fwd * 8 + right * (width * 0.5),
+            fwd * length,
+            fwd * 8 - right * (width * 0.5),
+        ]
+        origin = pygame.Vector2(0.0, 0.0)
+        return self._sprite(
+            [((255, 226, 148), flash_poly, 0)],
+            [((255, 243, 188), origin, int(16 * intensity), 0)],
+        )
+
+
+class DirtyRectRenderer:
+    # Restores last frame's drawn regions from a cached background and presents only changed rects.
+    def __init__(self, max_fraction=0.35):
+        self.max_fraction = max_fraction
+        self.background: pygame.Surface | None = None
+        self.prev_rects: list[pygame.Rect] = []
+        self.full_next = True
+        self.pixels_pushed = 0
+
+    def invalidate(self):
+        self.full_next = True
+
+    def begin(self, screen: pygame.Surface, color):
+        if self.background is None or self.background.get_size() != screen.get_size():
+            self.background = pygame.Surface(screen.get_size()).convert()
+            self.background.fill(color)
+            self.full_next = True
+
+        if self.full_next:
+            screen.blit(self.background, (0, 0))
+        else:
+            for r in self.prev_rects:
+                screen.blit(self.background, r, r)
+
+    def present(self, screen: pygame.Surface, rects: list[pygame.Rect]):
+        screen_px = screen.get_width() * screen.get_height()
+        dirty = self.prev_rects + rects
+        # Overlaps are counted twice; that only makes the fallback kick in slightly earlier.
+        area = sum(r.w * r.h for r in dirty)
+
+        if self.full_next or area > screen_px * self.max_fraction:
+            pygame.display.flip()
+            self.pixels_pushed = screen_px
+        else:
+            pygame.display.update(dirty)
+            self.pixels_pushed = area
+
+        self.full_next = False
+        self.prev_rects = list(rects)
+
+
+class TextureRenderer:
+    # SDL2 Renderer backend: sprites are uploaded once as textures and drawn as quads each frame.
+    def __init__(self, size, fullscreen=True, max_textures=512):
+        if sdl2_video is None:
+            raise RuntimeError("pygame._sdl2.video is not available")
+        self.window = sdl2_video.Window("AimLite", size, fullscreen=fullscreen)
+        # accelerated=-1 takes the first driver that works; SDL_RENDER_DRIVER=software forces the CPU one.
+        self.renderer = sdl2_video.Renderer(self.window, accelerated=-1, vsync=False)
+        self.max_textures = max_textures
+        self.textures = OrderedDict()
+        self.canvas = None
+        self.uploads = 0
+
+    def texture(self, key, build):
+        tex = self.textures.get(key)
+        if tex is None:
+            tex = sdl2_video.Texture.from_surface(self.renderer, build())
+            self.uploads += 1
+            self.textures[key] = tex
+            if len(self.textures) > self.max_textures:
+                self.textures.popitem(last=False)
+        else:
+            self.textures.move_to_end(key)
+        return tex
+
+    def draw(self, key, build, pos):
+        tex = self.texture(key, build)
+        rect = tex.get_rect(topleft=pos)
+        tex.draw(dstrect=rect)
+        return rect
+
+    def blit(self, surface: pygame.Surface, pos):
+        # Cached surfaces (text, viewmodel sprites) are stable objects, so they key their own texture.
+        return self.draw(surface, lambda: surface, pos)
+
+    def clear(self, color):
+        self.renderer.draw_color = pygame.Color(color)
+        self.renderer.clear()
+
+    def present(self):
+        self.renderer.present()
+
+    def present_canvas(self, surface: pygame.Surface):
+        # Software-drawn screens are uploaded whole into one streaming texture.
+        if self.canvas is None or self.canvas.get_rect().size != surface.get_size():
+            self.canvas = sdl2_video.Texture(self.renderer, surface.get_size(), streaming=True)
+        self.canvas.update(surface)
+        self.canvas.draw()
+        self.present()
+
+    def set_input_lock(self, locked: bool):
+        self.window.grab = locked
+        self.window.relative_mouse = locked
+
+    def close(self):
+        self.textures.clear()
+        self.canvas = None
+
+
+class Widget:
+    # Retained UI element: its surface is re-rendered only when state() changes.
+    def __init__(self, rect, on_click=None):
+        self.rect = pygame.Rect(rect)
+        self.on_click = on_click
+        self.interactive = on_click is not None
+        self.bg = (0, 0, 0)
+        self.hovered = False
+        self.surface: pygame.Surface | None = None
+        self._drawn = None
+
+    def state(self):
+        return self.hovered
+
+    def render(self, state) -> pygame.Surface:
+        return self._blank()
+
+    def refresh(self):
+        # True when the cached surface was re-rendered and needs blitting again.
+        state = self.state()
+        if self.surface is not None and state == self._drawn:
+            return False
+        self._drawn = state
+        self.surface = self.render(state)
+        return True
+
+    def set_hover(self, pos):
+        self.hovered = pos is not None
+
+    def click(self, pos):
+        self.on_click()
+        return True
+
+    def _blank(self):
+        surf = pygame.Surface(self.rect.size)
+        if pygame.display.get_surface() is not None:
+            surf = surf.convert()
+        surf.fill(self.bg)
+        return surf
+
+
+def _value(value):
+    return value() if callable(value) else value
+
+
+class Label(Widget):
+    def __init__(self, rect, text, font, text_cache, color=(224, 235, 245), align="left"):
+        super().__init__(rect)
+        self.text = text
+        self.font = font
+        self.text_cache = text_cache
+        self.color = color
+        self.align = align
+
+    def state(self):
+        return _value(self.text), _value(self.color)
+
+    def render(self, state):
+        text, color = state
+        surf = self._blank()
+        if text:
+            text = self.text_cache.render(self.font, text, color)
+            x = (self.rect.w - text.get_width()) // 2 if self.align == "center" else 0
+            surf.blit(text, (x, (self.rect.h - text.get_height()) // 2))
+        return surf
+
+
+class Button(Widget):
+    def __init__(self, rect, text, on_click, font, text_cache, active=None):
+        super().__init__(rect, on_click)
+        self.text = text
+        self.font = font
+        self.text_cache = text_cache
+        self.active = active
+
+    def state(self):
+        return _value(self.text), bool(self.active and self.active()), self.hovered
+
+    def render(self, state):
+        text, active, hovered = state
+        surf = self._blank()
+        r = surf.get_rect()
+        bg = (31, 50, 70) if active else (26, 41, 58) if hovered else (21, 33, 47)
+        border = (102, 171, 230) if active else (86, 128, 170) if hovered else (62, 90, 120)
+        pygame.draw.rect(surf, bg, r, border_radius=10)
+        pygame.draw.rect(surf, border, r, 2, border_radius=10)
+        label = self.text_cache.render(self.font, text, (230, 238, 248))
+        surf.blit(label, (r.centerx - label.get_width() // 2, r.centery - label.get_height() // 2))
+        return surf
+
+
+class ValueBox(Button):
+    # Settings value field; shows the typing buffer while it is the active input.
+    def render(self, state):
+        text, active, hovered = state
+        surf = self._blank()
+        r = surf.get_rect()
+        bg = (38, 58, 84) if active else (21, 33, 47)
+        border = (114, 194, 255) if active else (86, 128, 170) if hovered else (62, 90, 120)
+        pygame.draw.rect(surf, bg, r, border_radius=8)
+        pygame.draw.rect(surf, border, r, 2, border_radius=8)
+        surf.blit(self.text_cache.render(self.font, text, (232, 240, 250)), (10, 7))
+        return surf
+
+
+class WidgetLayer:
+    # A screen's widgets, built once. draw() re-blits only widgets whose state changed and
+    # returns those rects; clicks and hover are looked up in a spatial hash of the widgets.
+    def __init__(self, bg, cell_size=64):
+        self.bg = bg
+        self.widgets: list[Widget] = []
+        self.grid = SpatialHash(cell_size)
+        self.hovered: Widget | None = None
+        self.valid = False
+
+    def add(self, widget):
+        widget.bg = self.bg
+        if widget.interactive:
+            r = widget.rect
+            self.grid.insert(len(self.widgets), r.centerx, r.centery, max(r.w, r.h) / 2)
+        self.widgets.append(widget)
+        return widget
+
+    def invalidate(self):
+        self.valid = False
+
+    def widget_at(self, pos):
+        for key in reversed(self.grid.at_point(pos[0], pos[1])):
+            widget = self.widgets[key]
+            if widget.rect.collidepoint(pos):
+                return widget
+        return None
+
+    def hover(self, pos):
+        widget = self.widget_at(pos) if pos is not None else None
+        if widget is not self.hovered:
+            if self.hovered:
+                self.hovered.set_hover(None)
+            self.hovered = widget
+        if widget:
+            widget.set_hover(pos)
+
+    def click(self, pos):
+        widget = self.widget_at(pos)
+        return widget.click(pos) if widget else False
+
+    def draw(self, surface: pygame.Surface):
+        if not self.valid:
+            surface.fill(self.bg)
+            for widget in self.widgets:
+                widget.refresh()
+                surface.blit(widget.surface, widget.rect)
+            self.valid = True
+            return [surface.get_rect()]
+        changed = []
+        for widget in self.widgets:
+            if widget.refresh():
+                changed.append(surface.blit(widget.surface, widget.rect))
+        return changed
+
+
+class ScrollView(Widget):
+    # Vertically scrolling panel: its own layer drawn onto a tall canvas, shown through rect.
+    def __init__(self, rect, content_height, bg):
+        super().__init__(rect)
+        self.interactive = True
+        self.bg = bg
+        self.content = WidgetLayer(bg)
+        self.canvas = pygame.Surface((self.rect.w, max(self.rect.h, content_height)))
+        if pygame.display.get_surface() is not None:
+            self.canvas = self.canvas.convert()
+        self.max_scroll = max(0, content_height - self.rect.h)
+        self.scroll = 0
+
+    def local(self, pos):
+        return pos[0] - self.rect.x, pos[1] - self.rect.y + self.scroll
+
+    def refresh(self):
+        changed = self.content.draw(self.canvas)
+        if self.surface is not None and not changed and self.scroll == self._drawn:
+            return False
+        self._drawn = self.scroll
+        self.surface = self.canvas.subsurface((0, self.scroll, self.rect.w, self.rect.h))
+        return True
+
+    def set_hover(self, pos):
+        self.content.hover(self.local(pos) if pos is not None else None)
+
+    def click(self, pos):
+        return self.content.click(self.local(pos))
+
+
+class ScrollBar(Widget):
+    def __init__(self, rect, view: ScrollView):
+        super().__init__(rect)
+        self.view = view
+
+    def state(self):
+        return self.view.scroll
+
+    def render(self, state):
+        surf = self._blank()
+        view = self.view
+        if view.max_scroll <= 0:
+            return surf
+        r = surf.get_rect()
+        pygame.draw.rect(surf, (35, 50, 68), r, border_radius=5)
+        knob_h = max(34, int(r.h * (view.rect.h / view.canvas.get_height())))
+        knob_y = int((state / view.max_scroll) * (r.h - knob_h))
+        pygame.draw.rect(surf, (96, 156, 210), (0, knob_y, r.w, knob_h), border_radius=5)
+        return surf
+
+
+def atomic_write_text(path: Path, text: str):
+    tmp = path.with_name(path.name + ".tmp")
+    with tmp.open("w", encoding="utf-8") as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+    # Persist the rename itself where the platform allows opening directories.
+    try:
+        fd = os.open(path.parent, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+# Longest the UI waits for queued writes before reading what has landed so far.
+PERSIST_FLUSH_TIMEOUT = 2.0
+
+
+class PersistenceWorker:
+    # Writes files off the main thread. Pending JSON writes to the same path coalesce to the newest;
+    # other jobs run once each, in the order they were submitted.
+    def __init__(self):
+        self._pending: dict[Path, str] = {}
+        self._jobs: deque = deque()
+        self._busy = False
+        self._stopping = False
+        self._cond = threading.Condition()
+        self.last_error: Exception | None = None
+        self._thread = threading.Thread(target=self._run, name="aimlite-persist", daemon=True)
+        self._thread.start()
+
+    def write_json(self, path: Path, payload):
+        # Serialise now so later mutations on the main thread can't leak into the write.
+        text = json.dumps(payload, indent=2)
+        with self._cond:
+            self._pending[path] = text
+            self._cond.notify_all()
+
+    def submit(self, fn, *args):
+        with self._cond:
+            self._jobs.append((fn, args))
+            self._cond.notify_all()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._pending and not self._jobs and not self._stopping:
+                    self._cond.wait()
+                if self._jobs:
+                    fn, args = self._jobs.popleft()
+                elif self._pending:
+                    fn, args = atomic_write_text, self._pending.popitem()
+                else:
+                    return
+                self._busy = True
+            try:
+                fn(*args)
+            except Exception as e:
+                # Any failure is kept for the shutdown report; the thread keeps serving the queue.
+                self.last_error = e
+            finally:
+                with self._cond:
+                    self._busy = False
+                    self._cond.notify_all()
+
+    def flush(self, timeout=None):
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._pending and not self._jobs and not self._busy, timeout)
+
+    def close(self):
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        self._thread.join()
+
+
+class RunStore:
+    # Append-only run history; every finished run is one row.
+    # Inserts arrive from the persistence thread, so every statement holds the lock.
+    COLUMNS = (
+        "ended_at",
+        "map",
+        "game",
+        "duration",
+        "shots",
+        "hits",
+        "score",
+        "acc",
+        "reaction_avg_ms",
+        "reaction_best_ms",
+        "reaction_count",
+        "seed",
+        "replay",
+    )
+
+    def __init__(self, path: Path):
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(str(path), check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS runs (
+                id INTEGER PRIMARY KEY,
+                ended_at REAL NOT NULL,
+                map TEXT NOT NULL,
+                game TEXT NOT NULL,
+                duration INTEGER NOT NULL,
+                shots INTEGER NOT NULL,
+                hits INTEGER NOT NULL,
+                score REAL NOT NULL,
+                acc REAL NOT NULL,
+                reaction_avg_ms REAL,
+                reaction_best_ms REAL,
+                reaction_count INTEGER NOT NULL DEFAULT 0,
+                seed INTEGER,
+                replay TEXT
+            );
+            CREATE INDEX IF NOT EXISTS runs_best ON runs (map, game, duration, score DESC);
+            """
+        )
+        self.conn.commit()
+
+    def add(self, run: dict):
+        placeholders = ", ".join("?" for _ in self.COLUMNS)
+        with self.lock:
+            cur = self.conn.execute(
+                f"INSERT INTO runs ({', '.join(self.COLUMNS)}) VALUES ({placeholders})",
+                [run.get(c) for c in self.COLUMNS],
+            )
+            self.conn.commit()
+        return cur.lastrowid
+
+    def best(self, map_key, game, duration):
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT * FROM runs WHERE map = ? AND game = ? AND duration = ? ORDER BY score DESC LIMIT 1",
+                (map_key, game, duration),
+            ).fetchone()
+        return dict(row) if row else None
+
+    def recent(self, limit, offset=0):
+        # "Last N runs" walks the rowid primary key backwards, so it needs no extra index.
+        with self.lock:
+            rows = self.conn.execute("SELECT * FROM runs ORDER BY id DESC LIMIT ? OFFSET ?", (limit, offset))
+            return [dict(r) for r in rows]
+
+    def count(self):
+        with self.lock:
+            return self.conn.execute("SELECT COUNT(*) FROM runs").fetchone()[0]
+
+    def clear(self):
+        with self.lock:
+            self.conn.execute("DELETE FROM runs")
+            self.conn.commit()
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+
+class StartupTimer:
+    def __init__(self):
+        self.t0 = time.perf_counter()
+        self.stages: list[tuple[str, float, float]] = []
+        self.first_frame_at: float | None = None
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            with self._lock:
+                self.stages.append((name, start - self.t0, end - start))
+
+    def report(self):
+        lines = ["stage                 start_ms   took_ms  thread"]
+        with self._lock:
+            stages = sorted(self.stages, key=lambda s: s[1])
+        for name, start, took in stages:
+            where = "bg" if name.startswith("bg:") else "main"
+            lines.append(f"{name.removeprefix('bg:'):<20} {start * 1000.0:9.1f} {took * 1000.0:9.1f}  {where}")
+        if self.first_frame_at is not None:
+            lines.append(f"time-to-first-frame  {(self.first_frame_at - self.t0) * 1000.0:9.1f} ms")
+        return "\n".join(lines)
+
+
+class StateProfiler:
+    # Main-loop profile split per screen: one cProfile per label swapped at frame starts (.pstats),
+    # or a background thread sampling the main thread's stack into collapsed stacks (.folded).
+    MODES = ("sample", "cprofile")
+
+    def __init__(self, mode="sample", interval=0.01):
+        self.mode = mode
+        self.interval = interval
+        self.label = "startup"
+        self.active = True
+        self.profiles: dict[str, cProfile.Profile] = {}
+        self.samples: dict[str, dict[tuple, int]] = {}
+        self._current: cProfile.Profile | None = None
+        self._thread_id = threading.get_ident()
+        self._stop = threading.Event()
+        self._sampler: threading.Thread | None = None
+        if mode == "sample":
+            self._sampler = threading.Thread(target=self._sample_loop, daemon=True)
+            self._sampler.start()
+
+    def frame(self, label):
+        # Called from the main thread at the top of every frame.
+        self.label = label
+        if self.mode != "cprofile":
+            return
+        prof = None
+        if self.active:
+            prof = self.profiles.get(label)
+            if prof is None:
+                prof = self.profiles[label] = cProfile.Profile()
+        if prof is not self._current:
+            if self._current:
+                self._current.disable()
+            if prof:
+                prof.enable()
+            self._current = prof
+
+    def toggle(self):
+        self.active = not self.active
+
+    def _sample_loop(self):
+        current_frames = sys._current_frames
+        while not self._stop.wait(self.interval):
+            if not self.active:
+                continue
+            frame = current_frames().get(self._thread_id)
+            stack = []
+            while frame is not None:
+                stack.append(frame.f_code)
+                frame = frame.f_back
+            counts = self.samples.setdefault(self.label, {})
+            key = tuple(stack)
+            counts[key] = counts.get(key, 0) + 1
+
+    def close(self, folder: Path) -> list[Path]:
+        self._stop.set()
+        if self._sampler:
+            self._sampler.join()
+        if self._current:
+            self._current.disable()
+            self._current = None
+
+        stamp = time.strftime("%Y%m%d_%H%M%S")
+        written = []
+        for label, prof in self.profiles.items():
+            path = folder / f"profile_{label}_{stamp}.pstats"
+            prof.dump_stats(path)
+            written.append(path)
+        names = {}
+        for label, counts in self.samples.items():
+            lines = []
+            for stack, count in counts.items():
+                frames = []
+                for code in reversed(stack):
+                    name = names.get(code)
+                    if name is None:
+                        name = names[code] = f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})"
+                    frames.append(name)
+                lines.append(f"{';'.join(frames)} {count}\n")
+            path = folder / f"profile_{label}_{stamp}.folded"
+            atomic_write_text(path, "".join(sorted(lines)))
+            written.append(path)
+        return written
+
+
+class AimLiteApp:
+    def __init__(
+        self,
+        telemetry=False,
+        dirty_rects=False,
+        startup_report=False,
+        input_log=False,
+        target_fps=240,
+        tick_rate=1000,
+        gridshot_targets=60,
+        bots=16,
+        window_size=None,
+        profile=None,
+        idle_fps=10,
+        renderer="software",
+    ):
+        self.startup = StartupTimer()
+        self.startup_report = startup_report
+
+        # Only display and fonts are initialised up front; the mixer is opened by the audio loader.
+        with self.startup.stage("display"):
+            pygame.display.init()
+            pygame.display.set_caption("AimLite")
+
+            if window_size:
+                self.width, self.height = window_size
+            else:
+                info = pygame.display.Info()
+                self.width, self.height = info.current_w, info.current_h
+
+            self.renderer: TextureRenderer | None = None
+            if renderer == "sdl2":
+                try:
+                    self.renderer = TextureRenderer((self.width, self.height), fullscreen=not window_size)
+                except RuntimeError as exc:
+                    print(f"sdl2 renderer unavailable ({exc}), using software drawing")
+
+            if self.renderer:
+                # Menus are still drawn in software, onto an offscreen canvas the renderer uploads.
+                self.screen = pygame.Surface((self.width, self.height))
+            elif window_size:
+                self.screen = pygame.display.set_mode(window_size)
+            else:
+                self.screen = pygame.display.set_mode((self.width, self.height), pygame.FULLSCREEN)
+        self.clock = pygame.time.Clock()
+        self.target_fps = target_fps
+        self.telemetry: FrameTelemetry | None = FrameTelemetry(self.target_fps) if telemetry else None
+        # F3 can create telemetry for the overlay; only --telemetry writes the per-run CSVs.
+        self.write_telemetry = telemetry
+        self.pacer = FramePacer(self.target_fps, idle_fps)
+        self.profiler: StateProfiler | None = StateProfiler(profile) if profile else None
+
+        with self.startup.stage("menu_fonts"):
+            pygame.font.init()
+            self.font = pygame.font.SysFont("consolas", 24)
+            self.title_font = pygame.font.SysFont("consolas", 44)
+        self._small_font: pygame.font.Font | None = None
+        self.text_cache = TextCache()
+        self.viewmodel = ViewmodelCache()
+        # The texture renderer redraws every frame, so dirty rects only apply to software drawing.
+        self.dirty: DirtyRectRenderer | None = DirtyRectRenderer() if dirty_rects and not self.renderer else None
+        self.frame_rects: list[pygame.Rect] = []
+        self.textured = False
+        # Per click: time left, then cursor offset between the click event and the frame-start position.
+        self.input_log: array | None = array("f") if input_log else None
+        self._frame_cursor = (0.0, 0.0)
+
+        self.persist = PersistenceWorker()
         self.running = True
         self.screen_state = "main_menu"
 
-        self.maps = ["regular_flick", "small_flick", "tracking", "reaction"]
+        self.maps = ["regular_flick", "small_flick", "gridshot", "tracking", "multi_tracking", "reaction"]
         self.map_names = {
             "regular_flick": "Regular Ball Flick",
             "small_flick": "Small Ball Flick",
+            "gridshot": "Gridshot",
             "tracking": "Tracking",
+            "multi_tracking": "Multi Tracking",
             "reaction": "Reaction",
         }
         self.map_index = 0
@@ -66,12 +2634,12 @@ class AimLiteApp:
 
         self._loaded_crosshair_cfg = {}
         self._loaded_audio_cfg = {}
-        self.profiles = self._load_profiles()
+        with self.startup.stage("profiles"):
+            self.profiles = self._load_profiles()
         self.game_keys = list(self.profiles.keys())
         self.game_index = 0
         self.game_key = self.game_keys[self.game_index]
 
-        self.stats = SessionStats()
         self.crosshair = Crosshair()
         self.sound_enabled = True
         self.master_volume = 0.70
@@ -79,31 +2647,39 @@ class AimLiteApp:
         self.hit_volume = 0.65
         self.audio_available = False
         self.sounds: dict[str, pygame.mixer.Sound] = {}
-        self.ads_held = False
 
-        self.arena_rect = pygame.Rect(0, 0, self.width, self.height)
-        self.cursor_x = float(self.arena_rect.centerx)
-        self.cursor_y = float(self.arena_rect.centery)
-
-        self.targets: list[dict] = []
-        self.moving_target: dict | None = None
-        self.reaction_spawn_at = 0.0
-        self.reaction_waiting = False
+        self.sim = TrainingSim(
+            self.width,
+            self.height,
+            self._profile(),
+            self.game_key,
+            self.game_index,
+            self.current_map,
+            clock=time.perf_counter_ns,
+            tick_rate=tick_rate,
+            gridshot_count=gridshot_targets,
+            bot_count=bots,
+        )
+        self.sim.stamp_on_present = True
 
-        self.time_left = 0.0
         self.countdown_left = 0.0
-        self.score_history: list[dict] = []
-        self.high_scores = self._load_scores()
+        self._runs: RunStore | None = None
+        # Best run per (map, game, duration), kept current in memory since inserts land asynchronously.
+        self.best_runs: dict[tuple, dict | None] = {}
+        self.scores_page = 0
+        self.scores_page_rows: list[dict] = []
+        self.scores_total = 0
+        self._high_scores: dict | None = None
         self.last_run_summary: dict[str, str] = {}
         self.last_run_new_high = False
         self.settings_origin = "main_menu"
-        self.recoil_kick = 0.0
-        self.muzzle_flash_t = 0.0
         self.muzzle_flash_pos = pygame.Vector2(self.width * 0.5, self.height * 0.5)
         self.muzzle_flash_dir = pygame.Vector2(1.0, 0.0)
 
-        self.click_regions: list[tuple[pygame.Rect, str, str | None]] = []
-        self.value_boxes: dict[str, pygame.Rect] = {}
+        # Menu screens are built once on first display; see _ui_layer.
+        self.ui: dict[str, WidgetLayer] = {}
+        self.settings_view: ScrollView | None = None
+        self.mouse_pos: tuple[int, int] | None = None
         self.active_input_key: str | None = None
         self.input_buffer = ""
         self.settings_scroll = 0.0
@@ -127,21 +2703,70 @@ class AimLiteApp:
         }
 
         self._apply_loaded_settings()
-        self._init_audio()
         self._set_input_lock(False)
         self._init_map()
 
+        self._audio_loader = threading.Thread(target=self._load_audio, daemon=True)
+        self._audio_loader.start()
+        # Started after the first frame; the menus mostly sleep in the event wait meanwhile.
+        self._spawn_warmer = threading.Thread(target=self._warm_spawn_points, daemon=True)
+
+    def _warm_spawn_points(self):
+        for radius, cluster_scale in self.sim.spawn_layouts():
+            spawn_point_set(self.sim.arena_rect.size, radius, cluster_scale)
+
+    @property
+    def small_font(self):
+        if self._small_font is None:
+            with self.startup.stage("small_font"):
+                self._small_font = pygame.font.SysFont("consolas", 19)
+        return self._small_font
+
+    @property
+    def high_scores(self):
+        if self._high_scores is None:
+            with self.startup.stage("scores"):
+                self._high_scores = self._load_scores()
+        return self._high_scores
+
+    @high_scores.setter
+    def high_scores(self, value):
+        self._high_scores = value
+
+    @property
+    def runs(self):
+        if self._runs is None:
+            with self.startup.stage("run_store"):
+                self._runs = RunStore(RUNS_PATH)
+        return self._runs
+
+    def _load_audio(self):
+        with self.startup.stage("bg:audio"):
+            self._init_audio()
+
     def _set_input_lock(self, locked: bool):
         pygame.mouse.set_visible(not locked)
         pygame.event.set_grab(locked)
+        if self.renderer:
+            self.renderer.set_input_lock(locked)
         if locked:
-            pygame.mouse.get_rel()
+            pygame.event.clear(pygame.MOUSEMOTION)
+
+    def _invalidate_screen(self):
+        if self.dirty:
+            self.dirty.invalidate()
+        for layer in self.ui.values():
+            layer.invalidate()
 
     def _set_state(self, new_state: str):
         self.screen_state = new_state
+        self._invalidate_screen()
         self.active_input_key = None
         self.input_buffer = ""
-        self.ads_held = False
+        self.sim.set_ads(False)
+
+        if new_state == "scores":
+            self._load_scores_page(0)
 
         if new_state in ("playing", "run_countdown"):
             self._set_input_lock(True)
@@ -154,51 +2779,6 @@ class AimLiteApp:
         self._set_state("settings")
 
     def _load_profiles(self):
-        default_profiles = {
-            "cs2": {
-                "name": "Counter-Strike 2",
-                "yaw": 0.022,
-                "hipfire_sens": 1.5,
-                "ads_sens": 1.0,
-                "dpi": 800,
-                "fov_h_deg": 106.26,
-            },
-            "valorant": {
-                "name": "Valorant",
-                "yaw": 0.07,
-                "hipfire_sens": 0.35,
-                "ads_sens": 1.0,
-                "dpi": 800,
-                "fov_h_deg": 103.0,
-            },
-            "marvel_rivals": {
-                "name": "Marvel Rivals",
-                "yaw": 0.0066,
-                "hipfire_sens": 2.0,
-                "ads_sens": 1.0,
-                "dpi": 800,
-                "fov_h_deg": 103.0,
-            },
-            "r6": {
-                "name": "Rainbow Six Siege",
-                "yaw": 0.0057296,
-                "hipfire_sens": 50.0,
-                "ads_sens": 50.0,
-                "dpi": 800,
-                "fov_h_deg": 90.0,
-                "x_factor": 0.02,
-                "scope_modifier": 0.6,
-            },
-            "ow2": {
-                "name": "Overwatch 2",
-                "yaw": 0.0066,
-                "hipfire_sens": 4.0,
-                "ads_sens": 1.0,
-                "dpi": 800,
-                "fov_h_deg": 103.0,
-            },
-        }
-
         if CONFIG_PATH.exists():
             with CONFIG_PATH.open("r", encoding="utf-8-sig") as f:
                 raw = json.load(f)
@@ -208,7 +2788,7 @@ class AimLiteApp:
                 self._loaded_crosshair_cfg = raw.get("crosshair", {}) or {}
                 self._loaded_audio_cfg = raw.get("audio", {}) or {}
 
-            merged = {k: dict(v) for k, v in default_profiles.items()}
+            merged = {k: dict(v) for k, v in DEFAULT_PROFILES.items()}
             if isinstance(profiles_in, dict):
                 for game_key, base in merged.items():
                     custom = profiles_in.get(game_key)
@@ -216,7 +2796,7 @@ class AimLiteApp:
                         base.update(custom)
             return merged
 
-        return default_profiles
+        return {k: dict(v) for k, v in DEFAULT_PROFILES.items()}
 
     def _save_profiles(self):
         payload = {
@@ -235,14 +2815,15 @@ class AimLiteApp:
                 "hit_volume": self.hit_volume,
             },
         }
-        with CONFIG_PATH.open("w", encoding="utf-8") as f:
-            json.dump(payload, f, indent=2)
+        self.persist.write_json(CONFIG_PATH, payload)
 
     def _default_high_scores(self):
         return {
             "regular_flick": {"score": 0.0, "shots": 0, "hits": 0, "acc": 0.0, "game": "-", "duration": 0},
             "small_flick": {"score": 0.0, "shots": 0, "hits": 0, "acc": 0.0, "game": "-", "duration": 0},
+            "gridshot": {"score": 0.0, "shots": 0, "hits": 0, "acc": 0.0, "game": "-", "duration": 0},
             "tracking": {"score": 0.0, "shots": 0, "hits": 0, "acc": 0.0, "game": "-", "duration": 0},
+            "multi_tracking": {"score": 0.0, "shots": 0, "hits": 0, "acc": 0.0, "game": "-", "duration": 0},
             "reaction": {"score": 0.0, "shots": 0, "hits": 0, "acc": 0.0, "game": "-", "duration": 0},
         }
 
@@ -262,8 +2843,7 @@ class AimLiteApp:
         return default
 
     def _save_scores(self):
-        with SCORES_PATH.open("w", encoding="utf-8") as f:
-            json.dump(self.high_scores, f, indent=2)
+        self.persist.write_json(SCORES_PATH, self.high_scores)
 
     def _apply_loaded_settings(self):
         c = self._loaded_crosshair_cfg
@@ -287,14 +2867,9 @@ class AimLiteApp:
             self.gun_volume = float(max(0.0, min(1.0, a.get("gun_volume", self.gun_volume))))
             self.hit_volume = float(max(0.0, min(1.0, a.get("hit_volume", self.hit_volume))))
 
-    def _build_sound(self, duration_sec, sample_fn, sample_rate=44100):
-        samples = int(duration_sec * sample_rate)
-        data = array("h")
-        for i in range(samples):
-            t = i / sample_rate
-            v = max(-1.0, min(1.0, sample_fn(t)))
-            data.append(int(v * 32767))
-        return pygame.mixer.Sound(buffer=data.tobytes())
+    def _build_sound(self, name):
+        sample_rate, fmt, channels = pygame.mixer.get_init()
+        return pygame.mixer.Sound(buffer=cached_pcm(name, sample_rate, fmt, channels))
 
     def _init_audio(self):
         try:
@@ -302,19 +2877,8 @@ class AimLiteApp:
                 pygame.mixer.init(frequency=44100, size=-16, channels=1)
             self.audio_available = True
 
-            def gun_fn(t):
-                env = math.exp(-t * 14.0)
-                crack = (random.random() * 2.0 - 1.0) * math.exp(-t * 52.0)
-                mid = math.sin(2.0 * math.pi * (280.0 - 140.0 * t) * t) * math.exp(-t * 20.0)
-                bass = math.sin(2.0 * math.pi * 95.0 * t) * math.exp(-t * 10.0)
-                return (0.55 * crack + 0.50 * mid + 0.30 * bass) * env
-
-            def hit_fn(t):
-                tone = math.sin(2.0 * math.pi * 940.0 * t) * math.exp(-t * 30.0)
-                return tone * 0.45
-
-            self.sounds["gun"] = self._build_sound(0.18, gun_fn)
-            self.sounds["hit"] = self._build_sound(0.09, hit_fn)
+            self.sounds["gun"] = self._build_sound("gun")
+            self.sounds["hit"] = self._build_sound("hit")
             self._apply_sound_volumes()
         except pygame.error:
             self.audio_available = False
@@ -349,20 +2913,7 @@ class AimLiteApp:
         return math.degrees(h)
 
     def _active_sens(self):
-        p = self._profile()
-        hip = max(1e-6, float(p["hipfire_sens"]))
-
-        if self.game_key == "r6" and self.ads_held:
-            ads = float(p.get("ads_sens", 50.0))
-            x_factor = float(p.get("x_factor", 0.02))
-            scope_mod = float(p.get("scope_modifier", 0.6))
-            ads_modifier = max(0.0, min(1.0, (ads * x_factor) * scope_mod))
-            return hip * ads_modifier
-
-        if self.ads_held:
-            return hip * max(0.01, float(p.get("ads_sens", 1.0)))
-
-        return hip
+        return active_sens(self._profile(), self.game_key, self.sim.ads_held)
 
     def _cm360(self):
         p = self._profile()
@@ -371,91 +2922,12 @@ class AimLiteApp:
         sens = self._active_sens()
         return (360.0 * 2.54) / (dpi * yaw * sens)
 
-    def _spawn_cluster_point(self, cluster_scale=0.28):
-        center_x, center_y = self.arena_rect.center
-        radius = min(self.arena_rect.w, self.arena_rect.h) * cluster_scale
-        angle = random.random() * math.tau
-        dist = (random.random() ** 0.5) * radius
-        x = center_x + math.cos(angle) * dist
-        y = center_y + math.sin(angle) * dist
-        x = max(self.arena_rect.left + 36, min(self.arena_rect.right - 36, x))
-        y = max(self.arena_rect.top + 36, min(self.arena_rect.bottom - 36, y))
-        return x, y
-
-    def _spawn_target(self, r, cluster_scale=0.28):
-        x, y = self._spawn_cluster_point(cluster_scale)
-        return {"x": x, "y": y, "r": r}
-
-    def _spawn_non_overlapping_target(self, existing_targets, radius, cluster_scale=0.28, min_gap=12.0):
-        for _ in range(60):
-            candidate = self._spawn_target(radius, cluster_scale)
-            collides = False
-            for other in existing_targets:
-                dx = candidate["x"] - other["x"]
-                dy = candidate["y"] - other["y"]
-                min_dist = candidate["r"] + other["r"] + min_gap
-                if dx * dx + dy * dy < min_dist * min_dist:
-                    collides = True
-                    break
-            if not collides:
-                return candidate
-        return self._spawn_target(radius, cluster_scale)
-
     def _init_map(self):
-        self.targets.clear()
-        self.moving_target = None
-        now = pygame.time.get_ticks() / 1000.0
-        self.recoil_kick = 0.0
-        self.muzzle_flash_t = 0.0
+        # Targets are placed by sim.start(), so picking a map only selects it.
+        self.sim.map_key = self.current_map
         self.muzzle_flash_pos = pygame.Vector2(self.width * 0.5, self.height * 0.5)
         self.muzzle_flash_dir = pygame.Vector2(1.0, 0.0)
 
-        if self.current_map == "regular_flick":
-            for _ in range(3):
-                self.targets.append(self._spawn_non_overlapping_target(self.targets, 30, cluster_scale=0.10))
-        elif self.current_map == "small_flick":
-            for _ in range(3):
-                self.targets.append(self._spawn_non_overlapping_target(self.targets, 16, cluster_scale=0.24))
-        elif self.current_map == "reaction":
-            self.targets = []
-            self.reaction_waiting = True
-            self.reaction_spawn_at = now + random.uniform(0.5, 1.5)
-        elif self.current_map == "tracking":
-            speed = 210 * (1.0 + (self.game_index * 0.05))
-            base_h = 126
-            base_w = 42
-            self.moving_target = {
-                "x": float(self.arena_rect.centerx),
-                "y": float(self.arena_rect.centery),
-                "ground_y": float(self.arena_rect.centery),
-                "w": base_w,
-                "h": base_h,
-                "base_w": base_w,
-                "base_h": base_h,
-                "vx": random.choice([-1.0, 1.0]) * speed * 0.7,
-                "jump_v": 0.0,
-                "jumping": False,
-                "strafe_timer": random.uniform(0.22, 0.55),
-                "crouch_timer": 0.0,
-                "crouch_cooldown": random.uniform(1.6, 3.2),
-                "jump_cooldown": random.uniform(2.0, 4.0),
-            }
-
-    def _px_per_degree(self):
-        h_fov = max(1e-3, float(self._profile().get("fov_h_deg", 103.0)))
-        return self.arena_rect.w / h_fov
-
-    def _fire_shot_point(self):
-        # Stronger one-tap kick closer to a Deagle feel.
-        self.recoil_kick = min(1.8, self.recoil_kick + 0.55)
-        self.muzzle_flash_t = 0.06
-        return self.cursor_x, self.cursor_y
-
-    def _update_weapon(self, dt):
-        # Slightly slower recovery so recoil reads clearly.
-        self.recoil_kick = max(0.0, self.recoil_kick - (2.9 * dt))
-        self.muzzle_flash_t = max(0.0, self.muzzle_flash_t - dt)
-
     def _switch_map(self, delta):
         self.map_index = (self.map_index + delta) % len(self.maps)
         self.current_map = self.maps[self.map_index]
@@ -464,217 +2936,183 @@ class AimLiteApp:
     def _switch_game(self, delta):
         self.game_index = (self.game_index + delta) % len(self.game_keys)
         self.game_key = self.game_keys[self.game_index]
+        self.sim.set_profile(self.game_key, self._profile(), self.game_index)
 
-    def _register_shot(self):
-        self.stats.shots += 1
-
-    def _register_hit(self, value=10.0):
-        self.stats.hits += 1
-        self.stats.score += value
-
-    def _is_in_circle(self, x, y, t):
-        dx, dy = x - t["x"], y - t["y"]
-        return dx * dx + dy * dy <= t["r"] * t["r"]
-
-    def _is_in_rect(self, x, y, t):
-        left = t["x"] - t["w"] / 2
-        top = t["y"] - t["h"] / 2
-        return left <= x <= left + t["w"] and top <= y <= top + t["h"]
-
-    def _handle_training_click(self):
-        self._register_shot()
+    def _handle_training_click(self, at_ns=None, spread_ns=0):
+        if self.input_log is not None:
+            fx, fy = self._frame_cursor
+            self.input_log.extend((self.sim.time_left, self.sim.cursor_x - fx, self.sim.cursor_y - fy))
         self._play_sound("gun")
-        shot_x, shot_y = self._fire_shot_point()
-        hit = False
-
-        if self.current_map in ("regular_flick", "small_flick"):
-            radius = 30 if self.current_map == "regular_flick" else 16
-            for i, t in enumerate(self.targets):
-                if self._is_in_circle(shot_x, shot_y, t):
-                    others = [x for idx, x in enumerate(self.targets) if idx != i]
-                    self.targets[i] = self._spawn_non_overlapping_target(others, radius, cluster_scale=0.10)
-                    self._register_hit(10.0)
-                    hit = True
-                    break
-
-        elif self.current_map == "reaction" and self.targets:
-            t = self.targets[0]
-            if self._is_in_circle(shot_x, shot_y, t):
-                now = pygame.time.get_ticks() / 1000.0
-                self.stats.reaction_samples.append((now - self.reaction_spawn_at) * 1000.0)
-                self.targets = []
-                self.reaction_waiting = True
-                self.reaction_spawn_at = now + random.uniform(0.5, 1.5)
-                self._register_hit(15.0)
-                hit = True
-
-        elif self.current_map == "tracking" and self.moving_target:
-            if self._is_in_rect(shot_x, shot_y, self.moving_target):
-                self._register_hit(5.0)
-                hit = True
-
-        if not hit:
-            self.stats.score = max(0.0, self.stats.score - 2.0)
-        else:
+        if self.sim.click(at_ns, spread_ns):
             self._play_sound("hit")
 
-    def _draw_crosshair(self):
-        x, y = int(self.cursor_x), int(self.cursor_y)
+    def _blit(self, surf: pygame.Surface, pos):
+        if self.textured:
+            return self.renderer.blit(surf, pos)
+        return self.screen.blit(surf, pos)
+
+    def _crosshair_lines(self, surface, x, y):
         c = self.crosshair.color
         t = self.crosshair.thickness
         g = self.crosshair.gap
         s = self.crosshair.size
 
-        pygame.draw.line(self.screen, c, (x - g - s, y), (x - g, y), t)
-        pygame.draw.line(self.screen, c, (x + g, y), (x + g + s, y), t)
-        pygame.draw.line(self.screen, c, (x, y - g - s), (x, y - g), t)
-        pygame.draw.line(self.screen, c, (x, y + g), (x, y + g + s), t)
-
+        rects = [
+            pygame.draw.line(surface, c, (x - g - s, y), (x - g, y), t),
+            pygame.draw.line(surface, c, (x + g, y), (x + g + s, y), t),
+            pygame.draw.line(surface, c, (x, y - g - s), (x, y - g), t),
+            pygame.draw.line(surface, c, (x, y + g), (x, y + g + s), t),
+        ]
         if self.crosshair.dot:
-            pygame.draw.circle(self.screen, c, (x, y), max(1, t))
+            rects.append(pygame.draw.circle(surface, c, (x, y), max(1, t)))
+        return rects
+
+    def _crosshair_sprite(self, half):
+        surf = pygame.Surface((half * 2 + 1, half * 2 + 1), pygame.SRCALPHA)
+        self._crosshair_lines(surf, half, half)
+        return surf
+
+    def _draw_crosshair(self):
+        x, y = int(self.sim.cursor_x), int(self.sim.cursor_y)
+        if not self.textured:
+            self.frame_rects.extend(self._crosshair_lines(self.screen, x, y))
+            return
 
-    def _draw_target_circle(self, t, color=(255, 108, 96)):
-        center = (int(t["x"]), int(t["y"]))
-        pygame.draw.circle(self.screen, color, center, int(t["r"]))
-        pygame.draw.circle(self.screen, (245, 248, 255), center, int(t["r"]), 2)
+        ch = self.crosshair
+        half = ch.gap + ch.size + ch.thickness
+        key = ("crosshair", ch.color, ch.thickness, ch.gap, ch.size, ch.dot)
+        self.frame_rects.append(self.renderer.draw(key, lambda: self._crosshair_sprite(half), (x - half, y - half)))
+
+    @staticmethod
+    def _circle_sprite(r, color):
+        surf = pygame.Surface((r * 2 + 2, r * 2 + 2), pygame.SRCALPHA)
+        pygame.draw.circle(surf, color, (r + 1, r + 1), r)
+        pygame.draw.circle(surf, (245, 248, 255), (r + 1, r + 1), r, 2)
+        return surf
+
+    @staticmethod
+    def _box_sprite(w, h, color, radius):
+        surf = pygame.Surface((w, h), pygame.SRCALPHA)
+        pygame.draw.rect(surf, color, surf.get_rect(), border_radius=radius)
+        return surf
+
+    def _draw_box(self, rect: pygame.Rect, color, radius):
+        if self.textured:
+            key = ("box", rect.w, rect.h, color, radius)
+            rect = self.renderer.draw(key, lambda: self._box_sprite(rect.w, rect.h, color, radius), rect.topleft)
+        else:
+            rect = pygame.draw.rect(self.screen, color, rect, border_radius=radius)
+        self.frame_rects.append(rect)
+
+    def _draw_target_circle(self, x, y, r, color=(255, 108, 96)):
+        center = (int(x), int(y))
+        r = int(r)
+        if self.textured:
+            pos = (center[0] - r - 1, center[1] - r - 1)
+            self.frame_rects.append(self.renderer.draw(("circle", r, color), lambda: self._circle_sprite(r, color), pos))
+            return
+        self.frame_rects.append(pygame.draw.circle(self.screen, color, center, r))
+        pygame.draw.circle(self.screen, (245, 248, 255), center, r, 2)
 
     def _draw_weapon(self):
         # Perspective-style first-person viewmodel: points toward the target.
         hand = pygame.Vector2(self.width * 0.80, self.height * 0.87)
-        aim = pygame.Vector2(self.cursor_x, self.cursor_y)
+        aim = pygame.Vector2(self.sim.cursor_x, self.sim.cursor_y)
         forward = aim - hand
         if forward.length_squared() < 1.0:
             forward = pygame.Vector2(-1.0, -0.2)
-        else:
-            forward = forward.normalize()
 
-        right = pygame.Vector2(-forward.y, forward.x)
+        self.viewmodel.ensure_size(self.screen.get_size())
+        bucket, forward = self.viewmodel.quantize(forward)
         down = pygame.Vector2(0.0, 1.0)
 
-        recoil_back = forward * (self.recoil_kick * 70.0)
-        recoil_up = down * (-self.recoil_kick * 26.0)
+        recoil_back = forward * (self.sim.recoil_kick * 70.0)
+        recoil_up = down * (-self.sim.recoil_kick * 26.0)
         pivot = hand - recoil_back + recoil_up
 
-        def pt(base: pygame.Vector2, f=0.0, r=0.0, d=0.0):
-            p = base + (forward * f) + (right * r) + (down * d)
-            return (int(p.x), int(p.y))
-
-        rear = pivot + forward * 8.0
-        front = rear + forward * 330.0
-
-        # Foreshortened slide/body toward muzzle (front-to-back feel).
-        rear_w = 108.0
-        front_w = 44.0
-        rear_t = 34.0
-        front_t = 18.0
-
-        top_face = [
-            pt(rear, r=rear_w * 0.5),
-            pt(rear, r=-rear_w * 0.5),
-            pt(front, r=-front_w * 0.5),
-            pt(front, r=front_w * 0.5),
-        ]
-        right_face = [
-            pt(rear, r=-rear_w * 0.5),
-            pt(front, r=-front_w * 0.5),
-            pt(front, r=-front_w * 0.5, d=front_t),
-            pt(rear, r=-rear_w * 0.5, d=rear_t),
-        ]
-        left_face = [
-            pt(rear, r=rear_w * 0.5),
-            pt(front, r=front_w * 0.5),
-            pt(front, r=front_w * 0.5, d=front_t),
-            pt(rear, r=rear_w * 0.5, d=rear_t),
-        ]
-
-        # Lower frame chunk.
-        frame_rear = rear - forward * 18.0
-        frame_front = front - forward * 38.0
-        frame_top = [
-            pt(frame_rear, r=rear_w * 0.38, d=rear_t * 0.7),
-            pt(frame_rear, r=-rear_w * 0.38, d=rear_t * 0.7),
-            pt(frame_front, r=-front_w * 0.62, d=front_t * 1.2),
-            pt(frame_front, r=front_w * 0.62, d=front_t * 1.2),
-        ]
-
-        # Grip attached near hand (screen-down).
-        grip = [
-            pt(rear, f=-36, r=26, d=12),
-            pt(rear, f=-34, r=-16, d=12),
-            pt(rear, f=-20, r=-14, d=186),
-            pt(rear, f=-8, r=18, d=206),
-            pt(rear, f=-16, r=38, d=140),
-        ]
-
-        pygame.draw.polygon(self.screen, (82, 91, 106), right_face)
-        pygame.draw.polygon(self.screen, (97, 108, 124), left_face)
-        pygame.draw.polygon(self.screen, (114, 126, 144), top_face)
-        pygame.draw.polygon(self.screen, (66, 74, 89), frame_top)
-        pygame.draw.polygon(self.screen, (70, 78, 94), grip)
-
-        pygame.draw.polygon(self.screen, (138, 154, 176), top_face, 2)
-        pygame.draw.polygon(self.screen, (112, 125, 145), grip, 2)
-
-        # Muzzle opening.
-        muzzle_center = pygame.Vector2(pt(front, d=front_t * 0.55))
-        self.muzzle_flash_pos = muzzle_center
+        sprite, origin, muzzle = self.viewmodel.weapon(bucket, forward)
+        self.frame_rects.append(self._blit(sprite, (int(pivot.x + origin.x), int(pivot.y + origin.y))))
+        self.muzzle_flash_pos = pivot + muzzle
         self.muzzle_flash_dir = forward
-        pygame.draw.circle(self.screen, (26, 30, 38), (int(muzzle_center.x), int(muzzle_center.y)), 10)
-        pygame.draw.circle(self.screen, (104, 115, 130), (int(muzzle_center.x), int(muzzle_center.y)), 10, 2)
 
     def _draw_muzzle_flash(self):
-        if self.muzzle_flash_t <= 0.0:
+        if self.sim.muzzle_flash_t <= 0.0:
             return
 
-        intensity = min(1.0, self.muzzle_flash_t / 0.06)
+        intensity = min(1.0, self.sim.muzzle_flash_t / 0.06)
+        level = max(1, int(math.ceil(intensity * self.viewmodel.flash_levels)))
+        bucket, fwd = self.viewmodel.quantize(self.muzzle_flash_dir)
+        sprite, origin = self.viewmodel.flash(bucket, fwd, level)
         p = self.muzzle_flash_pos
-        fwd = self.muzzle_flash_dir
-        right = pygame.Vector2(-fwd.y, fwd.x)
-        length = 88.0 * intensity
-        width = 34.0 * intensity
-
-        flash_poly = [
-            (int(p.x + fwd.x * 8 + right.x * (width * 0.5)), int(p.y + fwd.y * 8 + right.y * (width * 0.5))),
-            (int(p.x + fwd.x * length), int(p.y + fwd.y * length)),
-            (int(p.x + fwd.x * 8 - right.x * (width * 0.5)), int(p.y + fwd.y * 8 - right.y * (width * 0.5))),
-        ]
-        pygame.draw.polygon(self.screen, (255, 226, 148), flash_poly)
-        pygame.draw.circle(self.screen, (255, 243, 188), (int(p.x), int(p.y)), int(16 * intensity))
+        self.frame_rects.append(self._blit(sprite, (int(p.x + origin.x), int(p.y + origin.y))))
 
     def _draw_tracking_target(self):
-        t = self.moving_target
+        t = self.sim.moving_target
         if not t:
             return
 
+        x, y = self.sim.render_pos(t)
         rect = pygame.Rect(
-            int(t["x"] - t["w"] / 2),
-            int(t["y"] - t["h"] / 2),
-            int(t["w"]),
-            int(t["h"]),
+            int(x - t.w / 2),
+            int(y - t.h / 2),
+            int(t.w),
+            int(t.h),
         )
-        pygame.draw.rect(self.screen, (93, 197, 255), rect, border_radius=12)
-
-    def _draw_button(self, rect: pygame.Rect, text: str, active=False):
-        bg = (31, 50, 70) if active else (21, 33, 47)
-        border = (102, 171, 230) if active else (62, 90, 120)
-        pygame.draw.rect(self.screen, bg, rect, border_radius=10)
-        pygame.draw.rect(self.screen, border, rect, 2, border_radius=10)
-        surf = self.font.render(text, True, (230, 238, 248))
-        self.screen.blit(surf, (rect.centerx - surf.get_width() // 2, rect.centery - surf.get_height() // 2))
+        self._draw_box(rect, (93, 197, 255), 12)
+
+    def _draw_bots(self):
+        bots = self.sim.bots
+        a = self.sim.alpha
+        w = bots.w
+        for i in range(bots.count):
+            x = bots.prev_x[i] + (bots.x[i] - bots.prev_x[i]) * a
+            y = bots.prev_y[i] + (bots.y[i] - bots.prev_y[i]) * a
+            h = bots.h[i]
+            rect = pygame.Rect(int(x - w / 2), int(y - h / 2), int(w), int(h))
+            self._draw_box(rect, (93, 197, 255), 8)
+
+    def _ui_layer(self, name) -> WidgetLayer:
+        layer = self.ui.get(name)
+        if layer is None:
+            layer = self.ui[name] = getattr(self, f"_build_{name}")()
+        return layer
+
+    def _draw_ui(self, name):
+        layer = self._ui_layer(name)
+        if self.telemetry and self.telemetry.overlay_visible:
+            # The overlay is drawn over the menu every frame, so last frame's pixels can't be reused.
+            layer.invalidate()
+        layer.hover(self.mouse_pos)
+        self.frame_rects.extend(layer.draw(self.screen))
+
+    def _label(self, x, y, text, font, color=(224, 235, 245), w=None, align="left"):
+        w = self.width - x if w is None else w
+        return Label((x, y, w, font.get_height()), text, font, self.text_cache, color, align)
+
+    def _button(self, rect, text, on_click, active=None, font=None):
+        return Button(rect, text, on_click, font or self.font, self.text_cache, active)
+
+    def _quit(self):
+        self.running = False
+
+    def _pick_map(self, map_key):
+        self.current_map = map_key
+        self.map_index = self.maps.index(map_key)
+        self._init_map()
 
-    def _draw_main_menu(self):
-        self.click_regions.clear()
-        self.screen.fill((9, 14, 22))
+    def _pick_duration(self, index):
+        self.duration_index = max(0, min(len(self.durations) - 1, index))
 
-        title = self.title_font.render("AimLite", True, (236, 245, 255))
-        self.screen.blit(title, (self.width // 2 - title.get_width() // 2, 100))
+    def _build_main_menu(self):
+        layer = WidgetLayer((9, 14, 22))
+        layer.add(self._label(0, 100, "AimLite", self.title_font, (236, 245, 255), w=self.width, align="center"))
 
         options = [
-            ("Play", "main_play"),
-            ("Select Map", "main_map"),
-            ("Settings", "main_settings"),
-            ("Scores", "main_scores"),
-            ("Quit", "main_quit"),
+            ("Play", self._start_run),
+            ("Select Map", lambda: self._set_state("map_select")),
+            ("Settings", lambda: self._open_settings("main_menu")),
+            ("Scores", lambda: self._set_state("scores")),
+            ("Quit", self._quit),
         ]
 
         w, h = 360, 64
@@ -682,68 +3120,112 @@ class AimLiteApp:
         y = 230
         gap = 18
         for label, action in options:
-            rect = pygame.Rect(x, y, w, h)
-            self._draw_button(rect, label)
-            self.click_regions.append((rect, action, None))
+            layer.add(self._button((x, y, w, h), label, action))
             y += h + gap
+        return layer
 
-    def _draw_map_select(self):
-        self.click_regions.clear()
-        self.screen.fill((9, 14, 22))
+    def _draw_main_menu(self):
+        self._draw_ui("main_menu")
 
-        title = self.title_font.render("Select Map", True, (236, 245, 255))
-        self.screen.blit(title, (80, 60))
+    def _build_map_select(self):
+        layer = WidgetLayer((9, 14, 22))
+        layer.add(self._label(80, 60, "Select Map", self.title_font, (236, 245, 255)))
 
         y = 150
         for i, map_key in enumerate(self.maps):
-            rect = pygame.Rect(80, y, 520, 60)
-            self._draw_button(rect, self.map_names[map_key], active=(i == self.map_index))
-            self.click_regions.append((rect, "map_pick", map_key))
+            pick = lambda k=map_key: self._pick_map(k)  # noqa: E731
+            layer.add(self._button((80, y, 520, 60), self.map_names[map_key], pick, lambda i=i: i == self.map_index))
             y += 74
 
-        dur_title = self.font.render("Time Limit", True, (236, 245, 255))
-        self.screen.blit(dur_title, (700, 160))
-
+        layer.add(self._label(700, 160, "Time Limit", self.font, (236, 245, 255)))
         for i, dur in enumerate(self.durations):
-            rect = pygame.Rect(700, 210 + i * 74, 260, 60)
-            self._draw_button(rect, f"{dur} sec", active=(i == self.duration_index))
-            self.click_regions.append((rect, "duration_pick", str(i)))
+            pick = lambda i=i: self._pick_duration(i)  # noqa: E731
+            layer.add(self._button((700, 210 + i * 74, 260, 60), f"{dur} sec", pick, lambda i=i: i == self.duration_index))
 
-        start_rect = pygame.Rect(700, 470, 260, 64)
-        back_rect = pygame.Rect(700, 548, 260, 64)
-        self._draw_button(start_rect, "Start")
-        self._draw_button(back_rect, "Back")
-        self.click_regions.append((start_rect, "start_run", None))
-        self.click_regions.append((back_rect, "back_main", None))
+        layer.add(self._button((700, 470, 260, 64), "Start", self._start_run))
+        layer.add(self._button((700, 548, 260, 64), "Back", lambda: self._set_state("main_menu")))
+        return layer
 
-    def _draw_scores(self):
-        self.click_regions.clear()
-        self.screen.fill((9, 14, 22))
-
-        title = self.title_font.render("Scores", True, (236, 245, 255))
-        self.screen.blit(title, (80, 60))
+    def _draw_map_select(self):
+        self._draw_ui("map_select")
+
+    def _high_score_line(self, map_key):
+        hs = self.high_scores.get(map_key, {})
+        return (
+            f"{self.map_names[map_key]} | Score {float(hs.get('score', 0.0)):.0f} | "
+            f"Acc {float(hs.get('acc', 0.0)):.1f}% | Hits {int(hs.get('hits', 0))}/{int(hs.get('shots', 0))} | "
+            f"{hs.get('game', '-')} @ {int(hs.get('duration', 0))}s"
+        )
 
-        header = self.small_font.render("Per-Map High Scores (saved locally)", True, (167, 206, 241))
-        self.screen.blit(header, (80, 130))
+    def _recent_runs_header(self):
+        pages = max(1, math.ceil(self.scores_total / self._scores_page_size()))
+        return f"Recent Runs ({self.scores_total} total) - page {self.scores_page + 1}/{pages}"
+
+    def _recent_run_line(self, i):
+        if i >= len(self.scores_page_rows):
+            return ""
+        run = self.scores_page_rows[i]
+        when = time.strftime("%Y-%m-%d %H:%M", time.localtime(run["ended_at"]))
+        txt = (
+            f"{when} | {self.map_names.get(run['map'], run['map'])} | Score {run['score']:.0f} | "
+            f"Acc {run['acc']:.1f}% | Hits {run['hits']}/{run['shots']} | {run['game']} @ {run['duration']}s"
+        )
+        if run["reaction_avg_ms"] is not None:
+            txt += f" | Avg {run['reaction_avg_ms']:.0f} ms"
+        return txt
+
+    def _clear_scores(self):
+        self.persist.submit(self.runs.clear)
+        self.best_runs.clear()
+        self.high_scores = self._default_high_scores()
+        self._save_scores()
+        self._load_scores_page(0)
+
+    def _build_scores(self):
+        layer = WidgetLayer((9, 14, 22))
+        layer.add(self._label(80, 60, "Scores", self.title_font, (236, 245, 255)))
+        layer.add(self._label(80, 130, "Per-Map High Scores (saved locally)", self.small_font, (167, 206, 241)))
 
         y = 170
         for map_key in self.maps:
-            hs = self.high_scores.get(map_key, {})
-            txt = (
-                f"{self.map_names[map_key]} | Score {float(hs.get('score', 0.0)):.0f} | "
-                f"Acc {float(hs.get('acc', 0.0)):.1f}% | Hits {int(hs.get('hits', 0))}/{int(hs.get('shots', 0))} | "
-                f"{hs.get('game', '-')} @ {int(hs.get('duration', 0))}s"
-            )
-            surf = self.small_font.render(txt, True, (224, 235, 245))
-            self.screen.blit(surf, (80, y))
+            layer.add(self._label(80, y, lambda k=map_key: self._high_score_line(k), self.small_font))
             y += 36
 
-        back_rect = pygame.Rect(80, self.height - 100, 220, 60)
-        clear_rect = pygame.Rect(320, self.height - 100, 220, 60)
-        self._draw_button(back_rect, "Back")
-        self._draw_button(clear_rect, "Clear")
-        self.click_regions.append((back_rect, "back_main", None))
-        self.click_regions.append((clear_rect, "scores_clear", None))
+        layer.add(self._label(80, y + 14, self._recent_runs_header, self.small_font, (167, 206, 241)))
+        y += 50
+        for i in range(self._scores_page_size()):
+            layer.add(self._label(80, y, lambda i=i: self._recent_run_line(i), self.small_font))
+            y += 28
+
+        bottom = self.height - 100
+        layer.add(self._button((80, bottom, 220, 60), "Back", lambda: self._set_state("main_menu")))
+        layer.add(self._button((320, bottom, 220, 60), "Clear", self._clear_scores))
+        layer.add(self._button((560, bottom, 120, 60), "Prev", lambda: self._load_scores_page(self.scores_page - 1)))
+        layer.add(self._button((690, bottom, 120, 60), "Next", lambda: self._load_scores_page(self.scores_page + 1)))
+        return layer
+
+    def _draw_scores(self):
+        self._draw_ui("scores")
+
+    def _scores_page_size(self):
+        # Rows that fit between the high-score table and the bottom buttons.
+        return max(1, (self.height - 130 - 170 - 36 * len(self.maps) - 50) // 28)
+
+    def _best_run(self, map_key, game, duration):
+        key = (map_key, game, duration)
+        if key not in self.best_runs:
+            # Only a cache miss touches the database; queued inserts and clears land first.
+            self.persist.flush(PERSIST_FLUSH_TIMEOUT)
+            self.best_runs[key] = self.runs.best(*key)
+        return self.best_runs[key]
+
+    def _load_scores_page(self, page):
+        self.persist.flush(PERSIST_FLUSH_TIMEOUT)
+        size = self._scores_page_size()
+        self.scores_total = self.runs.count()
+        last_page = max(0, math.ceil(self.scores_total / size) - 1)
+        self.scores_page = max(0, min(last_page, page))
+        self.scores_page_rows = self.runs.recent(size, self.scores_page * size)
 
     def _format_setting_value(self, key: str):
         p = self._profile()
@@ -789,13 +3271,25 @@ class AimLiteApp:
             return f"{self.hit_volume:.2f}"
         return ""
 
-    def _draw_settings(self):
-        self.click_regions.clear()
-        self.value_boxes.clear()
+    def _setting_text(self, key):
+        return self.input_buffer if self.active_input_key == key else self._format_setting_value(key)
+
+    def _edit_setting(self, key):
+        self.active_input_key = key
+        self.input_buffer = self._format_setting_value(key)
+
+    def _toggle_dot(self):
+        self.crosshair.dot = not self.crosshair.dot
+
+    def _toggle_sound(self):
+        self.sound_enabled = not self.sound_enabled
 
-        self.screen.fill((9, 14, 22))
-        title = self.title_font.render("Settings", True, (236, 245, 255))
-        self.screen.blit(title, (80, 40))
+    def _settings_back(self):
+        self._set_state("playing" if self.settings_origin == "playing" else "main_menu")
+
+    def _build_settings(self):
+        layer = WidgetLayer((9, 14, 22))
+        layer.add(self._label(80, 40, "Settings", self.title_font, (236, 245, 255)))
 
         left_x = 80
         value_x = 460
@@ -804,7 +3298,6 @@ class AimLiteApp:
         content_bottom = self.height - 170
         row_h = 36
         row_step = 34
-        y = 130 - self.settings_scroll
 
         rows = [
             ("Game Profile", "game_name", False),
@@ -828,283 +3321,311 @@ class AimLiteApp:
             ("Hit Volume", "hit_volume", True),
         ]
 
-        content_height = len(rows) * row_step
-        view_height = max(1, content_bottom - 130)
-        max_scroll = max(0.0, content_height - view_height)
-        self.settings_scroll = max(0.0, min(self.settings_scroll, max_scroll))
-
+        # Rows live on a scroll view spanning the content area; y below is in view coordinates.
+        pad = 10
+        view_rect = pygame.Rect(0, content_top, self.width - 40, content_bottom - content_top)
+        view = layer.add(ScrollView(view_rect, pad + (len(rows) - 1) * row_step + row_h, layer.bg))
+        self.settings_view = view
+        content = view.content
+        y = pad
         for label, key, editable in rows:
-            visible = (y + row_h >= content_top) and (y <= content_bottom)
-            if visible:
-                label_surf = self.small_font.render(label, True, (226, 236, 245))
-                self.screen.blit(label_surf, (left_x, y + 8))
-
-                value_rect = pygame.Rect(value_x, int(y), 180, row_h)
-                active = self.active_input_key == key
-                bg = (38, 58, 84) if active else (21, 33, 47)
-                border = (114, 194, 255) if active else (62, 90, 120)
-                pygame.draw.rect(self.screen, bg, value_rect, border_radius=8)
-                pygame.draw.rect(self.screen, border, value_rect, 2, border_radius=8)
-
-                if active:
-                    text = self.input_buffer
-                else:
-                    text = self._format_setting_value(key)
+            content.add(Label((left_x, y, value_x - left_x, row_h), label, self.small_font, self.text_cache, (226, 236, 245)))
+            edit = (lambda k=key: self._edit_setting(k)) if editable else None
+            content.add(
+                ValueBox(
+                    (value_x, y, 180, row_h),
+                    lambda k=key: self._setting_text(k),
+                    edit,
+                    self.small_font,
+                    self.text_cache,
+                    lambda k=key: self.active_input_key == k,
+                )
+            )
 
-                val_surf = self.small_font.render(text, True, (232, 240, 250))
-                self.screen.blit(val_surf, (value_rect.x + 10, value_rect.y + 7))
+            if key == "game_name":
+                content.add(self._button((btn_x, y, 44, row_h), "<", lambda: self._switch_game(-1)))
+                content.add(self._button((btn_x + 54, y, 44, row_h), ">", lambda: self._switch_game(1)))
+            if key == "crosshair_dot":
+                content.add(self._button((btn_x, y, 98, row_h), "Toggle", self._toggle_dot))
+            if key == "sound_enabled":
+                content.add(self._button((btn_x, y, 98, row_h), "Toggle", self._toggle_sound))
+            y += row_step
 
-                if editable:
-                    self.click_regions.append((value_rect, "settings_edit", key))
-                    self.value_boxes[key] = value_rect
+        layer.add(ScrollBar((self.width - 34, content_top, 10, content_bottom - content_top), view))
 
-                if key == "game_name":
-                    prev_rect = pygame.Rect(btn_x, int(y), 44, row_h)
-                    next_rect = pygame.Rect(btn_x + 54, int(y), 44, row_h)
-                    self._draw_button(prev_rect, "<")
-                    self._draw_button(next_rect, ">")
-                    self.click_regions.append((prev_rect, "game_cycle", "-1"))
-                    self.click_regions.append((next_rect, "game_cycle", "1"))
+        hint = "Click a value box, type exact number, press Enter to apply."
+        layer.add(self._label(80, self.height - 150, hint, self.small_font, (157, 212, 255)))
 
-                if key == "crosshair_dot":
-                    toggle_rect = pygame.Rect(btn_x, int(y), 98, row_h)
-                    self._draw_button(toggle_rect, "Toggle")
-                    self.click_regions.append((toggle_rect, "dot_toggle", None))
+        back_label = lambda: "Resume" if self.settings_origin == "playing" else "Back"  # noqa: E731
+        layer.add(self._button((80, self.height - 100, 220, 60), "Save Profiles", self._save_profiles))
+        layer.add(self._button((320, self.height - 100, 220, 60), back_label, self._settings_back))
+        return layer
 
-                if key == "sound_enabled":
-                    toggle_rect = pygame.Rect(btn_x, int(y), 98, row_h)
-                    self._draw_button(toggle_rect, "Toggle")
-                    self.click_regions.append((toggle_rect, "sound_toggle", None))
+    def _draw_settings(self):
+        self._ui_layer("settings")
+        view = self.settings_view
+        self.settings_scroll = max(0.0, min(self.settings_scroll, float(view.max_scroll)))
+        view.scroll = int(self.settings_scroll)
+        self._draw_ui("settings")
+
+    def _summary_rows(self):
+        s = self.last_run_summary
+        rows = [
+            f"Map: {s.get('map', '-')}",
+            f"Game: {s.get('game', '-')}",
+            f"Time: {s.get('duration', '-')}",
+            f"Shots Fired: {s.get('shots', '0')}",
+            f"Targets Killed: {s.get('hits', '0')}",
+            f"Accuracy: {s.get('acc', '0.0%')}",
+            f"Score: {s.get('score', '0')}",
+            f"Best ({s.get('game', '-')}, {s.get('duration', '-')}): {s.get('best', '-')}",
+        ]
+        if self.current_map == "reaction":
+            rows.append(f"Avg Reaction: {s.get('avg_reaction', '-')}")
+        return rows
+
+    def _summary_cell(self, column, i):
+        rows = self._summary_rows() if column == "main" else self.last_run_summary.get("details", ())
+        return rows[i] if i < len(rows) else ""
+
+    def _build_run_summary(self):
+        layer = WidgetLayer((9, 14, 22))
+        layer.add(self._label(80, 70, "Run Summary", self.title_font, (236, 245, 255)))
+        layer.add(
+            self._label(
+                80,
+                130,
+                lambda: "NEW HIGH SCORE" if self.last_run_new_high else "Run Complete",
+                self.font,
+                lambda: (158, 235, 177) if self.last_run_new_high else (184, 204, 224),
+            )
+        )
 
-            y += row_step
+        for i in range(9):
+            layer.add(self._label(80, 190 + i * 44, lambda i=i: self._summary_cell("main", i), self.font, w=self.width // 2 - 80))
+        # Tracking and flick details sit in a second column so the button row stays clear.
+        for i in range(6):
+            layer.add(self._label(self.width // 2, 190 + i * 32, lambda i=i: self._summary_cell("details", i), self.small_font))
 
-        if max_scroll > 0:
-            bar_rect = pygame.Rect(self.width - 34, content_top, 10, content_bottom - content_top)
-            pygame.draw.rect(self.screen, (35, 50, 68), bar_rect, border_radius=5)
-            knob_h = max(34, int(bar_rect.h * (view_height / max(content_height, 1))))
-            knob_y = int(bar_rect.y + (self.settings_scroll / max_scroll) * (bar_rect.h - knob_h))
-            knob = pygame.Rect(bar_rect.x, knob_y, bar_rect.w, knob_h)
-            pygame.draw.rect(self.screen, (96, 156, 210), knob, border_radius=5)
-
-        hint = self.small_font.render("Click a value box, type exact number, press Enter to apply.", True, (157, 212, 255))
-        self.screen.blit(hint, (80, self.height - 150))
-
-        save_rect = pygame.Rect(80, self.height - 100, 220, 60)
-        back_rect = pygame.Rect(320, self.height - 100, 220, 60)
-        back_label = "Resume" if self.settings_origin == "playing" else "Back"
-        self._draw_button(save_rect, "Save Profiles")
-        self._draw_button(back_rect, back_label)
-        self.click_regions.append((save_rect, "settings_save", None))
-        self.click_regions.append((back_rect, "settings_back", None))
+        bottom = self.height - 110
+        layer.add(self._button((80, bottom, 220, 64), "Play Again", self._start_run))
+        layer.add(self._button((320, bottom, 220, 64), "Scores", lambda: self._set_state("scores")))
+        layer.add(self._button((560, bottom, 220, 64), "Main Menu", lambda: self._set_state("main_menu")))
+        return layer
 
     def _draw_run_summary(self):
-        self.click_regions.clear()
-        self.screen.fill((9, 14, 22))
-
-        title = self.title_font.render("Run Summary", True, (236, 245, 255))
-        self.screen.blit(title, (80, 70))
-
-        sub = "NEW HIGH SCORE" if self.last_run_new_high else "Run Complete"
-        sub_surf = self.font.render(sub, True, (158, 235, 177) if self.last_run_new_high else (184, 204, 224))
-        self.screen.blit(sub_surf, (80, 130))
-
-        y = 190
-        rows = [
-            f"Map: {self.last_run_summary.get('map', '-')}",
-            f"Game: {self.last_run_summary.get('game', '-')}",
-            f"Time: {self.last_run_summary.get('duration', '-')}",
-            f"Shots Fired: {self.last_run_summary.get('shots', '0')}",
-            f"Targets Killed: {self.last_run_summary.get('hits', '0')}",
-            f"Accuracy: {self.last_run_summary.get('acc', '0.0%')}",
-            f"Score: {self.last_run_summary.get('score', '0')}",
-        ]
-        for r in rows:
-            surf = self.font.render(r, True, (224, 235, 245))
-            self.screen.blit(surf, (80, y))
-            y += 44
-
-        play_again = pygame.Rect(80, self.height - 110, 220, 64)
-        view_scores = pygame.Rect(320, self.height - 110, 220, 64)
-        menu = pygame.Rect(560, self.height - 110, 220, 64)
-        self._draw_button(play_again, "Play Again")
-        self._draw_button(view_scores, "Scores")
-        self._draw_button(menu, "Main Menu")
-        self.click_regions.append((play_again, "summary_play_again", None))
-        self.click_regions.append((view_scores, "summary_scores", None))
-        self.click_regions.append((menu, "summary_menu", None))
+        self._draw_ui("run_summary")
 
     def _draw_countdown(self):
-        self.screen.fill((7, 12, 18))
-        title = self.title_font.render(self.map_names[self.current_map], True, (236, 245, 255))
-        self.screen.blit(title, (self.width // 2 - title.get_width() // 2, self.height // 2 - 130))
+        if self.textured:
+            self.renderer.clear((7, 12, 18))
+        else:
+            self.screen.fill((7, 12, 18))
+        title = self.text_cache.render(self.title_font, self.map_names[self.current_map], (236, 245, 255))
+        self._blit(title, (self.width // 2 - title.get_width() // 2, self.height // 2 - 130))
         sec = max(1, int(math.ceil(self.countdown_left)))
-        num = self.title_font.render(str(sec), True, (158, 235, 177))
-        self.screen.blit(num, (self.width // 2 - num.get_width() // 2, self.height // 2 - 40))
-        sub = self.font.render("Get ready...", True, (184, 204, 224))
-        self.screen.blit(sub, (self.width // 2 - sub.get_width() // 2, self.height // 2 + 28))
+        num = self.text_cache.render(self.title_font, str(sec), (158, 235, 177))
+        self._blit(num, (self.width // 2 - num.get_width() // 2, self.height // 2 - 40))
+        sub = self.text_cache.render(self.font, "Get ready...", (184, 204, 224))
+        self._blit(sub, (self.width // 2 - sub.get_width() // 2, self.height // 2 + 28))
 
     def _draw_training(self):
-        self.screen.fill((7, 12, 18))
+        if self.textured:
+            self.renderer.clear((7, 12, 18))
+        elif self.dirty:
+            self.dirty.begin(self.screen, (7, 12, 18))
+        else:
+            self.screen.fill((7, 12, 18))
 
         if self.current_map == "tracking":
             self._draw_tracking_target()
+        elif self.current_map == "multi_tracking":
+            self._draw_bots()
         else:
-            for t in self.targets:
-                self._draw_target_circle(t)
+            pool = self.sim.targets
+            for i in range(pool.count):
+                self._draw_target_circle(pool.xs[i], pool.ys[i], pool.rs[i])
 
         self._draw_weapon()
         self._draw_muzzle_flash()
         self._draw_crosshair()
 
-        acc = 0.0 if self.stats.shots == 0 else (self.stats.hits / self.stats.shots) * 100.0
+        stats = self.sim.stats
+        acc = 0.0 if stats.shots == 0 else (stats.hits / stats.shots) * 100.0
         hud = [
-            f"{self._profile()['name']} | {self.map_names[self.current_map]} | {self.time_left:05.1f}s",
-            f"Score {self.stats.score:.0f}  Hits {self.stats.hits}/{self.stats.shots} ({acc:.1f}%)",
+            f"{self._profile()['name']} | {self.map_names[self.current_map]} | {self.sim.time_left:05.1f}s",
+            f"Score {stats.score:.0f}  Hits {stats.hits}/{stats.shots} ({acc:.1f}%)",
             "Esc: Settings",
         ]
+        tm = self.sim.tracking_metrics
+        if tm and len(tm.recent_on):
+            hud.insert(2, f"On target {tm.recent_on.mean() * 100:.0f}%  Error {tm.recent_error.mean():.0f} px (last 2s)")
 
         y = 16
         for line in hud:
-            surf = self.small_font.render(line, True, (220, 232, 245))
-            shadow = self.small_font.render(line, True, (8, 10, 14))
-            self.screen.blit(shadow, (18 + 1, y + 1))
-            self.screen.blit(surf, (18, y))
+            surf = self.text_cache.shadowed(self.small_font, line, (220, 232, 245), (8, 10, 14))
+            self.frame_rects.append(self._blit(surf, (18, y)))
             y += 24
 
-        if self.current_map == "reaction" and self.reaction_waiting:
-            txt = self.font.render("Get Ready...", True, (168, 213, 255))
-            self.screen.blit(txt, (self.width // 2 - txt.get_width() // 2, self.height // 2 - 140))
-
-    def _update_tracking(self, dt):
-        t = self.moving_target
-        if not t:
-            return
-
-        speed = 210 * (1.0 + (self.game_index * 0.05))
-        t["strafe_timer"] -= dt
-        t["crouch_cooldown"] -= dt
-        t["jump_cooldown"] -= dt
-
-        # Unpredictable horizontal strafing with frequent velocity changes.
-        if t["strafe_timer"] <= 0.0:
-            mag = random.uniform(0.45, 1.0) * speed
-            t["vx"] = random.choice([-1.0, 1.0]) * mag
-            t["strafe_timer"] = random.uniform(0.16, 0.48)
-
-        t["x"] += t["vx"] * dt
-
-        # Occasional crouch (half height), only when grounded.
-        if not t["jumping"] and t["crouch_timer"] <= 0.0 and t["crouch_cooldown"] <= 0.0:
-            if random.random() < 0.38:
-                t["crouch_timer"] = random.uniform(0.30, 0.85)
-            t["crouch_cooldown"] = random.uniform(1.5, 3.8)
-
-        if t["crouch_timer"] > 0.0:
-            t["crouch_timer"] -= dt
-            t["h"] = t["base_h"] * 0.5
-        else:
-            t["h"] = t["base_h"]
-
-        # Occasional jump event, little to no normal vertical drift.
-        if not t["jumping"] and t["jump_cooldown"] <= 0.0:
-            if random.random() < 0.24:
-                t["jumping"] = True
-                t["jump_v"] = -430.0
-            t["jump_cooldown"] = random.uniform(2.2, 4.6)
-
-        if t["jumping"]:
-            t["jump_v"] += 1000.0 * dt
-            t["y"] += t["jump_v"] * dt
-            if t["y"] >= t["ground_y"]:
-                t["y"] = t["ground_y"]
-                t["jump_v"] = 0.0
-                t["jumping"] = False
-        else:
-            # Keep bottom anchored while crouching.
-            if t["h"] < t["base_h"]:
-                t["y"] = t["ground_y"] + (t["base_h"] * 0.25)
-            else:
-                t["y"] = t["ground_y"]
-
-        half_w, half_h = t["w"] / 2, t["h"] / 2
-
-        if t["x"] - half_w < self.arena_rect.left:
-            t["x"] = self.arena_rect.left + half_w
-            t["vx"] = abs(t["vx"])
-        elif t["x"] + half_w > self.arena_rect.right:
-            t["x"] = self.arena_rect.right - half_w
-            t["vx"] = -abs(t["vx"])
-            t["x"] = max(self.arena_rect.left + half_w, min(self.arena_rect.right - half_w, t["x"]))
-
-        if self._is_in_rect(self.cursor_x, self.cursor_y, t):
-            self.stats.score += 6.0 * dt
-
-    def _update_mouse(self):
-        rel_x, rel_y = pygame.mouse.get_rel()
-        p = self._profile()
-
-        yaw = max(1e-6, float(p["yaw"]))
-        sens = self._active_sens()
-        px_per_degree = self._px_per_degree()
-        px_per_count = yaw * sens * px_per_degree
-
-        self.cursor_x += rel_x * px_per_count
-        self.cursor_y += rel_y * px_per_count
-
-        self.cursor_x = max(self.arena_rect.left, min(self.arena_rect.right, self.cursor_x))
-        self.cursor_y = max(self.arena_rect.top, min(self.arena_rect.bottom, self.cursor_y))
+        if self.current_map == "reaction" and self.sim.reaction_waiting:
+            txt = self.text_cache.render(self.font, "Get Ready...", (168, 213, 255))
+            self.frame_rects.append(self._blit(txt, (self.width // 2 - txt.get_width() // 2, self.height // 2 - 140)))
 
     def _start_run(self):
-        self.stats = SessionStats()
         self.selected_duration = self.durations[self.duration_index]
-        self.time_left = float(self.selected_duration)
+        self.sim.map_key = self.current_map
+        self._close_recording(None)
+        seed = random.getrandbits(63)
+        self.sim.recorder = self._open_recording(seed)
+        self.sim.start(self.selected_duration, seed=seed)
+        self.muzzle_flash_pos = pygame.Vector2(self.width * 0.5, self.height * 0.5)
+        self.muzzle_flash_dir = pygame.Vector2(1.0, 0.0)
         self.countdown_left = 3.0
-        self._init_map()
+        # Looked up before the countdown so the run summary needs no query.
+        self._best_run(self.current_map, self._profile()["name"], int(self.selected_duration))
+        if self.telemetry:
+            self.telemetry.begin_run()
+        if self.input_log is not None:
+            del self.input_log[:]
         self._set_state("run_countdown")
 
+    def _open_recording(self, seed):
+        # The active game's entry comes from the sim: settings edited during an earlier run are
+        # held there at the float32 precision they were recorded with, not as typed.
+        profiles = dict(self.profiles)
+        profiles[self.game_key] = dict(self.sim.profile)
+        meta = {
+            "seed": seed,
+            "map": self.current_map,
+            "duration": self.selected_duration,
+            "width": self.width,
+            "height": self.height,
+            "tick_rate": self.sim.tick_rate,
+            "gridshot_count": self.sim.gridshot_count,
+            "bot_count": self.sim.bot_count,
+            "game_key": self.game_key,
+            "game_index": self.game_index,
+            "game_keys": self.game_keys,
+            "profiles": profiles,
+            "cursor_x": self.sim.cursor_x,
+            "cursor_y": self.sim.cursor_y,
+            "started": time.strftime("%Y-%m-%d %H:%M:%S"),
+        }
+        stamp = time.strftime("%Y%m%d_%H%M%S")
+        # Pruning, the open and every chunk write queue on the writer thread, in that order.
+        self.persist.submit(prune_recordings, REPLAY_DIR, REPLAY_KEEP - 1)
+        path = REPLAY_DIR / f"{self.current_map}_{stamp}.alrec"
+        return SessionRecorder(path, meta, self.sim.clock, submit=self.persist.submit)
+
+    def _close_recording(self, stats: SessionStats | None):
+        recorder = self.sim.recorder
+        if recorder:
+            # Stamps the end record and packs the last chunk; the write and close are queued.
+            recorder.close(stats)
+            self.sim.recorder = None
+
     def _finish_run(self):
-        acc = 0.0 if self.stats.shots == 0 else (self.stats.hits / self.stats.shots) * 100.0
-        if self.stats.reaction_samples:
-            avg_reaction = f"{sum(self.stats.reaction_samples) / len(self.stats.reaction_samples):.1f} ms"
+        replay_name = self.sim.recorder.path.name if self.sim.recorder else None
+        self._close_recording(self.sim.stats)
+        result = self.sim.result()
+        acc = result["acc"]
+        if result["reaction_ms"] is not None:
+            avg_reaction = f"{result['reaction_ms']:.1f} ± {result['reaction_err_ms']:.1f} ms"
         else:
             avg_reaction = "-"
 
-        self.score_history.append(
-            {
-                "map": self.map_names[self.current_map],
-                "game": self._profile()["name"],
-                "duration": self.selected_duration,
-                "score": self.stats.score,
-                "acc": acc,
-                "reaction": avg_reaction,
-            }
-        )
+        samples = self.sim.stats.reaction_samples
+        run = {
+            "ended_at": time.time(),
+            "map": self.current_map,
+            "game": result["game"],
+            "duration": int(self.selected_duration),
+            "shots": result["shots"],
+            "hits": result["hits"],
+            "score": result["score"],
+            "acc": acc,
+            "reaction_avg_ms": result["reaction_ms"],
+            "reaction_best_ms": min(samples) if samples else None,
+            "reaction_count": len(samples),
+            "seed": self.sim.seed,
+            "replay": replay_name,
+        }
+        self.persist.submit(self.runs.add, run)
+        best_key = (self.current_map, result["game"], int(self.selected_duration))
+        best = self._best_run(*best_key)
+        if best is None or run["score"] > best["score"]:
+            best = self.best_runs[best_key] = run
 
         hs = self.high_scores[self.current_map]
-        self.last_run_new_high = self.stats.score > float(hs.get("score", 0.0))
+        self.last_run_new_high = result["score"] > float(hs.get("score", 0.0))
         if self.last_run_new_high:
             self.high_scores[self.current_map] = {
-                "score": float(self.stats.score),
-                "shots": int(self.stats.shots),
-                "hits": int(self.stats.hits),
-                "acc": float(acc),
-                "game": self._profile()["name"],
+                "score": result["score"],
+                "shots": result["shots"],
+                "hits": result["hits"],
+                "acc": acc,
+                "game": result["game"],
                 "duration": int(self.selected_duration),
             }
             self._save_scores()
 
+        if self.telemetry:
+            columns = self.telemetry.end_run()
+        if self.write_telemetry:
+            stamp = time.strftime("%Y%m%d_%H%M%S")
+            path = SCORES_PATH.with_name(f"telemetry_{self.current_map}_{stamp}.csv")
+            self.persist.submit(FrameTelemetry.write_csv, path, columns)
+            if self.sim.shot_log:
+                # start() gives the next run a new ShotLog, so this one can be written as is.
+                path = SCORES_PATH.with_name(f"shots_{self.current_map}_{stamp}.csv")
+                self.persist.submit(self.sim.shot_log.write_csv, path)
+        if self.input_log:
+            stamp = time.strftime("%Y%m%d_%H%M%S")
+            log, self.input_log = self.input_log, array("f")
+            self.persist.submit(self._write_input_log, SCORES_PATH.with_name(f"input_error_{self.current_map}_{stamp}.csv"), log)
+
         self.last_run_summary = {
             "map": self.map_names[self.current_map],
-            "game": self._profile()["name"],
+            "game": result["game"],
             "duration": f"{self.selected_duration}s",
-            "shots": str(self.stats.shots),
-            "hits": str(self.stats.hits),
+            "shots": str(result["shots"]),
+            "hits": str(result["hits"]),
             "acc": f"{acc:.1f}%",
-            "score": f"{self.stats.score:.0f}",
+            "score": f"{result['score']:.0f}",
+            "avg_reaction": avg_reaction,
+            "best": f"{best['score']:.0f}" if best else "-",
         }
+        tm = result["tracking"]
+        if tm:
+            self.last_run_summary["details"] = [
+                f"On Target: {tm['on_target_s']:.1f}s ({tm['on_target_pct']:.1f}%)",
+                f"Error: {tm['error_mean_px']:.0f} px avg, p50 {tm['error_p50_px']:.0f}, p90 {tm['error_p90_px']:.0f}",
+                "Reacquire: "
+                + (f"{tm['reacquire_ms']:.0f} ms avg ({tm['reacquire_count']}x)" if tm["reacquire_ms"] is not None else "-"),
+                "Overshoot: "
+                + (f"{tm['overshoot_px']:.0f} px avg ({tm['overshoot_count']}x)" if tm["overshoot_px"] is not None else "-"),
+            ]
+        fl = result["flick"]
+        if fl:
+            self.last_run_summary["details"] = [
+                "Time to Kill: "
+                + (f"p50 {fl['ttk_p50_ms']:.0f} ms, p90 {fl['ttk_p90_ms']:.0f} ms" if fl["ttk_p50_ms"] is not None else "-"),
+                "Fitts Throughput: " + (f"{fl['fitts_tp']:.2f} bits/s" if fl["fitts_tp"] is not None else "-"),
+                "Overshoot: " + (f"{fl['overshoot_px']:.0f} px avg" if fl["overshoot_px"] is not None else "-"),
+                "Miss Offset: " + (f"{fl['miss_offset_px']:.0f} px avg" if fl["miss_offset_px"] is not None else "-"),
+            ]
 
         self._set_state("run_summary")
 
+    @staticmethod
+    def _write_input_log(path: Path, log: array):
+        with path.open("w", encoding="utf-8", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(("time_left", "error_x", "error_y", "error_px"))
+            for i in range(0, len(log), 3):
+                ex, ey = log[i + 1], log[i + 2]
+                writer.writerow((f"{log[i]:.3f}", f"{ex:.2f}", f"{ey:.2f}", f"{math.hypot(ex, ey):.2f}"))
+
     def _apply_text_input(self):
         if not self.active_input_key:
             return
@@ -1130,18 +3651,13 @@ class AimLiteApp:
             lo, hi = self.settings_numeric_keys[key]
             value = max(lo, min(hi, value))
 
-        if key == "hipfire_sens":
-            p["hipfire_sens"] = value
-        elif key == "ads_sens":
-            p["ads_sens"] = value
-        elif key == "dpi":
-            p["dpi"] = value
-        elif key == "yaw":
-            p["yaw"] = value
-        elif key == "fov_h_deg":
-            p["fov_h_deg"] = value
+        if key in ("hipfire_sens", "ads_sens", "dpi", "yaw", "fov_h_deg"):
+            p[key] = value
+            # During a run this is recorded, so the replay changes sensitivity at the same moment.
+            self.sim.set_profile_value(key, value)
         elif key == "fov_v":
             p["fov_h_deg"] = self._fov_v_to_h(value, aspect)
+            self.sim.set_profile_value("fov_h_deg", p["fov_h_deg"])
         elif key == "crosshair_size":
             self.crosshair.size = int(round(value))
         elif key == "crosshair_thickness":
@@ -1170,60 +3686,10 @@ class AimLiteApp:
         self.active_input_key = None
         self.input_buffer = ""
 
-    def _handle_click_action(self, action: str, payload: str | None):
-        if action == "main_play":
-            self._start_run()
-        elif action == "main_map":
-            self._set_state("map_select")
-        elif action == "main_settings":
-            self._open_settings("main_menu")
-        elif action == "main_scores":
-            self._set_state("scores")
-        elif action == "main_quit":
-            self.running = False
-        elif action == "map_pick" and payload:
-            self.current_map = payload
-            self.map_index = self.maps.index(payload)
-            self._init_map()
-        elif action == "duration_pick" and payload is not None:
-            idx = int(payload)
-            self.duration_index = max(0, min(len(self.durations) - 1, idx))
-        elif action == "start_run":
-            self._start_run()
-        elif action == "back_main":
-            self._set_state("main_menu")
-        elif action == "scores_clear":
-            self.score_history.clear()
-            self.high_scores = self._default_high_scores()
-            self._save_scores()
-        elif action == "settings_edit" and payload:
-            self.active_input_key = payload
-            self.input_buffer = self._format_setting_value(payload)
-        elif action == "game_cycle" and payload:
-            self._switch_game(int(payload))
-        elif action == "dot_toggle":
-            self.crosshair.dot = not self.crosshair.dot
-        elif action == "sound_toggle":
-            self.sound_enabled = not self.sound_enabled
-        elif action == "settings_save":
-            self._save_profiles()
-        elif action == "settings_back":
-            if self.settings_origin == "playing":
-                self._set_state("playing")
-            else:
-                self._set_state("main_menu")
-        elif action == "summary_play_again":
-            self._start_run()
-        elif action == "summary_scores":
-            self._set_state("scores")
-        elif action == "summary_menu":
-            self._set_state("main_menu")
-
     def _handle_mouse_click(self, pos):
-        for rect, action, payload in reversed(self.click_regions):
-            if rect.collidepoint(pos):
-                self._handle_click_action(action, payload)
-                return
+        layer = self.ui.get(self.screen_state)
+        if layer and layer.click(pos):
+            return
 
         if self.screen_state == "settings":
             self.active_input_key = None
@@ -1234,6 +3700,20 @@ class AimLiteApp:
             self.running = False
             return
 
+        if event.key == pygame.K_F9:
+            # Start sampling on demand, or pause/resume whatever profiler is running.
+            if self.profiler is None:
+                self.profiler = StateProfiler("sample")
+            else:
+                self.profiler.toggle()
+            return
+
+        if event.key == pygame.K_F3:
+            if self.telemetry is None:
+                self.telemetry = FrameTelemetry(self.target_fps)
+            self.telemetry.overlay_visible = not self.telemetry.overlay_visible
+            return
+
         if self.screen_state == "playing":
             if event.key == pygame.K_ESCAPE:
                 self._open_settings("playing")
@@ -1263,56 +3743,104 @@ class AimLiteApp:
             elif self.screen_state == "main_menu":
                 self.running = False
 
+    def _profile_label(self):
+        if self.screen_state in ("playing", "run_countdown"):
+            return f"{self.screen_state}_{self.current_map}"
+        return self.screen_state
+
+    def _draw_telemetry_overlay(self):
+        lines = self.telemetry.overlay_text(time.perf_counter()) + self.pacer.overlay_lines()
+        if self.dirty:
+            lines = lines + [f"pushed {self.dirty.pixels_pushed / 1e6:.2f} Mpx"]
+        if self.renderer:
+            lines = lines + [f"textures {len(self.renderer.textures)} ({self.renderer.uploads} uploads)"]
+        y = 16
+        for line in lines:
+            surf = self.text_cache.render(self.small_font, line, (255, 226, 148))
+            self.frame_rects.append(self._blit(surf, (self.width - surf.get_width() - 18, y)))
+            y += 24
+
     def run(self):
+        perf = time.perf_counter
+        last_pump = perf()
+        last_pump_ns = time.perf_counter_ns()
         while self.running:
-            dt = self.clock.tick(240) / 1000.0
-
-            for event in pygame.event.get():
+            idle = self.pacer.is_idle(self.screen_state)
+            self.pacer.begin(idle)
+            # Static screens sleep until input arrives; the tick still caps the rate while it streams in.
+            waited = self.pacer.wait() if idle else None
+            dt = self.clock.tick(self.target_fps) / 1000.0
+            if self.profiler:
+                self.profiler.frame(self._profile_label())
+
+            t_events = perf()
+            # Input handled this frame arrived somewhere between the previous pump and this one;
+            # clicks are stamped at the middle of that window and carry its half-width. The sim
+            # trims the window to the present that showed a reaction target.
+            pump_ns = time.perf_counter_ns()
+            click_ns = (last_pump_ns + pump_ns) // 2
+            click_spread_ns = (pump_ns - last_pump_ns) // 2
+            last_pump_ns = pump_ns
+            had_input = False
+            self._frame_cursor = (self.sim.cursor_x, self.sim.cursor_y)
+            events = pygame.event.get()
+            if waited is not None:
+                events.insert(0, waited)
+            for event in events:
                 if event.type == pygame.QUIT:
                     self.running = False
                 elif event.type == pygame.KEYDOWN:
+                    had_input = True
                     self._handle_keydown(event)
                 elif event.type == pygame.MOUSEBUTTONDOWN:
+                    had_input = True
                     if self.screen_state == "playing":
                         if event.button == 1:
-                            self._handle_training_click()
+                            self._handle_training_click(click_ns, click_spread_ns)
                         elif event.button == 3:
-                            self.ads_held = True
+                            self.sim.set_ads(True)
                     else:
                         if event.button == 1:
                             self._handle_mouse_click(event.pos)
                 elif event.type == pygame.MOUSEBUTTONUP:
+                    had_input = True
                     if self.screen_state == "playing" and event.button == 3:
-                        self.ads_held = False
+                        self.sim.set_ads(False)
                 elif event.type == pygame.MOUSEWHEEL:
+                    had_input = True
                     if self.screen_state == "settings":
                         self.settings_scroll = max(0.0, self.settings_scroll - (event.y * 24.0))
+                elif event.type == pygame.MOUSEMOTION:
+                    had_input = True
+                    # Apply each delta in order so clicks resolve where the cursor was at the click.
+                    if self.screen_state in ("playing", "run_countdown"):
+                        self.sim.move(event.rel[0], event.rel[1])
+                    else:
+                        self.mouse_pos = event.pos
+                elif event.type in (pygame.WINDOWEXPOSED, pygame.WINDOWRESTORED, pygame.WINDOWSIZECHANGED, pygame.VIDEOEXPOSE):
+                    # Uncovered, restored or resized: the window contents are gone, so a static
+                    # screen that would otherwise skip its present redraws and presents in full.
+                    self._invalidate_screen()
 
-            if self.screen_state == "playing":
-                self._update_mouse()
-                self._update_weapon(dt)
-                self.time_left = max(0.0, self.time_left - dt)
-
-                if self.current_map == "reaction" and self.reaction_waiting:
-                    now = pygame.time.get_ticks() / 1000.0
-                    if now >= self.reaction_spawn_at:
-                        self.targets = [self._spawn_target(26, cluster_scale=0.24)]
-                        self.reaction_waiting = False
-                        self.reaction_spawn_at = now
-
-                if self.current_map == "tracking":
-                    self._update_tracking(dt)
+            if idle and not self.pacer.is_idle(self.screen_state):
+                # Leaving a static screen: the time spent waiting for input isn't game time.
+                dt = 0.0
 
-                if self.time_left <= 0.0:
+            t_update = perf()
+            if self.screen_state == "playing":
+                if self.sim.update(dt):
                     self._finish_run()
 
             if self.screen_state == "run_countdown":
-                self._update_mouse()
-                self._update_weapon(dt)
+                self.sim.update_weapon(dt)
                 self.countdown_left = max(0.0, self.countdown_left - dt)
                 if self.countdown_left <= 0.0:
                     self._set_state("playing")
 
+            t_draw = perf()
+            self.frame_rects.clear()
+            # The full-rate screens go through the texture renderer; menus stay software-drawn.
+            self.textured = self.renderer is not None and self.screen_state in FramePacer.ACTIVE_STATES
             if self.screen_state == "main_menu":
                 self._draw_main_menu()
             elif self.screen_state == "map_select":
@@ -1328,10 +3856,126 @@ class AimLiteApp:
             elif self.screen_state == "playing":
                 self._draw_training()
 
-            pygame.display.flip()
+            if self.telemetry and self.telemetry.overlay_visible:
+                self._draw_telemetry_overlay()
+
+            t_flip = perf()
+            if self.textured:
+                self.renderer.present()
+                self.pacer.presented()
+            elif self.dirty and self.screen_state == "playing":
+                self.dirty.present(self.screen, self.frame_rects)
+                self.pacer.presented()
+            elif not self.frame_rects and self.pacer.is_idle(self.screen_state):
+                pass  # nothing on the static screen changed
+            elif self.renderer:
+                self.renderer.present_canvas(self.screen)
+                self.pacer.presented()
+            else:
+                pygame.display.flip()
+                self.pacer.presented()
+            t_present = perf()
+            if self.screen_state == "playing":
+                self.sim.presented(time.perf_counter_ns())
+
+            if self.startup.first_frame_at is None:
+                self.startup.first_frame_at = t_present
+                self._spawn_warmer.start()
+                if self.startup_report:
+                    self._audio_loader.join()
+                    print(self.startup.report())
+                    self.running = False
 
+            if self.telemetry and not idle:
+                # SDL event timestamps aren't exposed, so the oldest input event this frame
+                # can be no older than the previous pump: report that upper bound.
+                input_age = (t_present - last_pump) * 1000.0 if had_input else 0.0
+                self.telemetry.add_frame(
+                    dt * 1000.0,
+                    (t_update - t_events) * 1000.0,
+                    (t_draw - t_update) * 1000.0,
+                    (t_flip - t_draw) * 1000.0,
+                    (t_present - t_flip) * 1000.0,
+                    input_age,
+                )
+            last_pump = t_events
+
+        self._close_recording(None)
+        if self.write_telemetry:
+            self.pacer.write_csv(SCORES_PATH.with_name(f"telemetry_pacing_{time.strftime('%Y%m%d_%H%M%S')}.csv"))
+        if self.profiler:
+            for path in self.profiler.close(SCORES_PATH.parent):
+                print(f"profile written: {path.name}")
+        # Closing drains every queued write, including the run store inserts, before the store closes.
+        self.persist.close()
+        if self.persist.last_error:
+            print(f"saving failed: {self.persist.last_error}")
+        if self._runs is not None:
+            self._runs.close()
+        self._audio_loader.join()
+        if self.renderer:
+            self.renderer.close()
         pygame.quit()
 
 
+def main():
+    parser = argparse.ArgumentParser(prog="aimlite")
+    parser.add_argument("--telemetry", action="store_true", help="record frame timings and write a CSV per run")
+    parser.add_argument("--dirty-rects", action="store_true", help="redraw and present only changed regions while playing")
+    parser.add_argument(
+        "--renderer",
+        choices=("software", "sdl2"),
+        default="software",
+        help="draw the countdown and runs with software blits or as SDL2 renderer textures",
+    )
+    parser.add_argument("--startup-report", action="store_true", help="print startup stage timings after the first frame and exit")
+    parser.add_argument("--input-log", action="store_true", help="log per-click cursor error versus frame-quantized input")
+    parser.add_argument("--fps", type=int, default=240, help="frame rate cap (0 = uncapped)")
+    parser.add_argument("--idle-fps", type=int, default=10, help="wake-up rate on menus with no input (0 = always full rate)")
+    parser.add_argument("--tick-rate", type=int, default=1000, help="fixed simulation steps per second")
+    parser.add_argument("--gridshot-targets", type=int, default=60, help="simultaneous targets in Gridshot")
+    parser.add_argument("--bots", type=int, default=16, help="bots in Multi Tracking, up to 64")
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="sample",
+        choices=StateProfiler.MODES,
+        help="profile the main loop per screen and map, written next to scores.json at exit (default: sample)",
+    )
+    parser.add_argument("--replay", type=Path, metavar="FILE", help="re-simulate a recorded .alrec run and print its result")
+    args = parser.parse_args()
+
+    if args.replay:
+        started = time.perf_counter()
+        try:
+            meta, result, recorded_end = replay_recording(args.replay)
+        except (OSError, ValueError) as e:
+            sys.exit(f"cannot replay: {e}")
+        took = time.perf_counter() - started
+        print(f"{meta['map']} | {result['game']} | seed {meta['seed']} | {meta['duration']}s")
+        if meta["truncated"]:
+            print("recording is truncated: replayed the complete chunks only")
+        print(f"replayed: score {result['score']:.3f}  hits {result['hits']}/{result['shots']}")
+        if recorded_end is not None:
+            score, hits = recorded_end
+            match = abs(score - result["score"]) < 0.01 and hits == result["hits"]
+            print(f"recorded: score {score:.3f}  hits {hits}  ({'match' if match else 'MISMATCH'})")
+        print(f"replay took {took:.3f}s ({meta['duration'] / max(took, 1e-9):.0f}x real time)")
+        return
+    AimLiteApp(
+        telemetry=args.telemetry,
+        dirty_rects=args.dirty_rects,
+        startup_report=args.startup_report,
+        input_log=args.input_log,
+        target_fps=args.fps,
+        tick_rate=max(1, args.tick_rate),
+        gridshot_targets=max(1, args.gridshot_targets),
+        bots=max(1, min(64, args.bots)),
+        profile=args.profile,
+        idle_fps=max(0, args.idle_fps),
+        renderer=args.renderer,
+    ).run()
+
+
 if __name__ == "__main__":
-    AimLiteApp().run()
+    main()
@@ -0,0 +1,323 @@
+"""Score distributions from simulated players, for calibrating the scoring constants.
+
+    python benchmarks/batch_sim.py [--maps all] [--games all] [--durations 60]
+                                   [--skills novice,average,skilled] [--seeds 200]
+                                   [--fps 240] [--tick-rate 1000] [--size 1920x1080]
+                                   [--set fitts_b=120 ...] [--workers N] [--csv sessions.csv]
+
+Every combination of map, game profile, duration and skill is played headless on
+TrainingSim once per seed. The bots see targets only after a reaction delay, flick
+with minimum-jerk movements timed by Fitts' law and land with Gaussian endpoint scatter,
+and follow tracking targets with perception lag, partial prediction and hand jitter.
+Sessions are spread across a process pool. The summary gives the score distribution
+per group, and --csv writes one row per session.
+"""
+
+import argparse
+import csv
+import math
+import os
+import random
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from aimlite import DEFAULT_PROFILES, ManualClock, TrainingSim, active_sens, percentile  # noqa: E402
+
+MAPS = ("regular_flick", "small_flick", "gridshot", "tracking", "multi_tracking", "reaction")
+TRACKING_MAPS = ("tracking", "multi_tracking")
+# Delays in ms. Fitts: movement time = fitts_a + fitts_b * log2(distance / width + 1).
+# spread scales the endpoint scatter that gives Fitts' nominal 4% misses (sd = width / 4.133).
+SKILLS = {
+    "novice": {
+        "reaction_ms": 300.0,
+        "reaction_sd": 45.0,
+        "retarget_ms": 220.0,
+        "correction_ms": 160.0,
+        "fitts_a": 110.0,
+        "fitts_b": 190.0,
+        "spread": 1.4,
+        "jitter_px": 2.0,
+        "lag_ms": 150.0,
+        "predict": 0.3,
+        "smooth_ms": 90.0,
+        "fire_hz": 3.0,
+    },
+    "average": {
+        "reaction_ms": 250.0,
+        "reaction_sd": 35.0,
+        "retarget_ms": 170.0,
+        "correction_ms": 130.0,
+        "fitts_a": 80.0,
+        "fitts_b": 150.0,
+        "spread": 1.0,
+        "jitter_px": 1.2,
+        "lag_ms": 110.0,
+        "predict": 0.6,
+        "smooth_ms": 60.0,
+        "fire_hz": 4.0,
+    },
+    "skilled": {
+        "reaction_ms": 195.0,
+        "reaction_sd": 25.0,
+        "retarget_ms": 120.0,
+        "correction_ms": 100.0,
+        "fitts_a": 50.0,
+        "fitts_b": 110.0,
+        "spread": 0.8,
+        "jitter_px": 0.7,
+        "lag_ms": 80.0,
+        "predict": 0.85,
+        "smooth_ms": 40.0,
+        "fire_hz": 5.0,
+    },
+}
+
+
+def min_jerk(t):
+    return t * t * t * (10.0 + t * (-15.0 + 6.0 * t))
+
+
+class BotAimer:
+    """Produces one frame of cursor movement (in pixels) and clicks from what it has seen."""
+
+    def __init__(self, skill, rng):
+        self.skill = skill
+        self.rng = rng
+        self.plan = None
+        # Negative while no reaction is under way; pending is the target being reacted to.
+        self.wait_until = -1.0
+        self.pending = None
+        self.aimed = None
+        self.seen: set[tuple[float, float]] = set()
+        self.history: deque[tuple[float, float, float]] = deque()
+        self.follow = -1
+        self.retarget_at = 0.0
+        self.next_fire = 0.0
+
+    def _delay(self, key):
+        if key == self.aimed:
+            ms = self.skill["correction_ms"]
+        elif key in self.seen:
+            ms = self.skill["retarget_ms"]
+        else:
+            ms = max(100.0, self.rng.gauss(self.skill["reaction_ms"], self.skill["reaction_sd"]))
+        return ms / 1000.0
+
+    def flick(self, sim, now):
+        targets = sim.targets
+        if self.plan is None:
+            if not targets:
+                return 0.0, 0.0, 0
+            i = sim._nearest_target(sim.cursor_x, sim.cursor_y)
+            key = (targets.xs[i], targets.ys[i])
+            if self.wait_until < 0.0 or key != self.pending:
+                # A different target than the one being reacted to: start the clock again.
+                self.pending = key
+                self.wait_until = now + self._delay(key)
+            if now < self.wait_until:
+                return 0.0, 0.0, 0
+            width = 2.0 * targets.rs[i]
+            distance = math.hypot(key[0] - sim.cursor_x, key[1] - sim.cursor_y)
+            mt = (self.skill["fitts_a"] + self.skill["fitts_b"] * math.log2(distance / width + 1.0)) / 1000.0
+            sd = width / 4.133 * self.skill["spread"]
+            end_x = key[0] + self.rng.gauss(0.0, sd)
+            end_y = key[1] + self.rng.gauss(0.0, sd)
+            self.plan = (now, mt, sim.cursor_x, sim.cursor_y, end_x, end_y)
+            self.aimed = key
+
+        start, mt, sx, sy, ex, ey = self.plan
+        t = (now - start) / mt
+        clicks = 0
+        if t >= 1.0:
+            t = 1.0
+            clicks = 1
+            self.plan = None
+            self.wait_until = -1.0
+            self.seen = {(targets.xs[i], targets.ys[i]) for i in range(targets.count)}
+        s = min_jerk(t)
+        jitter = self.skill["jitter_px"]
+        dx = sx + (ex - sx) * s - sim.cursor_x + self.rng.gauss(0.0, jitter)
+        dy = sy + (ey - sy) * s - sim.cursor_y + self.rng.gauss(0.0, jitter)
+        return dx, dy, clicks
+
+    def _tracked(self, sim, now):
+        if sim.moving_target:
+            return sim.moving_target.x, sim.moving_target.y
+        bots = sim.bots
+        if self.follow < 0 or now >= self.retarget_at:
+            best, best_d = 0, math.inf
+            for i in range(bots.count):
+                d = (float(bots.x[i]) - sim.cursor_x) ** 2 + (float(bots.y[i]) - sim.cursor_y) ** 2
+                if d < best_d:
+                    best, best_d = i, d
+            if best != self.follow:
+                self.follow = best
+                self.history.clear()
+            self.retarget_at = now + 0.5
+        return float(bots.x[self.follow]), float(bots.y[self.follow])
+
+    def track(self, sim, now, dt):
+        x, y = self._tracked(sim, now)
+        history = self.history
+        history.append((now, x, y))
+        lag = self.skill["lag_ms"] / 1000.0
+        # What the player has perceived so far: the target as it was `lag` ago, and its velocity then.
+        while len(history) > 2 and history[1][0] <= now - lag:
+            history.popleft()
+        t0, px, py = history[0]
+        vx = vy = 0.0
+        for t1, qx, qy in history:
+            if t1 - t0 >= 0.05:
+                vx, vy = (qx - px) / (t1 - t0), (qy - py) / (t1 - t0)
+                break
+        lead = lag * self.skill["predict"]
+        aim_x = px + vx * lead
+        aim_y = py + vy * lead
+        gain = min(1.0, dt / (self.skill["smooth_ms"] / 1000.0))
+        jitter = self.skill["jitter_px"]
+        dx = (aim_x - sim.cursor_x) * gain + self.rng.gauss(0.0, jitter)
+        dy = (aim_y - sim.cursor_y) * gain + self.rng.gauss(0.0, jitter)
+        clicks = 0
+        if self.skill["fire_hz"] > 0.0 and now >= self.next_fire:
+            clicks = 1
+            self.next_fire = now + 1.0 / self.skill["fire_hz"]
+        return dx, dy, clicks
+
+
+def play_session(map_key, game_index, duration, skill, seed, fps, tick_rate, size):
+    game_key = list(DEFAULT_PROFILES)[game_index]
+    profile = DEFAULT_PROFILES[game_key]
+    sim = TrainingSim(size[0], size[1], profile, game_key, game_index, map_key, ManualClock(), tick_rate)
+    sim.start(duration, seed=seed)
+    bot = BotAimer(skill, random.Random(seed ^ 0x5EED))
+    dt = 1.0 / fps
+    px_per_count = max(1e-6, float(profile["yaw"])) * active_sens(profile, game_key, False) * sim.px_per_degree()
+    now = 0.0
+    tracking = map_key in TRACKING_MAPS
+    # Same per-frame order as run_simulation: clock, motion, clicks, update.
+    while True:
+        sim.clock.advance(dt)
+        now += dt
+        dx, dy, clicks = bot.track(sim, now, dt) if tracking else bot.flick(sim, now)
+        sim.move(dx / px_per_count, dy / px_per_count)
+        for _ in range(clicks):
+            sim.click()
+        if sim.update(dt):
+            break
+    return sim.result()
+
+
+def run_batch(task):
+    map_key, game_index, duration, skill_name, skill, seeds, fps, tick_rate, size = task
+    rows = []
+    for seed in seeds:
+        r = play_session(map_key, game_index, duration, skill, seed, fps, tick_rate, size)
+        rows.append(
+            {
+                "map": map_key,
+                "game": list(DEFAULT_PROFILES)[game_index],
+                "duration": duration,
+                "skill": skill_name,
+                "seed": seed,
+                "score": r["score"],
+                "shots": r["shots"],
+                "hits": r["hits"],
+                "acc": round(r["acc"], 2),
+                "reaction_ms": round(r["reaction_ms"], 1) if r["reaction_ms"] is not None else "",
+            }
+        )
+    return rows
+
+
+def parse_list(value, choices):
+    if value == "all":
+        return list(choices)
+    items = value.split(",")
+    for item in items:
+        if item not in choices:
+            raise SystemExit(f"unknown value {item!r}, expected one of: {', '.join(choices)}")
+    return items
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--maps", default="all", help="comma-separated map keys or 'all'")
+    parser.add_argument("--games", default="all", help="comma-separated game profile keys or 'all'")
+    parser.add_argument("--durations", default="60", help="comma-separated session lengths in seconds")
+    parser.add_argument("--skills", default="novice,average,skilled", help="comma-separated bot skill presets")
+    parser.add_argument("--seeds", type=int, default=200, help="sessions per group")
+    parser.add_argument("--fps", type=int, default=240, help="simulated frame rate")
+    parser.add_argument("--tick-rate", type=int, default=1000, help="simulation steps per second")
+    parser.add_argument("--size", default="1920x1080", help="arena size as WxH")
+    parser.add_argument("--set", action="append", default=[], metavar="KEY=VALUE", help="override a skill parameter")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="worker processes")
+    parser.add_argument("--chunk", type=int, default=10, help="sessions per task sent to a worker")
+    parser.add_argument("--csv", type=Path, help="write one row per session")
+    args = parser.parse_args()
+
+    maps = parse_list(args.maps, MAPS)
+    game_keys = list(DEFAULT_PROFILES)
+    games = parse_list(args.games, game_keys)
+    skills = parse_list(args.skills, SKILLS)
+    durations = [int(v) for v in args.durations.split(",")]
+    size = tuple(int(v) for v in args.size.lower().split("x"))
+    overrides = {}
+    for item in args.set:
+        key, _, value = item.partition("=")
+        if key not in SKILLS["average"]:
+            raise SystemExit(f"unknown skill parameter {key!r}")
+        overrides[key] = float(value)
+
+    tasks = []
+    for map_key in maps:
+        for game in games:
+            for duration in durations:
+                for skill_name in skills:
+                    skill = {**SKILLS[skill_name], **overrides}
+                    for first in range(0, args.seeds, args.chunk):
+                        seeds = range(first, min(args.seeds, first + args.chunk))
+                        tasks.append(
+                            (map_key, game_keys.index(game), duration, skill_name, skill, seeds, args.fps, args.tick_rate, size)
+                        )
+
+    sessions = len(maps) * len(games) * len(durations) * len(skills) * args.seeds
+    print(f"{sessions} sessions in {len(tasks)} tasks on {args.workers} workers")
+    started = time.perf_counter()
+    rows = []
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        for batch in pool.map(run_batch, tasks):
+            rows.extend(batch)
+    took = time.perf_counter() - started
+    simulated = sum(r["duration"] for r in rows)
+    print(f"took {took:.1f}s, {simulated / max(took, 1e-9):.0f}x real time\n")
+
+    groups = {}
+    for row in rows:
+        groups.setdefault((row["map"], row["game"], row["duration"], row["skill"]), []).append(row)
+    print(f"{'map':<16}{'game':<15}{'dur':>4} {'skill':<9}{'mean':>9}{'sd':>8}{'p5':>8}{'p50':>8}{'p95':>8}{'acc%':>7}")
+    for (map_key, game, duration, skill_name), group in groups.items():
+        scores = sorted(r["score"] for r in group)
+        mean = sum(scores) / len(scores)
+        sd = math.sqrt(sum((s - mean) ** 2 for s in scores) / max(1, len(scores) - 1))
+        acc = sum(r["acc"] for r in group) / len(group)
+        print(
+            f"{map_key:<16}{game:<15}{duration:>4} {skill_name:<9}{mean:>9.1f}{sd:>8.1f}"
+            f"{percentile(scores, 5):>8.1f}{percentile(scores, 50):>8.1f}{percentile(scores, 95):>8.1f}{acc:>7.1f}"
+        )
+
+    if args.csv:
+        with args.csv.open("w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+            writer.writeheader()
+            writer.writerows(rows)
+        print(f"\nwrote {len(rows)} sessions to {args.csv}")
+
+
+if __name__ == "__main__":
+    main()
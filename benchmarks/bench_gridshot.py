@@ -0,0 +1,96 @@
+"""Click and spawn cost for Gridshot, spatial hash vs a linear scan.
+
+    python benchmarks/bench_gridshot.py [--size 1920x1080] [--clicks 4000]
+"""
+
+import argparse
+import math
+import os
+import sys
+import time
+from pathlib import Path
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from aimlite import ManualClock, TrainingSim  # noqa: E402
+
+COUNTS = (3, 10, 30, 60, 120, 250, 500)
+
+
+def linear_target_at(sim, x, y):
+    pool = sim.targets
+    for i in range(pool.count):
+        if pool.contains(i, x, y):
+            return i
+    return None
+
+
+def linear_collides(pool, x, y, r, gap):
+    for i in range(pool.count):
+        if math.hypot(x - pool.xs[i], y - pool.ys[i]) < r + pool.rs[i] + gap:
+            return True
+    return False
+
+
+def make_sim(width, height, count):
+    sim = TrainingSim(width, height, {}, "cs2", map_key="gridshot", clock=ManualClock(), gridshot_count=count)
+    sim.start(60, seed=count)
+    return sim
+
+
+def bench(width, height, count, clicks):
+    sim = make_sim(width, height, count)
+    probes = []
+    for _ in range(clicks):
+        i = sim.rng.randrange(count)
+        probes.append((sim.targets.xs[i], sim.targets.ys[i]))
+    miss = [(sim.rng.uniform(0, width), sim.rng.uniform(0, height)) for _ in range(clicks)]
+
+    t0 = time.perf_counter()
+    for x, y in probes + miss:
+        sim._target_at(x, y)
+    grid_hit = (time.perf_counter() - t0) / (2 * clicks)
+
+    t0 = time.perf_counter()
+    for x, y in probes + miss:
+        linear_target_at(sim, x, y)
+    linear_hit = (time.perf_counter() - t0) / (2 * clicks)
+
+    # Overlap check for one spawn candidate against every live target.
+    t0 = time.perf_counter()
+    for x, y in miss:
+        sim.grid.collides(x, y, 14, 12.0)
+    grid_spawn = (time.perf_counter() - t0) / clicks
+
+    t0 = time.perf_counter()
+    for x, y in miss:
+        linear_collides(sim.targets, x, y, 14, 12.0)
+    linear_spawn = (time.perf_counter() - t0) / clicks
+
+    # Full click path: hit test, grid removal, respawn and reinsert.
+    t0 = time.perf_counter()
+    for i in range(clicks):
+        sim.cursor_x, sim.cursor_y = sim.targets.xs[i % count], sim.targets.ys[i % count]
+        sim.click()
+    click = (time.perf_counter() - t0) / clicks
+
+    return grid_hit, linear_hit, grid_spawn, linear_spawn, click
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", default="1920x1080", help="arena size as WxH")
+    parser.add_argument("--clicks", type=int, default=4000, help="samples per measurement")
+    args = parser.parse_args()
+    width, height = (int(v) for v in args.size.lower().split("x"))
+
+    print(f"arena {width}x{height}, {args.clicks} samples, times in microseconds")
+    print(f"{'targets':>8} {'hit grid':>9} {'hit scan':>9} {'spawn grid':>11} {'spawn scan':>11} {'click':>8}")
+    for count in COUNTS:
+        row = bench(width, height, count, args.clicks)
+        print(f"{count:>8} " + " ".join(f"{v * 1e6:>{w}.2f}" for v, w in zip(row, (9, 9, 11, 11, 8))))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,455 @@
+"""End-to-end benchmark: every map and menu screen driven through AimLiteApp.run().
+
+    python benchmarks/bench_suite.py [--sizes 1280x720,1920x1080,2560x1440] [--frames 300]
+                                     [--renderers software,sdl2] [--alloc-frames 60]
+                                     [--out results.json] [--baseline baseline.json]
+                                     [--tolerance 0.15]
+
+Runs headless on SDL's dummy drivers with config, scores, runs, replays and the sound
+cache redirected to a temporary directory. Each screen gets scripted input (an aiming
+bot on the training maps, scrolling and hovering on the menus) for --frames uncapped
+frames after a short warm-up. A second, shorter pass under tracemalloc measures the
+peak bytes allocated per frame and per call of the hot functions.
+
+Every size is run once per --renderers backend: the software blitter, and the SDL2
+Renderer/Texture path (SDL's software renderer when headless). Results for sdl2 are
+keyed "WxH sdl2", and a side-by-side FPS table per size shows the difference.
+
+With --baseline, each figure is compared against a JSON file written earlier by --out
+and the exit status is 1 when any of them is more than --tolerance worse. Timings only
+compare meaningfully on the machine that wrote the baseline; benchmarks/baseline.json
+is a reference from the machine described in its "meta" block.
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import pygame  # noqa: E402
+
+import aimlite  # noqa: E402
+
+SIZES = ("1280x720", "1920x1080", "2560x1440")
+RENDERERS = ("software", "sdl2")
+WARMUP = 10
+SOUND_REPEAT = 20
+APP_HOT = (
+    "_draw_training",
+    "_draw_settings",
+    "_draw_main_menu",
+    "_draw_map_select",
+    "_draw_scores",
+    "_draw_run_summary",
+    "_draw_countdown",
+    "_handle_training_click",
+)
+SIM_HOT = ("update", "update_tracking", "move")
+# Figures where a larger value is an improvement; everything else is a cost.
+HIGHER_IS_BETTER = {"fps"}
+
+
+class Probe:
+    """Call counts, wall time and (when tracing) peak allocation per named scope.
+
+    Scopes nest: a child resets the tracemalloc peak on entry, so the parent's peak so
+    far is carried on the stack and folded back in when the child exits.
+    """
+
+    def __init__(self):
+        self.stats = {}
+        self.stack = []
+
+    def enter(self):
+        tracing = tracemalloc.is_tracing()
+        if tracing:
+            current, peak = tracemalloc.get_traced_memory()
+            if self.stack:
+                self.stack[-1][2] = max(self.stack[-1][2], peak)
+            tracemalloc.reset_peak()
+        else:
+            current = 0
+        self.stack.append([time.perf_counter_ns(), current, 0])
+
+    def exit(self, name):
+        took = time.perf_counter_ns()
+        started, current, carried = self.stack.pop()
+        entry = self.stats.setdefault(name, [0, 0, 0])
+        entry[0] += 1
+        entry[1] += took - started
+        if tracemalloc.is_tracing():
+            peak = max(tracemalloc.get_traced_memory()[1], carried)
+            entry[2] += peak - current
+            if self.stack:
+                self.stack[-1][2] = max(self.stack[-1][2], peak)
+
+    def wrap(self, obj, name):
+        fn = getattr(obj, name)
+
+        def timed(*args, **kwargs):
+            self.enter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self.exit(name)
+
+        setattr(obj, name, timed)
+
+
+def aim_point(sim):
+    if sim.moving_target:
+        return sim.moving_target.x, sim.moving_target.y
+    if sim.map_key == "multi_tracking" and sim.bots.count:
+        return float(sim.bots.x[0]), float(sim.bots.y[0])
+    if sim.targets:
+        i = sim._nearest_target(sim.cursor_x, sim.cursor_y)
+        return sim.targets.xs[i], sim.targets.ys[i]
+    return None
+
+
+class Script:
+    """Per-frame driver hooked into display presentation: posts input, switches screens."""
+
+    def __init__(self, app, probe, frames):
+        self.app = app
+        self.probe = probe
+        self.frames = frames
+        self.segments = self._segments()
+        self.results = {}
+        self.current = None
+        self.frame = 0
+        self.frame_ms = []
+        self.retained_at = 0
+        self.last = 0.0
+
+    def _segments(self):
+        app = self.app
+        segments = [("run_countdown", self._countdown)]
+        segments += [(f"play:{map_key}", self._play(map_key)) for map_key in app.maps]
+        segments += [
+            ("run_summary", lambda: None),
+            ("main_menu", lambda: app._set_state("main_menu")),
+            ("map_select", lambda: app._set_state("map_select")),
+            ("settings", lambda: app._open_settings("main_menu")),
+            ("scores", lambda: app._set_state("scores")),
+        ]
+        return iter(segments)
+
+    def _select(self, map_key):
+        app = self.app
+        app.map_index = app.maps.index(map_key)
+        app.current_map = map_key
+        app._init_map()
+
+    def _countdown(self):
+        self._select(self.app.maps[0])
+        self.app._start_run()
+        self.app.countdown_left = 1e9
+
+    def _play(self, map_key):
+        def setup():
+            self._select(map_key)
+            self.app._start_run()
+            self.app.countdown_left = 0.0
+
+        return setup
+
+    def start(self):
+        self.app.duration_index = len(self.app.durations) - 1
+        self._next()
+
+    def _next(self):
+        app = self.app
+        if self.current and self.current.startswith("play:") and app.screen_state == "playing":
+            app._finish_run()
+        segment = next(self.segments, None)
+        if segment is None:
+            app.running = False
+            return
+        self.current, setup = segment
+        setup()
+        self.frame = 0
+        self.frame_ms = []
+        self.probe.stack.clear()
+
+    def _input(self):
+        app = self.app
+        state = app.screen_state
+        n = self.frame
+        if state == "playing":
+            sim = app.sim
+            point = aim_point(sim)
+            if point is None:
+                return
+            px_per_count = (
+                max(1e-6, float(sim.profile["yaw"]))
+                * aimlite.active_sens(sim.profile, sim.game_key, sim.ads_held)
+                * sim.px_per_degree()
+            )
+            # Close a third of the gap each frame, plus a little wobble, and fire every fourth frame.
+            dx = (point[0] - sim.cursor_x) * 0.35 + (n % 7 - 3)
+            dy = (point[1] - sim.cursor_y) * 0.35 + (n % 5 - 2)
+            rel = (dx / px_per_count, dy / px_per_count)
+            pygame.event.post(pygame.event.Event(pygame.MOUSEMOTION, rel=rel, pos=(0, 0), buttons=(0, 0, 0)))
+            if n % 4 == 3:
+                pygame.event.post(pygame.event.Event(pygame.MOUSEBUTTONDOWN, button=1, pos=(0, 0)))
+        elif state == "settings":
+            pygame.event.post(pygame.event.Event(pygame.MOUSEWHEEL, x=0, y=-1 if (n // 30) % 2 == 0 else 1))
+        else:
+            pos = (n * 37 % app.width, n * 23 % app.height)
+            pygame.event.post(pygame.event.Event(pygame.MOUSEMOTION, rel=(0, 0), pos=pos, buttons=(0, 0, 0)))
+
+    def presented(self):
+        now = time.perf_counter()
+        if self.probe.stack:
+            self.probe.exit("frame")
+        if self.frame == WARMUP:
+            self.started = now
+            self.retained_at = tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else 0
+            self.probe.stats.pop("frame", None)
+        elif self.frame > WARMUP:
+            self.frame_ms.append((now - self.last) * 1000.0)
+        self.last = now
+
+        if self.frame >= WARMUP + self.frames:
+            self._record(now)
+            self._next()
+            if not self.app.running:
+                return
+        else:
+            self.frame += 1
+        self._input()
+        self.probe.enter()
+
+    def _record(self, now):
+        frames = sorted(self.frame_ms)
+        row = {
+            "frames": len(frames),
+            "fps": len(frames) / max(now - self.started, 1e-9),
+            "frame_ms_p50": frames[len(frames) // 2],
+            "frame_ms_p99": frames[min(len(frames) - 1, int(len(frames) * 0.99))],
+        }
+        if tracemalloc.is_tracing():
+            frame_stats = self.probe.stats.pop("frame", [1, 0, 0])
+            row["alloc_kib_per_frame"] = frame_stats[2] / max(1, frame_stats[0]) / 1024.0
+            row["retained_kib"] = (tracemalloc.get_traced_memory()[0] - self.retained_at) / 1024.0
+        self.probe.stats.pop("frame", None)
+        self.results[self.current] = row
+
+
+def bench_sounds(app, probe):
+    # The audio loader builds the real sounds; time it again with a cold and a warm cache.
+    app._audio_loader.join()
+    if not pygame.mixer.get_init():
+        return
+    for name in ("gun", "hit"):
+        for _ in range(SOUND_REPEAT):
+            for stale in aimlite.SOUND_CACHE_DIR.glob(f"{name}_*.pcm"):
+                stale.unlink()
+            probe.enter()
+            app._build_sound(name)
+            probe.exit("_build_sound[cold]")
+            probe.enter()
+            app._build_sound(name)
+            probe.exit("_build_sound[warm]")
+
+
+def run_pass(size, frames, trace, renderer):
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        aimlite.CONFIG_PATH = tmp / "sensitivity_profiles.json"
+        aimlite.SCORES_PATH = tmp / "scores.json"
+        aimlite.SOUND_CACHE_DIR = tmp / "sound_cache"
+        aimlite.REPLAY_DIR = tmp / "replays"
+        aimlite.RUNS_PATH = tmp / "runs.sqlite3"
+
+        aimlite.random.seed(size[0] * size[1])
+        app = aimlite.AimLiteApp(target_fps=0, window_size=size, idle_fps=0, renderer=renderer)
+        if renderer != "software" and app.renderer is None:
+            app.running = False
+            app.run()
+            return None, None
+        probe = Probe()
+        if trace:
+            tracemalloc.start()
+        bench_sounds(app, probe)
+        for name in APP_HOT:
+            probe.wrap(app, name)
+        for name in SIM_HOT:
+            probe.wrap(app.sim, name)
+
+        script = Script(app, probe, frames)
+        flip, update = pygame.display.flip, pygame.display.update
+
+        def present(*args):
+            result = (update if args else flip)(*args)
+            script.presented()
+            return result
+
+        pygame.display.flip = present
+        pygame.display.update = present
+        if app.renderer:
+            # Menu canvas uploads present through the same call as the textured frames.
+            render_present = app.renderer.present
+
+            def present_textures():
+                render_present()
+                script.presented()
+
+            app.renderer.present = present_textures
+        try:
+            script.start()
+            app.run()
+        finally:
+            pygame.display.flip, pygame.display.update = flip, update
+            if trace:
+                tracemalloc.stop()
+        return script.results, probe.stats
+
+
+def bench_size(size, frames, alloc_frames, renderer):
+    screens, stats = run_pass(size, frames, trace=False, renderer=renderer)
+    if screens is None:
+        return None
+    functions = {
+        name: {"calls": calls, "mean_us": total / calls / 1e3, "total_ms": total / 1e6}
+        for name, (calls, total, _) in sorted(stats.items())
+    }
+    if alloc_frames:
+        traced_screens, traced_stats = run_pass(size, alloc_frames, trace=True, renderer=renderer)
+        for name, row in traced_screens.items():
+            screens[name]["alloc_kib_per_frame"] = row["alloc_kib_per_frame"]
+            screens[name]["retained_kib"] = row["retained_kib"]
+        for name, (calls, _, peak) in traced_stats.items():
+            if name in functions:
+                functions[name]["alloc_kib_per_call"] = peak / calls / 1024.0
+    return {"screens": screens, "functions": functions}
+
+
+def flatten(results):
+    for size, groups in results.items():
+        for group, rows in groups.items():
+            for name, row in rows.items():
+                for metric, value in row.items():
+                    # Counts and totals scale with --frames; only per-frame and per-call figures compare.
+                    if metric not in ("calls", "frames", "total_ms"):
+                        yield (size, group, name, metric), value
+
+
+def compare(results, baseline, tolerance):
+    old = dict(flatten(baseline["results"]))
+    regressions = 0
+    print(f"\ncompared with baseline from {baseline['meta'].get('created', '?')}, tolerance {tolerance:.0%}")
+    for key, value in flatten(results):
+        before = old.get(key)
+        # A ratio against zero or a negative figure (retained memory can shrink) means nothing.
+        if before is None or before <= 0:
+            continue
+        change = value / before - 1.0
+        worse = -change if key[3] in HIGHER_IS_BETTER else change
+        # Allocation figures under a KiB are noise from tracemalloc's own bookkeeping.
+        if worse > tolerance and not (key[3].startswith("alloc") and value < 1.0):
+            regressions += 1
+            print(f"  REGRESSION {' '.join(key):<60} {before:>10.3f} -> {value:>10.3f} ({change:+.0%})")
+        elif worse < -tolerance:
+            print(f"  improved   {' '.join(key):<60} {before:>10.3f} -> {value:>10.3f} ({change:+.0%})")
+    print(f"{regressions} regression(s)")
+    return regressions
+
+
+def report(size, result):
+    print(f"\n== {size} ==")
+    print(f"{'screen':<22}{'fps':>9}{'p50 ms':>9}{'p99 ms':>9}{'KiB/frame':>11}{'retained':>10}")
+    for name, row in result["screens"].items():
+        print(
+            f"{name:<22}{row['fps']:>9.0f}{row['frame_ms_p50']:>9.3f}{row['frame_ms_p99']:>9.3f}"
+            f"{row.get('alloc_kib_per_frame', 0.0):>11.1f}{row.get('retained_kib', 0.0):>10.1f}"
+        )
+    print(f"{'function':<26}{'calls':>8}{'mean us':>10}{'total ms':>10}{'KiB/call':>10}")
+    for name, row in result["functions"].items():
+        print(
+            f"{name:<26}{row['calls']:>8}{row['mean_us']:>10.1f}{row['total_ms']:>10.1f}"
+            f"{row.get('alloc_kib_per_call', 0.0):>10.2f}"
+        )
+
+
+def result_key(size, renderer):
+    # Software results keep the bare size so baselines from before --renderers still compare.
+    return size if renderer == "software" else f"{size} {renderer}"
+
+
+def report_renderers(size, results, renderers):
+    keys = [result_key(size, renderer) for renderer in renderers]
+    if len([key for key in keys if key in results]) < 2:
+        return
+    base = results[keys[0]]["screens"]
+    print(f"\n== {size} fps by renderer ==")
+    print(f"{'screen':<22}" + "".join(f"{renderer:>12}" for renderer in renderers) + f"{'ratio':>9}")
+    for name, row in base.items():
+        fps = [results[key]["screens"][name]["fps"] if key in results else 0.0 for key in keys]
+        print(f"{name:<22}" + "".join(f"{value:>12.0f}" for value in fps) + f"{fps[-1] / max(fps[0], 1e-9):>8.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default=",".join(SIZES), help="comma-separated window sizes as WxH")
+    parser.add_argument("--frames", type=int, default=300, help="measured frames per screen")
+    parser.add_argument("--renderers", default=",".join(RENDERERS), help="comma-separated backends: software, sdl2")
+    parser.add_argument("--alloc-frames", type=int, default=60, help="frames per screen under tracemalloc (0 = skip)")
+    parser.add_argument("--out", type=Path, help="write results as JSON")
+    parser.add_argument("--baseline", type=Path, help="compare against a JSON file written by --out")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="relative change reported as a regression")
+    args = parser.parse_args()
+
+    renderers = args.renderers.split(",")
+    results = {}
+    for size in args.sizes.split(","):
+        width, height = (int(v) for v in size.lower().split("x"))
+        for renderer in renderers:
+            result = bench_size((width, height), args.frames, args.alloc_frames, renderer)
+            if result is None:
+                print(f"\n== {size} {renderer}: renderer unavailable, skipped ==")
+                continue
+            key = result_key(size, renderer)
+            results[key] = result
+            report(key, result)
+        report_renderers(size, results, renderers)
+
+    payload = {
+        "meta": {
+            "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "numpy": getattr(aimlite.np, "__version__", None),
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "processor": platform.processor() or None,
+            "cpu_count": os.cpu_count(),
+            "video_driver": os.environ.get("SDL_VIDEODRIVER"),
+            "sizes": args.sizes.split(","),
+            "frames": args.frames,
+            "alloc_frames": args.alloc_frames,
+            "renderers": renderers,
+        },
+        "results": results,
+    }
+    if args.out:
+        args.out.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+        print(f"\nwrote {args.out}")
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        if compare(results, baseline, args.tolerance):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
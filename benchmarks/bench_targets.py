@@ -0,0 +1,103 @@
+"""Microbenchmarks for the target update and hit-test paths.
+
+    python benchmarks/bench_targets.py [--size 1920x1080] [--n 200000] [--repeat 5]
+                                       [--out FILE] [--baseline FILE] [--label TEXT]
+
+Each figure is the best of --repeat runs. --out saves the figures as JSON and --baseline
+prints each one next to a saved run. benchmarks/targets_baseline.json was measured at the
+commit before targets moved into TargetPool (git checkout f7d28bf~1, then run this script
+there with --out); compare against it on the same machine only.
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+from pathlib import Path
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from aimlite import ManualClock, TrainingSim  # noqa: E402
+
+
+def make_sim(width, height, map_key):
+    sim = TrainingSim(width, height, {}, "cs2", map_key=map_key, clock=ManualClock())
+    sim.start(3600, seed=1)
+    return sim
+
+
+def bench_update(width, height, n):
+    sim = make_sim(width, height, "tracking")
+    t0 = time.perf_counter()
+    for _ in range(n):
+        sim.update_tracking(sim.step_dt)
+    return (time.perf_counter() - t0) / n
+
+
+def bench_clicks(width, height, map_key, n):
+    # Random shots, so nearly every click is a hit test and a miss.
+    sim = make_sim(width, height, map_key)
+    rng = random.Random(2)
+    shots = [(rng.uniform(0, width), rng.uniform(0, height)) for _ in range(n)]
+    t0 = time.perf_counter()
+    for x, y in shots:
+        sim.cursor_x = x
+        sim.cursor_y = y
+        sim.click()
+    return (time.perf_counter() - t0) / n
+
+
+def best_of(repeat, fn, *args):
+    return min(fn(*args) for _ in range(repeat))
+
+
+def compare(results, baseline):
+    print(f"\ncompared with {baseline['meta'].get('label') or baseline['meta'].get('created', '?')}")
+    for name, value in results.items():
+        before = baseline["results"].get(name)
+        if before:
+            print(f"{name:<24}{before:>8.3f} -> {value:>8.3f} ({value / before - 1.0:+.0%})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", default="1920x1080", help="arena size as WxH")
+    parser.add_argument("--n", type=int, default=200000, help="iterations per measurement")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per measurement")
+    parser.add_argument("--out", type=Path, help="write results as JSON")
+    parser.add_argument("--baseline", type=Path, help="compare against a JSON file written by --out")
+    parser.add_argument("--label", default="", help="what was measured, stored with --out")
+    args = parser.parse_args()
+    width, height = (int(v) for v in args.size.lower().split("x"))
+
+    print(f"arena {width}x{height}, {args.n} iterations, times in microseconds")
+    results = {"update_tracking": best_of(args.repeat, bench_update, width, height, args.n) * 1e6}
+    print(f"{'update_tracking':<24}{results['update_tracking']:>8.3f}")
+    for map_key in ("regular_flick", "gridshot", "tracking"):
+        name = "click " + map_key
+        results[name] = best_of(args.repeat, bench_clicks, width, height, map_key, args.n) * 1e6
+        print(f"{name:<24}{results[name]:>8.3f}")
+
+    if args.out:
+        meta = {
+            "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "label": args.label,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "size": f"{width}x{height}",
+            "n": args.n,
+            "repeat": args.repeat,
+        }
+        args.out.write_text(json.dumps({"meta": meta, "results": results}, indent=2), encoding="utf-8")
+        print(f"\nwrote {args.out}")
+    if args.baseline:
+        compare(results, json.loads(args.baseline.read_text(encoding="utf-8")))
+
+
+if __name__ == "__main__":
+    main()
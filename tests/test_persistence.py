@@ -0,0 +1,14 @@
+from aimlite import PersistenceWorker
+
+
+def test_failed_job_keeps_the_worker_running():
+    worker = PersistenceWorker()
+    done = []
+    try:
+        worker.submit(lambda: {}["missing"])
+        worker.submit(done.append, 1)
+        assert worker.flush(timeout=2.0)
+        assert done == [1]
+        assert isinstance(worker.last_error, KeyError)
+    finally:
+        worker.close()
@@ -0,0 +1,55 @@
+from aimlite import DEFAULT_PROFILES, ManualClock, TrainingSim
+
+MS = 1_000_000
+SHOWN_AT = 5_000 * MS
+
+
+def reaction_sim():
+    clock = ManualClock()
+    sim = TrainingSim(1920, 1080, dict(DEFAULT_PROFILES["cs2"]), "cs2", map_key="reaction", clock=clock)
+    sim.stamp_on_present = True
+    sim.start(30, seed=7)
+    while not sim.targets:
+        sim.update(0.01)
+    sim.cursor_x, sim.cursor_y = sim.targets.xs[0], sim.targets.ys[0]
+    return sim
+
+
+def test_window_after_present_uses_its_midpoint():
+    sim = reaction_sim()
+    sim.presented(SHOWN_AT)
+    assert sim.click(SHOWN_AT + 10 * MS, 2 * MS)
+    assert sim.stats.reaction_samples == [10.0]
+    assert sim.stats.reaction_spread == [2.0]
+
+
+def test_window_straddling_present_is_clamped_to_it():
+    sim = reaction_sim()
+    sim.presented(SHOWN_AT)
+    # Input window [shown - 4 ms, shown + 6 ms]: only [shown, shown + 6 ms] is possible.
+    assert sim.click(SHOWN_AT + 1 * MS, 5 * MS)
+    assert sim.stats.reaction_samples == [3.0]
+    assert sim.stats.reaction_spread == [3.0]
+
+
+def test_window_closed_before_present_is_not_a_sample():
+    sim = reaction_sim()
+    sim.presented(SHOWN_AT)
+    assert sim.click(SHOWN_AT - 5 * MS, 2 * MS)
+    assert sim.stats.hits == 1
+    assert sim.stats.reaction_samples == []
+    assert sim.stats.reaction_spread == []
+
+
+def test_click_before_any_present_is_not_a_sample():
+    sim = reaction_sim()
+    assert sim.click(SHOWN_AT, 0)
+    assert sim.stats.reaction_samples == []
+
+
+def test_first_present_starts_the_timer():
+    sim = reaction_sim()
+    sim.presented(SHOWN_AT)
+    sim.presented(SHOWN_AT + 4 * MS)
+    assert sim.click(SHOWN_AT + 20 * MS, 0)
+    assert sim.stats.reaction_samples == [20.0]
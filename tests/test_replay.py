@@ -0,0 +1,150 @@
+import random
+
+from aimlite import (
+    DEFAULT_PROFILES,
+    REC_SETTING,
+    InputFrame,
+    ManualClock,
+    SessionRecorder,
+    TrainingSim,
+    read_recording,
+    replay_recording,
+    run_simulation,
+)
+
+
+def record_run(path, map_key, edits, chunk_size=4096):
+    # edits: {frame index: callable(sim)} applied between frames, like the settings screen would.
+    profiles = {key: dict(p) for key, p in DEFAULT_PROFILES.items()}
+    game_keys = list(profiles)
+    clock = ManualClock()
+    sim = TrainingSim(1280, 720, profiles["cs2"], "cs2", 0, map_key, clock=clock)
+    meta = {
+        "seed": 11,
+        "map": map_key,
+        "duration": 10,
+        "width": 1280,
+        "height": 720,
+        "tick_rate": 1000,
+        "game_key": "cs2",
+        "game_index": 0,
+        "game_keys": game_keys,
+        "profiles": profiles,
+        "cursor_x": sim.cursor_x,
+        "cursor_y": sim.cursor_y,
+    }
+    sim.recorder = SessionRecorder(path, meta, clock, chunk_size=chunk_size)
+    sim.start(10, seed=11)
+    rng = random.Random(3)
+    frame = 0
+    while sim.steps_left > 0:
+        if frame in edits:
+            edits[frame](sim, profiles, game_keys)
+        if sim.moving_target:
+            tx, ty = sim.moving_target.x, sim.moving_target.y
+        else:
+            tx, ty = (sim.targets.xs[0], sim.targets.ys[0]) if sim.targets else (640, 360)
+        step = InputFrame(1 / 144, (tx - sim.cursor_x) * 0.4, (ty - sim.cursor_y) * 0.4, int(rng.random() < 0.1))
+        run_simulation(sim, [step])
+        frame += 1
+    sim.recorder.close(sim.stats)
+    return sim.result()
+
+
+def set_sens(value):
+    return lambda sim, profiles, game_keys: sim.set_profile_value("hipfire_sens", value)
+
+
+def switch_game(key):
+    return lambda sim, profiles, game_keys: sim.set_profile(key, profiles[key], game_keys.index(key))
+
+
+def edit_profile(key, field, value):
+    def edit(sim, profiles, game_keys):
+        # An edit to a game that isn't active only reaches the sim when that game is switched to.
+        profiles[key][field] = value
+
+    return edit
+
+
+def test_mid_run_sensitivity_change_replays(tmp_path):
+    path = tmp_path / "run.alrec"
+    live = record_run(path, "tracking", {300: set_sens(0.6), 900: set_sens(2.2)})
+    _, replayed, recorded_end = replay_recording(path)
+
+    _, records = read_recording(path)
+    assert sum(1 for kind, *_ in records if kind == REC_SETTING) == 2
+    assert replayed["score"] == live["score"]
+    assert replayed["hits"] == live["hits"]
+    # The end record stores the score as float32, like every other payload.
+    assert abs(recorded_end[0] - live["score"]) < 0.01
+    assert recorded_end[1] == live["hits"]
+
+
+def test_switching_to_an_edited_game_replays(tmp_path):
+    path = tmp_path / "run.alrec"
+    edits = {
+        100: edit_profile("valorant", "hipfire_sens", 0.9),
+        200: switch_game("valorant"),
+        600: switch_game("cs2"),
+    }
+    live = record_run(path, "regular_flick", edits)
+    _, replayed, _ = replay_recording(path)
+    assert (replayed["score"], replayed["hits"], replayed["shots"]) == (live["score"], live["hits"], live["shots"])
+
+
+def drive_app_run(app, edits):
+    # Plays one run through the app, like record_run, with settings typed in between frames.
+    app._start_run()
+    path = app.sim.recorder.path
+    sim = app.sim
+    frame = 0
+    while sim.steps_left > 0:
+        if frame in edits:
+            app.active_input_key, app.input_buffer = edits[frame]
+            app._apply_text_input()
+        tx, ty = (sim.moving_target.x, sim.moving_target.y) if sim.moving_target else (640, 360)
+        run_simulation(sim, [InputFrame(1 / 144, (tx - sim.cursor_x) * 0.4, (ty - sim.cursor_y) * 0.4, 0)])
+        frame += 1
+    live = sim.result()
+    app._finish_run()
+    app.persist.flush(timeout=5.0)
+    return path, live
+
+
+def test_run_after_a_mid_run_edit_replays(tmp_path, monkeypatch):
+    import aimlite
+
+    monkeypatch.setattr(aimlite, "CONFIG_PATH", tmp_path / "sensitivity_profiles.json")
+    monkeypatch.setattr(aimlite, "SCORES_PATH", tmp_path / "scores.json")
+    monkeypatch.setattr(aimlite, "SOUND_CACHE_DIR", tmp_path / "sound_cache")
+    monkeypatch.setattr(aimlite, "REPLAY_DIR", tmp_path / "replays")
+    monkeypatch.setattr(aimlite, "RUNS_PATH", tmp_path / "runs.sqlite3")
+    app = aimlite.AimLiteApp(target_fps=0, window_size=(1280, 720), idle_fps=0)
+    try:
+        app.sim.clock = ManualClock()
+        app.current_map = "tracking"
+        app.duration_index = app.durations.index(min(app.durations))
+        drive_app_run(app, {200: ("hipfire_sens", "0.63")})
+        # The second run starts with the edited sensitivity, which the sim holds as recorded.
+        path, live = drive_app_run(app, {})
+        _, replayed, _ = replay_recording(path)
+        assert abs(replayed["score"] - live["score"]) < 1e-6
+        assert replayed["hits"] == live["hits"]
+    finally:
+        app.persist.close()
+        app.runs.close()
+
+
+def test_truncated_recording_replays_complete_chunks(tmp_path):
+    path = tmp_path / "run.alrec"
+    record_run(path, "tracking", {}, chunk_size=512)
+    whole, records = read_recording(path)
+    path.write_bytes(path.read_bytes()[:-100])
+
+    meta, partial = read_recording(path)
+    assert not whole["truncated"] and meta["truncated"]
+    assert 0 < len(partial) < len(records)
+    assert partial == records[: len(partial)]
+    _, _, recorded_end = replay_recording(path)
+    assert recorded_end is None